@@ -0,0 +1,67 @@
+"""
+Synthetic data for the benchmarks: students, exams and assignments with
+realistic-looking names, majors and years, generated from a fixed seed so
+runs on different commits work on the same data.
+"""
+import random
+
+FIRST_NAMES = [
+    "Nino", "Giorgi", "Ana", "Luka", "Mariam", "David", "Elene", "Saba", "Tamar", "Levan",
+    "Irakli", "Keti", "Nikoloz", "Natia", "Sopho", "Zurab", "Gvantsa", "Beka", "Lasha", "Salome",
+]
+LAST_NAMES = [
+    "Beridze", "Kapanadze", "Gelashvili", "Maisuradze", "Lomidze", "Tsiklauri", "Abashidze",
+    "Japaridze", "Bolkvadze", "Nozadze", "Chikovani", "Kvaratskhelia", "Mamaladze", "Gogua",
+]
+MAJORS = [
+    "Computer Science", "Information Technology", "Electrical Engineering",
+    "Mechanical Engineering", "Business Administration", "Mathematics", "Physics",
+]
+
+
+def student_rows(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield (
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            round(rng.uniform(0.0, 4.0), 2),
+            rng.choice(MAJORS),
+            rng.randint(2015, 2025),
+            f"student{i}@uni.edu",
+        )
+
+
+def populate(db, students, exams=None, exams_per_student=3, seed=1, chunk_size=20000):
+    """
+    Fills an empty StudentDatabase. exams defaults to one exam per 100
+    students (at least 10). Returns (student_count, exam_count, assignment_count).
+    """
+    rng = random.Random(seed)
+    exams = exams if exams is not None else max(10, students // 100)
+
+    inserted, rejections = db.bulk_add_students(student_rows(students, seed), chunk_size=chunk_size)
+    if rejections:
+        raise RuntimeError(f"generated rows were rejected: {rejections[:3]}")
+
+    for i in range(exams):
+        if not db.add_exam(f"{rng.choice(MAJORS)} exam {i}",
+                           f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                           f"Generated exam number {i}"):
+            raise RuntimeError(f"could not add exam {i}")
+
+    # mxolod sajaro API: benchmark-ebi bazis shida struqturaze ar unda iyos damokidebuli
+    student_ids = [row[0] for row in db.iter_students(batch_size=chunk_size)]
+    exam_ids = [row[0] for row in db.iter_exams()]
+
+    per_student = min(exams_per_student, len(exam_ids))
+    cohorts = {exam_id: [] for exam_id in exam_ids}
+    for sid in student_ids:
+        for eid in rng.sample(exam_ids, per_student):
+            cohorts[eid].append(sid)
+
+    assignments = 0
+    for exam_id, ids in cohorts.items():
+        if ids:
+            assignments += db.assign_cohort_to_exam(exam_id, ids=ids)[0]
+    return inserted, len(exam_ids), assignments
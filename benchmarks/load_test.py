@@ -0,0 +1,211 @@
+"""
+Load test for the HTTP service (serve_api.py / student_db/service.py).
+
+    python benchmarks/load_test.py --students 20000 --concurrency 300 --requests 20000
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --concurrency 200
+
+Without --url a database is generated in a temporary directory (datagen.py)
+and served from a thread of this process. --concurrency clients each keep one
+keep-alive connection and send requests back to back, in a registration-day
+mix: mostly "my exams" and list pages, some exam lists and lookups, and
+assignments (POST). Throughput, status codes and latency percentiles per
+endpoint are printed and optionally written as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from student_db import StudentDatabase, service  # noqa: E402
+import datagen  # noqa: E402
+
+# (endpointis saxeli, wili) - registraciis dghis datvirtva
+REQUEST_MIX = (
+    ("GET /students/<id>/exams", 40),
+    ("GET /students", 20),
+    ("GET /exams", 15),
+    ("GET /students/<id>", 10),
+    ("POST /assignments", 10),
+    ("GET /assignments", 5),
+)
+
+
+def make_request(name, rng, student_count, exam_count):
+    if name == "GET /students/<id>/exams":
+        return "GET", f"/students/{rng.randint(1, student_count)}/exams", None
+    if name == "GET /students":
+        order = rng.choice(["STUDENT_ID", "NAME", "GPA", "YEAR"])
+        return "GET", f"/students?order_by={order}&limit=50", None
+    if name == "GET /exams":
+        return "GET", "/exams", None
+    if name == "GET /students/<id>":
+        return "GET", f"/students/{rng.randint(1, student_count)}", None
+    if name == "GET /assignments":
+        return "GET", "/assignments?limit=50", None
+    body = json.dumps({"student_id": rng.randint(1, student_count), "exam_id": rng.randint(1, exam_count)})
+    return "POST", "/assignments", body.encode("utf-8")
+
+
+async def send(reader, writer, host, method, path, body):
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+    if body is not None:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, queue, results, seed, student_count, exam_count):
+    rng = random.Random(seed)
+    names = [name for name, _ in REQUEST_MIX]
+    weights = [weight for _, weight in REQUEST_MIX]
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            name = rng.choices(names, weights)[0]
+            method, path, body = make_request(name, rng, student_count, exam_count)
+            start = time.perf_counter()
+            try:
+                status = await send(reader, writer, host, method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                status = "connection error"
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+            results[name].append((time.perf_counter() - start, status))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, requests, student_count, exam_count):
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    results = defaultdict(list)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, queue, results, seed, student_count, exam_count)
+                           for seed in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(results, elapsed):
+    report = {"elapsed_s": round(elapsed, 3), "endpoints": {}}
+    total = 0
+    for name, samples in sorted(results.items()):
+        latencies = sorted(latency for latency, _ in samples)
+        total += len(samples)
+        report["endpoints"][name] = {
+            "requests": len(samples),
+            "status": dict(Counter(str(status) for _, status in samples)),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+        }
+    report["requests"] = total
+    report["requests_per_s"] = round(total / elapsed, 1) if elapsed else 0.0
+    return report
+
+
+def start_local_server(db, workers):
+    """
+    Runs service.serve() on its own event loop in a daemon thread and returns the port.
+    """
+    started = threading.Event()
+    address = {}
+
+    def ready(server):
+        address["port"] = server.sockets[0].getsockname()[1]
+        started.set()
+
+    thread = threading.Thread(target=lambda: asyncio.run(service.serve(db, "127.0.0.1", 0, workers, ready)),
+                              daemon=True)
+    thread.start()
+    if not started.wait(30):
+        raise RuntimeError("server did not start")
+    return address["port"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the student HTTP service.")
+    parser.add_argument("--url", help="running server, e.g. http://127.0.0.1:8080 (default: start one)")
+    parser.add_argument("--students", type=int, default=20000, help="students to generate (default: 20000)")
+    parser.add_argument("--concurrency", type=int, default=300, help="concurrent clients (default: 300)")
+    parser.add_argument("--requests", type=int, default=20000, help="total requests (default: 20000)")
+    parser.add_argument("--workers", type=int, default=8, help="server database threads (default: 8)")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    db = None
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            if args.url:
+                url = urlsplit(args.url)
+                host, port = url.hostname, url.port or 80
+                # id-ebis diapazoni serveris bazidan ar vitsit; --students unda daemthxves
+                student_count, exam_count = args.students, max(args.students // 100, 10)
+            else:
+                db = StudentDatabase(os.path.join(tmp, "load.db"), max_readers=max(args.workers, 8))
+                start = time.perf_counter()
+                student_count, exam_count, assignments = datagen.populate(db, args.students)
+                print(f"{student_count} students, {exam_count} exams, {assignments} assignments "
+                      f"generated in {time.perf_counter() - start:.1f} s")
+                host, port = "127.0.0.1", start_local_server(db, args.workers)
+
+            print(f"{args.requests} requests from {args.concurrency} clients against {host}:{port}")
+            results, elapsed = asyncio.run(run_load(host, port, args.concurrency, args.requests,
+                                                    student_count, exam_count))
+        finally:
+            # baza daixuros sanam droebith direqtorias washlis (WAL/SHM failebi Windows-ze daiketeboda)
+            if db is not None:
+                db.close()
+
+    report = summarize(results, elapsed)
+    print(f"\n{report['requests']} requests in {report['elapsed_s']} s = {report['requests_per_s']} req/s")
+    for name, stats in report["endpoints"].items():
+        print(f"  {name:<26} {stats['requests']:>6}  p50 {stats['p50_ms']:7.2f} ms  "
+              f"p95 {stats['p95_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  {stats['status']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Benchmarks for StudentDatabase and the GUI table refresh path.
+
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10000 --compare results.json
+
+For every size a fresh database is generated (see datagen.py) in a temporary
+directory and each operation is timed several times; the median and minimum
+are written as JSON so two commits can be compared with --compare.
+The Qt benchmarks run with the offscreen platform and are skipped when PyQt5
+is not installed. Before timing, check_paging() makes sure keyset paging
+returns every row when the sort column holds NULLs.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from student_db import StudentDatabase  # noqa: E402
+import datagen  # noqa: E402
+
+# igive svetebi rac StudentManagementApp.STUDENT_SORT_MAP-shi
+STUDENT_SORT_COLUMNS = ["STUDENT_ID", "NAME", "LAST_NAME", "GPA", "YEAR"]
+STUDENT_PAGE_COLUMNS = ["STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL"]
+EXAM_PAGE_COLUMNS = ["EXAM_ID", "EXAM_NAME", "EXAM_DATE"]
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "runs": repeat}
+
+
+def check_paging():
+    """
+    Pages students and exams with NULL sort values by every column in both
+    directions and checks that every row comes back exactly once, in the
+    order of the full query. Raises RuntimeError on a mismatch.
+    """
+    db = StudentDatabase(":memory:")
+    for i in range(23):
+        db.add_student(f"N{i % 3}", f"L{i % 4}", None if i % 3 == 0 else i % 5 / 2,
+                       None if i % 4 == 0 else f"M{i % 2}", None if i % 5 == 0 else 2020 + i % 3,
+                       f"s{i}@uni.edu")
+    for i in range(7):
+        db.add_exam(f"E{i}", None if i % 2 else f"2026-01-{i % 3 + 1:02d}", "")
+
+    def page_all(fetch_page, order_by, descending):
+        rows, cursor = fetch_page(order_by, descending, None, 4)
+        while cursor is not None:
+            page, cursor = fetch_page(order_by, descending, cursor, 4)
+            rows += page
+        return rows
+
+    # get_all_* igive NULL-ebis rigs iyenebs (ASC-shi pirveli,DESC-shi bolo)
+    for fetch_page, fetch_all, columns, table in (
+            (db.get_students_page, db.get_all_students, STUDENT_PAGE_COLUMNS, "STUDENTS"),
+            (db.get_exams_page, db.get_all_exams, EXAM_PAGE_COLUMNS, "EXAMS")):
+        for column in columns:
+            for descending in (False, True):
+                expected = [tuple(row[:len(columns)]) for row in fetch_all(column, descending)]
+                if [tuple(row) for row in page_all(fetch_page, column, descending)] != expected:
+                    direction = "DESC" if descending else "ASC"
+                    raise RuntimeError(f"keyset paging of {table} by {column} {direction} lost rows")
+    db.close()
+
+
+def bench_database(db, size, repeat):
+    results = {}
+    rng = random.Random(7)
+    student_ids = [row[0] for row in db.iter_students()]
+
+    results["add_student x100"] = measure(
+        lambda: [db.add_student("Bench", "Mark", 3.0, "Physics", 2024, f"bench{rng.random()}@uni.edu")
+                 for _ in range(100)], repeat)
+    results["bulk_add_students x1000"] = measure(
+        lambda: db.bulk_add_students(datagen.student_rows(1000, rng.random())), repeat)
+
+    for column in STUDENT_SORT_COLUMNS:
+        results[f"get_all_students order_by={column}"] = measure(
+            lambda: db.get_all_students(column), repeat)
+        results[f"get_students_page order_by={column}"] = measure(
+            lambda: db.get_students_page(column), repeat)
+
+    results["get_all_assignments"] = measure(db.get_all_assignments, repeat)
+    results["get_assignments_page order_by=STUDENTS.NAME"] = measure(
+        lambda: db.get_assignments_page("STUDENTS.NAME"), repeat)
+
+    sample = rng.sample(student_ids, min(1000, len(student_ids)))
+    results["get_exams_for_student x1000"] = measure(
+        lambda: [db.get_exams_for_student(sid) for sid in sample], repeat)
+    results["get_student_by_id x1000"] = measure(
+        lambda: [db.get_student_by_id(sid) for sid in sample], repeat)
+    results["search x100"] = measure(
+        lambda: [db.search(rng.choice(datagen.FIRST_NAMES)[:rng.randint(2, 5)]) for _ in range(100)],
+        repeat)
+    results["get_cohort_summaries"] = measure(db.get_cohort_summaries, repeat)
+    return results
+
+
+def bench_qt(db, repeat, scroll_rows=10000):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        from student_app import LazyTableModel
+        from db_executor import DatabaseExecutor
+    except ImportError:
+        return {}
+
+    app = QApplication.instance() or QApplication([])
+    executor = DatabaseExecutor(lambda: db, max_threads=4)
+    model = LazyTableModel(["ID", "Name", "Last Name", "GPA", "Major", "Year", "Email"], executor,
+                           ["STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL"])
+
+    def wait_idle():
+        while executor.is_busy():
+            app.processEvents()
+            time.sleep(0.0005)
+
+    def first_page():
+        model.reset(lambda d, cursor, limit: d.get_students_page("GPA", cursor=cursor, page_size=limit),
+                    "GPA")
+        wait_idle()
+
+    def scroll():
+        first_page()
+        while model.rowCount() < scroll_rows and model.canFetchMore():
+            model.fetchMore()
+            wait_idle()
+
+    results = {
+        "qt first page (GPA sort)": measure(first_page, repeat),
+        f"qt scroll {scroll_rows} rows": measure(scroll, repeat),
+    }
+    executor.wait()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nComparison with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for size, benches in current["results"].items():
+        old_benches = baseline["results"].get(size, {})
+        for name, result in benches.items():
+            old = old_benches.get(name)
+            if not old:
+                continue
+            ratio = result["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+            flag = "  SLOWER" if ratio > 1.2 else ("  faster" if ratio < 0.8 else "")
+            print(f"  {size:>8} {name:<48} {old['median_s'] * 1000:9.2f} ms -> "
+                  f"{result['median_s'] * 1000:9.2f} ms  x{ratio:.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark StudentDatabase and table refresh.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="student counts to generate (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per operation (default: 5)")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--no-qt", action="store_true", help="skip the Qt table benchmarks")
+    args = parser.parse_args(argv)
+
+    # gverdebi NULL mnishvnelobebit ar unda ikargebodes; timing-s azri ar aqvs,tu shedegi arasworia
+    check_paging()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            db = StudentDatabase(os.path.join(tmp, f"bench_{size}.db"))
+            start = time.perf_counter()
+            students, exams, assignments = datagen.populate(db, size)
+            generate_s = time.perf_counter() - start
+            print(f"size {size}: {students} students, {exams} exams, {assignments} assignments "
+                  f"generated in {generate_s:.1f} s")
+
+            results = {"generate (bulk insert)": {"median_s": generate_s, "min_s": generate_s, "runs": 1}}
+            results.update(bench_database(db, size, args.repeat))
+            if not args.no_qt:
+                results.update(bench_qt(db, args.repeat))
+            for name, result in results.items():
+                print(f"  {name:<48} {result['median_s'] * 1000:9.2f} ms (min {result['min_s'] * 1000:.2f})")
+            report["results"][str(size)] = results
+            db.close()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
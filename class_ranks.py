@@ -0,0 +1,55 @@
+"""
+Class ranks and the dean's list: ranks every student by GPA within their
+MAJOR/YEAR cohort, saves the ranks to STUDENT_RANKS and writes the students
+in the top of their cohort to a CSV report.
+
+    python class_ranks.py --db students.db --report deans_list.csv --top-percent 10 --min-gpa 3.5
+
+Needs NumPy (pip install numpy).
+"""
+import argparse
+import sys
+import time
+
+from student_db import StudentDatabase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank students within their cohort.")
+    parser.add_argument("--db", default="students.db", help="SQLite database file (default: students.db)")
+    parser.add_argument("--report", help="write the honor roll to this CSV file")
+    parser.add_argument("--top-percent", type=float, default=10.0,
+                        help="honor roll: top share of each cohort (default: 10)")
+    parser.add_argument("--min-gpa", type=float, default=3.5, help="honor roll: minimum GPA (default: 3.5)")
+    parser.add_argument("--no-save", action="store_true", help="do not write STUDENT_RANKS")
+    args = parser.parse_args(argv)
+
+    try:
+        from student_db import analytics
+    except ImportError:
+        parser.error("NumPy is required: pip install numpy")
+
+    db = StudentDatabase(args.db)
+    try:
+        start = time.perf_counter()
+        columns, ranks = db.rank_students(save=not args.no_save)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+    print(f"Ranked {len(columns)} students in {len(ranks['cohorts'])} cohorts in {elapsed:.2f} s"
+          + ("" if args.no_save else " (saved to STUDENT_RANKS)"))
+
+    cutoffs = analytics.thresholds(columns, 100.0 - args.top_percent, ranks)
+    print(f"\nGPA needed for the top {args.top_percent:g}% per cohort:")
+    for (major, year), gpa in sorted(cutoffs.items(), key=lambda item: (item[0][0], item[0][1] or 0)):
+        print(f"  {major or '(none)':<28} {year or '':>6}  {gpa:.2f}")
+
+    if args.report:
+        honors = analytics.honor_roll(columns, ranks, args.top_percent, args.min_gpa)
+        count = analytics.write_report(args.report, columns, ranks, honors)
+        print(f"\n{count} student(s) on the honor roll written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
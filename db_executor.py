@@ -0,0 +1,143 @@
+"""
+Runs StudentDatabase calls on a QThreadPool so the Qt event loop never waits
+on SQLite.
+
+Workers get their database from db_factory, called once per worker thread.
+The GUI passes lambda: self.db, so every worker shares one StudentDatabase;
+its ConnectionManager makes that safe (the writer connection behind a lock,
+a pooled read connection checked out per thread). Results come back to the
+GUI thread through a queued Qt signal. Requests submitted with the same key
+supersede each other: a queued older request is dropped and the result of a running one
+is discarded, so rapidly changing a sort combo only shows the last result.
+"""
+import logging
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class _TaskSignals(QObject):
+    # (task, result, error) - emitted from the worker thread, delivered in the GUI thread
+    finished = pyqtSignal(object, object, object)
+
+
+class _DatabaseTask(QRunnable):
+    def __init__(self, executor, key, generation, fn, args, on_result, on_error):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.executor = executor
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.on_result = on_result
+        self.on_error = on_error
+        self.signals = _TaskSignals()
+
+    def run(self):
+        result = error = None
+        # tu am dros ukve axali motxovna movida,dzveli aghar sruldeba
+        if not self.executor.is_superseded(self):
+            try:
+                result = self.fn(self.executor.database(), *self.args)
+            except Exception as e:
+                error = e
+        self.signals.finished.emit(self, result, error)
+
+
+class DatabaseExecutor(QObject):
+    """
+    submit(fn, *args) runs fn(db, *args) on a worker thread, where db is what
+    db_factory() returned for that thread (usually one shared StudentDatabase),
+    and calls on_result(result) or
+    on_error(exception) on the GUI thread. busy_changed(True/False) tells when work is pending.
+    """
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, db_factory, max_threads=1, parent=None):
+        super().__init__(parent)
+        self.db_factory = db_factory
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._queued = {}
+        self._active = set()
+
+    def database(self):
+        """
+        The calling worker thread's database, from db_factory() on first use.
+        """
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self.db_factory()
+        return db
+
+    def submit(self, fn, *args, key=None, on_result=None, on_error=None):
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            if key is not None:
+                self._generations[key] = generation
+        task = _DatabaseTask(self, key, generation, fn, args, on_result, on_error)
+        task.signals.finished.connect(self._deliver)
+
+        if key is not None:
+            previous = self._queued.pop(key, None)
+            if previous is not None and self.pool.tryTake(previous):
+                self._finish(previous)
+            self._queued[key] = task
+
+        self._active.add(task)
+        if len(self._active) == 1:
+            self.busy_changed.emit(True)
+        self.pool.start(task)
+        return task
+
+    def cancel(self, key):
+        """
+        Discards any pending request submitted with key.
+        """
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+        previous = self._queued.pop(key, None)
+        if previous is not None and self.pool.tryTake(previous):
+            self._finish(previous)
+
+    def is_superseded(self, task):
+        if task.key is None:
+            return False
+        with self._lock:
+            return self._generations.get(task.key) != task.generation
+
+    def is_busy(self):
+        return bool(self._active)
+
+    def wait(self, msecs=-1):
+        """
+        Blocks until the pool is idle (used on shutdown and in scripts).
+        """
+        return self.pool.waitForDone(msecs)
+
+    def _deliver(self, task, result, error):
+        self._finish(task)
+        if self.is_superseded(task):
+            return
+        if error is not None:
+            if task.on_error is not None:
+                task.on_error(error)
+            else:
+                # Qt slot-shi gamoshvebuli exception programas gaatishavda
+                logger.error("database task failed", exc_info=error)
+        elif task.on_result is not None:
+            task.on_result(result)
+
+    def _finish(self, task):
+        if self._queued.get(task.key) is task:
+            del self._queued[task.key]
+        if task in self._active:
+            self._active.discard(task)
+            if not self._active:
+                self.busy_changed.emit(False)
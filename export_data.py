@@ -0,0 +1,49 @@
+"""
+Command line export of students, exams or assignments from students.db.
+
+    python export_data.py students students.csv --db students.db
+    python export_data.py assignments assignments.sdbc --order-by STUDENTS.NAME
+
+The format follows the file extension (.csv, .jsonl, .sdbc for the columnar
+format) unless --format is given. Rows are streamed, so multi-million row
+tables export in constant memory; progress is printed to stderr.
+"""
+import argparse
+import sys
+import time
+
+from student_db import StudentDatabase, export
+
+
+def print_progress(done, total):
+    percent = f" ({done * 100 // total}%)" if total else ""
+    print(f"\r  {done} / {total} rows{percent}", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a table from the database.")
+    parser.add_argument("table", choices=sorted(export.EXPORT_TABLES), help="what to export")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--db", default="students.db", help="SQLite database file (default: students.db)")
+    parser.add_argument("--format", choices=export.FORMATS, help="output format (default: by file extension)")
+    parser.add_argument("--order-by", help="sort column, optionally with ASC or DESC, e.g. \"GPA DESC\" or STUDENTS.NAME (default: id)")
+    parser.add_argument("--quiet", action="store_true", help="do not print progress")
+    args = parser.parse_args(argv)
+
+    db = StudentDatabase(args.db)
+    start = time.perf_counter()
+    try:
+        count = export.export_table(db, args.table, args.path, args.format,
+                                    None if args.quiet else print_progress, args.order_by)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        db.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Exported {count} {args.table} row(s) to {args.path} in {time.perf_counter() - start:.1f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
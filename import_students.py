@@ -0,0 +1,74 @@
+"""
+Command line import of a registrar export (CSV or JSONL) into students.db.
+
+    python import_students.py students.csv --db students.db --chunk-size 5000
+
+CSV files need a header with the columns name, last_name, gpa, major, year, email.
+JSONL files hold one object per line with the same keys.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from student_db import StudentDatabase
+
+
+def iter_csv_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def iter_jsonl_rows(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # cudi xazi: None gadaecema da bulk_add_students mas uarkofs
+                yield None
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import students into the database.")
+    parser.add_argument("path", help="CSV or JSONL file to import")
+    parser.add_argument("--db", default="students.db", help="SQLite database file (default: students.db)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: by file extension)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per transaction (default: 5000)")
+    parser.add_argument("--report", help="write rejected rows to this CSV file")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    rows = iter_jsonl_rows(args.path) if fmt == "jsonl" else iter_csv_rows(args.path)
+
+    db = StudentDatabase(args.db)
+    inserted, rejections = db.bulk_add_students(rows, chunk_size=args.chunk_size)
+
+    print(f"Imported {inserted} student(s), rejected {len(rejections)}.")
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "reason"])
+            writer.writerows(rejections)
+    else:
+        for row_number, reason in rejections[:20]:
+            print(f"  row {row_number}: {reason}")
+        if len(rejections) > 20:
+            print(f"  ... {len(rejections) - 20} more (use --report to save them all)")
+    return 0 if not rejections else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
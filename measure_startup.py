@@ -0,0 +1,86 @@
+"""
+Measures cold start of the headless database layer versus the GUI module.
+
+    python measure_startup.py --runs 10
+    python measure_startup.py --gui        # also the GUI phases up to the first paint
+
+Each measurement is a fresh interpreter so nothing is cached in-process;
+the reported numbers include interpreter start-up itself ("python -c pass").
+--gui opens main.py (on students.db in this directory) with STUDENT_APP_TRACE
+set and reports the median of every start-up phase (see
+startup_trace.py); it needs a display, or QT_QPA_PLATFORM=offscreen.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = [
+    ("interpreter only", "pass"),
+    ("import student_db", "import student_db"),
+    ("open StudentDatabase", "import student_db; student_db.StudentDatabase(':memory:')"),
+    ("import main (headless)", "import main"),
+    ("import student_app (Qt)", "import student_app"),
+]
+
+
+def time_command(code, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def trace_gui(runs):
+    """
+    Returns [(phase, median ms)] of the GUI start-up trace over runs runs.
+    """
+    phases = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.json")
+        env = dict(os.environ, STUDENT_APP_TRACE=path, STUDENT_APP_TRACE_QUIT="1")
+        for _ in range(runs):
+            subprocess.run([sys.executable, os.path.join(HERE, "main.py")], cwd=HERE, env=env, check=True)
+            with open(path, encoding="utf-8") as f:
+                for phase in json.load(f)["phases"]:
+                    phases.setdefault(phase["phase"], []).append(phase["ms"])
+    return [(phase, statistics.median(samples)) for phase, samples in phases.items()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold start-up time.")
+    parser.add_argument("--runs", type=int, default=5, help="runs per target (default: 5)")
+    parser.add_argument("--gui", action="store_true", help="also trace the GUI start-up phases")
+    args = parser.parse_args(argv)
+
+    print(f"{'target':<28}{'median ms':>12}{'min ms':>10}")
+    for label, code in TARGETS:
+        try:
+            median, best = time_command(code, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"{label:<28}{'failed':>12}")
+            continue
+        print(f"{label:<28}{median:>12.1f}{best:>10.1f}")
+
+    if args.gui:
+        try:
+            phases = trace_gui(args.runs)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"\nGUI trace failed: {e}")
+            return
+        print(f"\n{'GUI phase':<28}{'median ms':>12}")
+        for phase, median in phases:
+            print(f"{phase:<28}{median:>12.1f}")
+        print(f"{'total to first paint':<28}{sum(median for _, median in phases):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Local HTTP/JSON service over students.db, see student_db/service.py for the
+endpoints.
+
+    python serve_api.py --db students.db --port 8080 --workers 8
+    curl http://127.0.0.1:8080/students?order_by=NAME&limit=5
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from student_db import StudentDatabase
+from student_db import service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the student database over HTTP.")
+    parser.add_argument("--db", default="students.db", help="SQLite database file (default: students.db)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port (default: 8080)")
+    parser.add_argument("--workers", type=int, default=8, help="database threads (default: 8)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # reader pool-i workerebze naklebi ar unda iyos,tore threadebi kavshirs daelodebian
+    db = StudentDatabase(args.db, max_readers=max(args.workers, 8))
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Serving {args.db} on http://{host}:{port}/ (Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(service.serve(db, args.host, args.port, args.workers, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
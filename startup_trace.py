@@ -0,0 +1,66 @@
+"""
+Times the phases of opening the GUI, up to the first paint of the window.
+
+Imports nothing from Qt, so main.py can start the clock before PyQt5 loads.
+"""
+import json
+import os
+import sys
+import time
+
+
+class StartupTrace:
+    """
+    Wall-clock phases of the GUI start-up, up to the first paint of the
+    window. Every mark(phase) ends a phase that began at the previous mark:
+
+        STUDENT_APP_TRACE=startup.json python main.py     ("-" prints to stderr)
+
+    With STUDENT_APP_TRACE_QUIT=1 the application quits once the trace is
+    written (measure_startup.py --gui uses this).
+    """
+    def __init__(self, path="-", quit_after=False):
+        self.path = path
+        self.quit_after = quit_after
+        self.start = self.last = time.perf_counter()
+        self.phases = []
+        self.finished = False
+        # finish()-is shemdeg gamoidzaxeba (mag. QApplication.quit)
+        self.on_finish = None
+
+    @classmethod
+    def from_environment(cls):
+        path = os.environ.get("STUDENT_APP_TRACE")
+        if not path:
+            return None
+        return cls(path, os.environ.get("STUDENT_APP_TRACE_QUIT", "") not in ("", "0"))
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.start))
+        self.last = now
+
+    def report(self):
+        return {
+            "total_ms": round((self.last - self.start) * 1000, 2),
+            "phases": [{"phase": phase, "ms": round(duration * 1000, 2), "at_ms": round(at * 1000, 2)}
+                       for phase, duration, at in self.phases],
+        }
+
+    def finish(self):
+        """
+        Writes the report (only the first call does anything).
+        """
+        if self.finished:
+            return
+        self.finished = True
+        report = self.report()
+        if self.path == "-":
+            for phase in report["phases"]:
+                print(f"{phase['phase']:<24}{phase['ms']:>10.1f} ms{phase['at_ms']:>10.1f} ms",
+                      file=sys.stderr)
+        else:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if self.on_finish is not None:
+            self.on_finish()
@@ -0,0 +1,1909 @@
+"""
+PyQt5 desktop interface. Imported by main.py only when the window is opened,
+so scripts that just need StudentDatabase never load Qt.
+"""
+import sys
+import os
+import json
+import datetime
+import threading
+from PyQt5.QtWidgets import (
+    QApplication, QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+    QMessageBox, QComboBox, QGridLayout, QLabel, QHBoxLayout, QInputDialog,
+    QLineEdit, QFormLayout, QTabWidget, QHeaderView, QTableView, QListWidget,
+    QListWidgetItem, QProgressBar, QFileDialog, QProgressDialog, QCheckBox
+)
+from PyQt5.QtGui import QDoubleValidator, QIntValidator, QFont
+from PyQt5.QtCore import (
+    Qt, QLocale, QAbstractTableModel, QModelIndex, QTimer, QObject, pyqtSignal, QSortFilterProxyModel
+)
+
+from student_db import StudentDatabase, QueryProfiler, export, ASSIGNED, ALREADY_ASSIGNED, NOT_FOUND
+from db_executor import DatabaseExecutor
+
+PURGE_INTERVAL_MS = 30 * 60 * 1000
+# amaze meti shecvlili rigi - cxrili mthlianad gadaitvirtos,rigebis mokitxvis nacvlad
+INCREMENTAL_UPDATE_LIMIT = 500
+# bazis failis gverdze snapshot faili (ix. student_db/snapshots.py)
+SNAPSHOT_SUFFIX = ".snapshot"
+# snapshot-is ganaxleba pirveli gverdebis chatvirtvis shemdeg iwyeba
+SNAPSHOT_REFRESH_DELAY_MS = 3000
+
+# faili shenakhvis dialogis filtrebi -> export formati
+EXPORT_FILTERS = {
+    "CSV (*.csv)": "csv",
+    "JSON Lines (*.jsonl)": "jsonl",
+    "Columnar (*.sdbc)": "columnar",
+}
+
+
+class _ExportProgress(QObject):
+    # (gadawerili rigebi, sul) - worker thread-idan GUI thread-shi
+    changed = pyqtSignal(int, int)
+
+
+class _DatabaseChanges(QObject):
+    # (cxrili, cvlilebis saxe, id-ebi) - StudentDatabase listener-idan GUI thread-shi
+    changed = pyqtSignal(str, str, object)
+
+
+def _sqlite_order(value):
+    # SQLite-is ORDER BY rigi: NULL < ricxvebi < teqsti
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value))
+
+
+class LazyTableModel(QAbstractTableModel):
+    """
+    Table model that loads rows page by page while the view scrolls.
+    fetch_page(db, token, limit) runs on the executor's worker thread and
+    returns (rows, next_token); a None token starts from the beginning and a
+    None next_token means there is nothing left.
+
+    columns names the database column of every row value and key_columns the
+    values that identify a row, so single rows can be inserted, moved or
+    removed in sort order (upsert_rows, remove_keys) without reloading.
+    """
+    def __init__(self, headers, executor, columns, key_columns=(0,), right_aligned=(),
+                 page_size=200, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.executor = executor
+        self.columns = list(columns)
+        self.key_columns = tuple(key_columns)
+        self.right_aligned = set(right_aligned)
+        self.page_size = page_size
+        self.rows = []
+        self._rows_by_key = {}
+        self._sort_columns = self.key_columns
+        self._fetch_page = None
+        self._order_by = None
+        self._next_token = None
+        self._exhausted = True
+        self._loading = False
+        self._pending_fetches = 0
+        # gverdis chatvirtvisas washlili gasaghebebi,dzvel gverdshi rom ar daabrunos
+        self._removed_while_loading = set()
+        # chatvirtulis bolos mighma rigebi,romlebic mimdinare gverdshi sheidzleba ar iyos
+        self._deferred = {}
+
+    def reset(self, fetch_page, order_by=None):
+        self.beginResetModel()
+        self.rows = []
+        self._rows_by_key = {}
+        self._fetch_page = fetch_page
+        self._order_by = order_by
+        # sortirebis svetebi: archeuli sveti + unikaluri gasaghebi (rogorc keyset query-shi)
+        sort_columns = [self.columns.index(order_by)] if order_by else []
+        self._sort_columns = tuple(sort_columns + [c for c in self.key_columns if c not in sort_columns])
+        self._next_token = None
+        self._exhausted = False
+        self._loading = False
+        self._removed_while_loading = set()
+        self._deferred = {}
+        self.endResetModel()
+        # pirveli gverdi egreve chaitvirtos,danarcheni scrollisas
+        self.fetchMore(QModelIndex())
+
+    def fully_loaded(self):
+        return self._exhausted and not self._loading
+
+    def row_of(self, key):
+        """
+        Row number of the loaded row with this key, or None if it is not loaded.
+        """
+        row = self._rows_by_key.get(tuple(key))
+        if row is None:
+            return None
+        position = self._position(row)
+        if position < len(self.rows) and self.rows[position] is row:
+            return position
+        return self.rows.index(row)
+
+    def reload(self):
+        if self._fetch_page is not None:
+            self.reset(self._fetch_page, self._order_by)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.rows[index.row()][index.column()])
+        if role == Qt.TextAlignmentRole and index.column() in self.right_aligned:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        # key=self: reset()-is shemdeg dzveli sortirebis gverdi ukve agar gvinda
+        self.executor.submit(self._fetch_page, self._next_token, self.page_size,
+                             key=self, on_result=self._append_page, on_error=self._page_failed)
+
+    def _append_page(self, page):
+        rows, self._next_token = page
+        self._loading = False
+        if self._next_token is None:
+            self._exhausted = True
+        # upsert_rows-it ukve chasmuli da chatvirtvisas washlili rigebi gamovtovot
+        removed = self._removed_while_loading
+        rows = [row for row in rows
+                if self.row_key(row) not in self._rows_by_key and self.row_key(row) not in removed]
+        if not self._pending_fetches:
+            self._removed_while_loading = set()
+        if rows:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self.rows.extend(rows)
+            for row in rows:
+                self._rows_by_key[self.row_key(row)] = row
+            self.endInsertRows()
+        if self._deferred:
+            deferred, self._deferred = self._deferred, {}
+            self.upsert_rows(list(deferred.values()))
+
+    def _page_failed(self, error):
+        self._loading = False
+        self._exhausted = True
+        QMessageBox.warning(None, "Error", f"Could not load data: {error}")
+
+    def row_key(self, row):
+        return tuple(row[i] for i in self.key_columns)
+
+    def _sort_key(self, row):
+        return tuple(_sqlite_order(row[i]) for i in self._sort_columns)
+
+    def _position(self, row):
+        # binaruli dzebna chatvirtul (dalagebul) rigebshi
+        key = self._sort_key(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._sort_key(self.rows[middle]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def refresh_rows(self, fetch_rows, keys):
+        """
+        Runs fetch_rows(db) on the executor and upserts the rows it returns;
+        keys are the rows being refreshed.
+        """
+        self._removed_while_loading.difference_update(keys)
+        self._pending_fetches += 1
+
+        def done(rows):
+            self._pending_fetches -= 1
+            self.upsert_rows(rows)
+
+        def failed(error):
+            self._pending_fetches -= 1
+
+        self.executor.submit(fetch_rows, on_result=done, on_error=failed)
+
+    def upsert_rows(self, rows):
+        """
+        Inserts new rows and moves changed ones to their sorted position. A
+        row that sorts after the last loaded row is left for a later page.
+        """
+        for row in rows:
+            key = self.row_key(row)
+            if key in self._removed_while_loading:
+                continue
+            self._remove_row(key)
+            position = self._position(row)
+            if position == len(self.rows) and not self._exhausted:
+                if self._loading:
+                    self._deferred[key] = row
+                continue
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.rows.insert(position, row)
+            self._rows_by_key[key] = row
+            self.endInsertRows()
+
+    def remove_keys(self, keys):
+        if self._loading or self._pending_fetches:
+            self._removed_while_loading.update(keys)
+        for key in keys:
+            self._deferred.pop(key, None)
+        present = [key for key in keys if key in self._rows_by_key]
+        if len(present) > 50:
+            # bevri rigi: erthi reset-i ufro iafia vidre asobit beginRemoveRows
+            present = set(present)
+            self.beginResetModel()
+            self.rows = [row for row in self.rows if self.row_key(row) not in present]
+            for key in present:
+                del self._rows_by_key[key]
+            self.endResetModel()
+            return
+        for key in present:
+            self._remove_row(key)
+
+    def _remove_row(self, key):
+        row = self._rows_by_key.pop(key, None)
+        if row is None:
+            return
+        position = self._position(row)
+        if position >= len(self.rows) or self.rows[position] is not row:
+            position = self.rows.index(row)
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.rows[position]
+        self.endRemoveRows()
+
+
+# EXAM_DATE tavisuflad iwereba; es formatebi tarighad ikitxeba,danarcheni teqstad
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d")
+
+
+def _number_key(value):
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        # NULL da aracifruli mnishvnelobebi ricxvebis shemdeg
+        return (1, 0.0) if value is None else (2, str(value))
+
+
+def _date_key(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return (0, datetime.datetime.strptime(str(value), fmt).date().toordinal(), "")
+        except ValueError:
+            pass
+    return (1, 0, "" if value is None else str(value))
+
+
+def _text_key(value):
+    # SQLite-is BINARY rigi,rom bazidan wamoghebul gverdebs daemthxves
+    return "" if value is None else str(value)
+
+
+class TableSortProxy(QSortFilterProxyModel):
+    """
+    Sorts and filters the rows a LazyTableModel has loaded, in memory.
+    sort_types maps a column to "number" or "date" (other columns sort as
+    text); set_filters({column: predicate}) keeps only rows whose values pass
+    every predicate. New pages and row updates are placed in order as they
+    arrive.
+    """
+    SORT_KEYS = {"number": _number_key, "date": _date_key}
+
+    def __init__(self, source, sort_types=None, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setDynamicSortFilter(True)
+        self.sort_types = dict(sort_types or {})
+        self.filters = {}
+
+    def set_filters(self, filters):
+        # None = am svetze filtri ar aris
+        self.filters = {column: p for column, p in filters.items() if p is not None}
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.filters:
+            return True
+        row = self.sourceModel().rows[source_row]
+        return all(predicate(row[column]) for column, predicate in self.filters.items())
+
+    def lessThan(self, left, right):
+        # data()-s (str) nacvlad pirdapir rigis mnishvnelobebi,tipis mixedvit
+        rows = self.sourceModel().rows
+        column = left.column()
+        key = self.SORT_KEYS.get(self.sort_types.get(column), _text_key)
+        left_key = key(rows[left.row()][column])
+        right_key = key(rows[right.row()][column])
+        if left_key != right_key:
+            return left_key < right_key
+        # tolebi id-it,rom rigi stabiluri iyos
+        return _number_key(rows[left.row()][0]) < _number_key(rows[right.row()][0])
+
+
+#QT 5   ui aris es,mtavari frontendi,ui qti
+class StudentManagementApp(QWidget):
+    def __init__(self, trace=None):
+        super().__init__()
+        # trace = startup_trace.StartupTrace an None (ix. main.py)
+        self.trace = trace
+        self.first_painted = False
+        # yvela bazis gamodzaxeba fonur thread-ze sruldeba,UI ar ikideba
+        # STUDENT_DB_PROFILE=metrics.json profilers rthavs: chndeba Diagnostics tabi
+        # da daxurvisas metrikebi am failshi iwereba
+        self.profile_path = os.environ.get("STUDENT_DB_PROFILE")
+        self.db = StudentDatabase(profiler=QueryProfiler() if self.profile_path else None)
+        if trace is not None:
+            trace.mark("database open")
+        self.executor = DatabaseExecutor(lambda: self.db, max_threads=4, parent=self)
+        self.current_order = "STUDENT_ID"
+        # bazis cvlilebebi cxrilebshi rigebad shedis,mteli cxrilis gadatvirtvis gareshe
+        self.db_changes = _DatabaseChanges(self)
+        self.db_changes.changed.connect(self.apply_db_change)
+        self.db.add_listener(self.db_changes.changed.emit)
+        # snapshot faili gashvebisas query-s gareshe ikitxeba; bazastan shesabamisobas
+        # yoveli gverdi amowmebs (snapshot_pages); lock-it gverdi da snapshot-is
+        # daxurva/shecvla erthdroulad ar xdeba
+        self.snapshot_path = None
+        self.snapshot = None
+        self.snapshot_lock = threading.Lock()
+        if not self.db.connections.in_memory:
+            self.snapshot_path = self.db.connections.db_name + SNAPSHOT_SUFFIX
+            self.snapshot = self.db.open_snapshot(self.snapshot_path, refresh=False)
+
+       #sortireba
+        self.STUDENT_SORT_MAP = {
+            "ID": "STUDENT_ID",
+            "Name": "NAME",
+            "Last Name": "LAST_NAME",
+            "GPA": "GPA",
+            "Year": "YEAR"
+        }
+        self.EXAM_SORT_MAP = {
+            "ID": "EXAM_ID",
+            "Name": "EXAM_NAME",
+            "Date": "EXAM_DATE"
+        }
+        self.ASSIGN_SORT_MAP = {
+            "Student ID": "STUDENT_EXAMS.STUDENT_ID",
+            "Student Name": "STUDENTS.NAME",
+            "Exam ID": "STUDENT_EXAMS.EXAM_ID",
+            "Exam Name": "EXAMS.EXAM_NAME"
+        }
+
+        self.initUI()
+        if trace is not None:
+            trace.mark("window built")
+
+        # washlilebis purge yovel 30 tsutshi (da erthxel gashvebidan ertsi tsutshi)
+        self.purge_timer = QTimer(self)
+        self.purge_timer.timeout.connect(self.purge_deleted)
+        self.purge_timer.start(PURGE_INTERVAL_MS)
+        QTimer.singleShot(60 * 1000, self.purge_deleted)
+        QTimer.singleShot(SNAPSHOT_REFRESH_DELAY_MS, self.refresh_snapshot)
+    
+    def initUI(self):
+        self.setWindowTitle("Student and Exam Management System")
+        self.setGeometry(100, 100, 1100, 600)
+        
+ 
+        self.setStyleSheet("""
+            background-color: #2c3e50; /* Dark background */
+            color: #ecf0f1; /* Light text */
+            font-size: 14px;
+        """)
+
+     
+        self.tabs = QTabWidget()
+        self.tabs.setStyleSheet("""
+            QTabWidget::pane {
+                border: 1px solid #34495e;
+            }
+            QTabBar::tab {
+                background: #34495e;
+                color: #ecf0f1;
+                padding: 8px;
+                margin: 2px;
+            }
+            QTabBar::tab:selected {
+                background: #3b4c5c;
+            }
+        """)
+        if self.trace is not None:
+            self.trace.mark("stylesheet")
+        # tabi (da misi monacemebi) pirvel gaxsnaze igeba (ensure_tab); manamde carieli konteineria
+        self.tab_pages = [
+            ("Students", self.create_student_tab),
+            ("Exams", self.create_exam_tab),
+            ("Assigned Students", self.create_assignments_tab),
+            ("Student", self.create_student_exams_tab),
+            ("Statistics", self.create_statistics_tab),
+            ("Schedule", self.create_schedule_tab),
+        ]
+        if self.db.profiler is not None:
+            self.tab_pages.append(("Diagnostics", self.create_diagnostics_tab))
+        self.built_tabs = set()
+        # dzebnidan gaxsnili gamocda,romelic jer ar chatvirtula
+        self.pending_exam = None
+        for title, _ in self.tab_pages:
+            container = QWidget()
+            container_layout = QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(container, title)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+
+        # busy indikatori,chans roca bazas fonze mushaoba aqvs
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumHeight(6)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.hide()
+        self.executor.busy_changed.connect(self.busy_bar.setVisible)
+
+        main_layout = QVBoxLayout()
+        main_layout.addWidget(self.tabs)
+        main_layout.addWidget(self.busy_bar)
+        self.setLayout(main_layout)
+
+    def ensure_tab(self, index):
+        """
+        Builds tab index the first time it is shown; building a tab starts
+        loading its data.
+        """
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        _, create = self.tab_pages[index]
+        self.tabs.widget(index).layout().addWidget(create())
+
+    def tab_built(self, title):
+        return any(self.tab_pages[i][0] == title for i in self.built_tabs)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_painted:
+            # fanjara jer chandeba,mimdinare tabi (da monacemebi) mis shemdeg
+            self.first_painted = True
+            if self.trace is not None:
+                self.trace.mark("first paint")
+                self.trace.finish()
+            QTimer.singleShot(0, lambda: self.ensure_tab(self.tabs.currentIndex()))
+
+    #studentebis gverdi,tabi
+    def create_student_tab(self):
+        student_tab = QWidget()
+        layout = QVBoxLayout()
+
+
+        self.student_model = LazyTableModel(
+            ["ID", "Name", "Last Name", "GPA", "Major", "Year", "Email"], self.executor,
+            ["STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL"],
+            right_aligned=(0, 5))
+        # sortireba/filtri chatvirtul rigebze mexsierebashi (ID, GPA, Year - ricxvebi)
+        self.student_proxy = TableSortProxy(self.student_model, {0: "number", 3: "number", 5: "number"})
+        self.student_proxy.sort(0)
+        self.student_model.rowsInserted.connect(self.load_filtered_students)
+        self.student_table = QTableView()
+        self.student_table.setModel(self.student_proxy)
+        # ramdenime studentis monishvna (Assign Cohort-istvis)
+        self.student_table.setSelectionBehavior(QTableView.SelectRows)
+        self.student_table.setSelectionMode(QTableView.ExtendedSelection)
+        self.student_table.verticalHeader().setVisible(False)
+        header = self.student_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+
+        table_font = self.student_table.font()
+        table_font.setPointSize(11)
+        self.student_table.setFont(table_font)
+
+        self.student_table.setStyleSheet("""
+            QTableView {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+
+        control_layout = QHBoxLayout()
+
+
+        self.student_sort_combo = QComboBox()
+        self.student_sort_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                padding: 4px;
+            }
+        """)
+        
+        self.student_sort_combo.addItems(self.STUDENT_SORT_MAP.keys())
+        self.student_sort_combo.currentIndexChanged.connect(self.on_student_sort_change)
+        control_layout.addWidget(QLabel("Sort by:"))
+        control_layout.addWidget(self.student_sort_combo)
+
+        self.refresh_btn = self.create_button("Refresh", "#2980b9", self.refresh_student_data)
+        self.delete_btn = self.create_button("Delete Student", "#c0392b", self.delete_student)
+        self.add_btn = self.create_button("Add Student", "#27ae60", self.add_student)
+        self.undo_student_btn = self.create_button("Undo Delete", "#7f8c8d", self.undo_delete_students)
+        self.undo_student_btn.setEnabled(False)
+        self.deleted_student_ids = []
+
+        self.export_students_btn = self.create_button(
+            "Export", "#8e44ad",
+            lambda: self.export_table("students", self.STUDENT_SORT_MAP[self.student_sort_combo.currentText()]))
+
+        control_layout.addStretch()
+        control_layout.addWidget(self.refresh_btn)
+        control_layout.addWidget(self.delete_btn)
+        control_layout.addWidget(self.undo_student_btn)
+        control_layout.addWidget(self.add_btn)
+        control_layout.addWidget(self.export_students_btn)
+
+        layout.addLayout(control_layout)
+        layout.addLayout(self.create_student_filters())
+        layout.addWidget(self.student_table)
+
+        student_tab.setLayout(layout)
+        self.refresh_student_data()
+        # fakultetis filtri statistikis agregatebidan ivseba
+        self.refresh_statistics()
+        return student_tab
+
+    def create_student_filters(self):
+        """
+        Fakultetis,wlis da GPA-s filtrebi,chatvirtul rigebs mexsierebashi filtravs
+        """
+        filter_layout = QHBoxLayout()
+        input_style = """
+            background-color: #ecf0f1;
+            color: #2c3e50;
+            border: 1px solid #bdc3c7;
+            border-radius: 4px;
+            padding: 4px;
+        """
+        self.major_filter_combo = QComboBox()
+        self.major_filter_combo.setStyleSheet(input_style)
+        self.major_filter_combo.addItem("Any", None)
+        self.major_filter_combo.currentIndexChanged.connect(self.apply_student_filters)
+
+        self.year_min_input, self.year_max_input = QLineEdit(), QLineEdit()
+        self.gpa_min_input, self.gpa_max_input = QLineEdit(), QLineEdit()
+        gpa_validator = QDoubleValidator(0.0, 4.0, 2)
+        gpa_validator.setLocale(QLocale(QLocale.C))
+        for field, placeholder, validator in (
+                (self.year_min_input, "from", QIntValidator(0, 9999)),
+                (self.year_max_input, "to", QIntValidator(0, 9999)),
+                (self.gpa_min_input, "min", gpa_validator),
+                (self.gpa_max_input, "max", gpa_validator)):
+            field.setPlaceholderText(placeholder)
+            field.setValidator(validator)
+            field.setMaximumWidth(70)
+            field.setStyleSheet(input_style)
+            field.textChanged.connect(self.apply_student_filters)
+
+        filter_layout.addWidget(QLabel("Major:"))
+        filter_layout.addWidget(self.major_filter_combo)
+        filter_layout.addWidget(QLabel("Year:"))
+        filter_layout.addWidget(self.year_min_input)
+        filter_layout.addWidget(self.year_max_input)
+        filter_layout.addWidget(QLabel("GPA:"))
+        filter_layout.addWidget(self.gpa_min_input)
+        filter_layout.addWidget(self.gpa_max_input)
+        filter_layout.addStretch()
+        return filter_layout
+
+    @staticmethod
+    def _range_filter(min_input, max_input):
+        def bound(field):
+            try:
+                return float(field.text())
+            except ValueError:
+                return None
+
+        low, high = bound(min_input), bound(max_input)
+        if low is None and high is None:
+            return None
+
+        def accepts(value):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return False
+            return (low is None or value >= low) and (high is None or value <= high)
+        return accepts
+
+    def apply_student_filters(self):
+        major = self.major_filter_combo.currentData()
+        self.student_proxy.set_filters({
+            3: self._range_filter(self.gpa_min_input, self.gpa_max_input),
+            4: None if major is None else (lambda value: value == major),
+            5: self._range_filter(self.year_min_input, self.year_max_input),
+        })
+        self.load_filtered_students()
+
+    def load_filtered_students(self, *args):
+        # filtrma tu tsxrili daacariela,shemdegi gverdebi avtomaturad chaitvirtos
+        if (self.student_proxy.filters and self.student_proxy.rowCount() < self.student_model.page_size
+                and self.student_model.canFetchMore()):
+            self.student_model.fetchMore()
+
+    def sort_table(self, model, proxy, db_column, refresh):
+        """
+        Chatvirtuli rigebi mexsierebashi lagdeba; bazas mxolod mashin vekitxebit,
+        roca cxrili bolomde ar aris chatvirtuli (pirveli gverdebi sxva rigit unda wamovighot)
+        """
+        proxy.sort(model.columns.index(db_column))
+        if not model.fully_loaded():
+            refresh(order_by=db_column)
+
+    def on_student_sort_change(self):
+  
+        chosen_text = self.student_sort_combo.currentText()
+        db_column = self.STUDENT_SORT_MAP[chosen_text]
+        self.current_order = db_column
+        self.sort_table(self.student_model, self.student_proxy, db_column, self.refresh_student_data)
+
+    def refresh_student_data(self, order_by=None):
+        if order_by:
+            self.current_order = order_by
+        order = self.current_order
+        self.student_model.reset(self.snapshot_pages("students_page", "get_students_page", order, "STUDENT_ID"),
+                                 order)
+
+    def add_student(self):
+        form = QWidget()
+        form.setWindowTitle("Add New Student")
+        form.setMinimumWidth(400)
+        
+        layout = QFormLayout()
+        form.setStyleSheet("""
+            QWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+            }
+            QLineEdit, QComboBox {
+                padding: 6px;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+            }
+        """)
+
+        
+        name_input = QLineEdit()
+        last_name_input = QLineEdit()
+        
+
+        gpa_input = QLineEdit()
+        gpa_validator = QDoubleValidator(0.0, 4.0, 2)
+        gpa_validator.setNotation(QDoubleValidator.StandardNotation)
+        gpa_validator.setLocale(QLocale.c())  # Force '.' as decimal separator
+        gpa_input.setValidator(gpa_validator)
+        
+        major_input = QComboBox()
+        major_input.addItems([
+            "Computer Science", "Information Technology", 
+            "Electrical Engineering", "Mechanical Engineering",
+            "Business Administration", "Mathematics", "Physics"
+        ])
+        
+        year_input = QLineEdit()
+        current_year = datetime.datetime.now().year
+        year_validator = QIntValidator(1999, current_year)
+        year_input.setValidator(year_validator)
+        
+        email_input = QLineEdit()
+
+        # form fanjaristvis sadac monacemebs vwert,vamatebt xazebs
+        layout.addRow(QLabel("First Name:"), name_input)
+        layout.addRow(QLabel("Last Name:"), last_name_input)
+        layout.addRow(QLabel("GPA (0.0-4.0):"), gpa_input)
+        layout.addRow(QLabel("Major:"), major_input)
+        layout.addRow(QLabel("Enrollment Year:"), year_input)
+        layout.addRow(QLabel("Email:"), email_input)
+
+   
+        submit_btn = QPushButton("Submit")
+        submit_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #219a52;
+            }
+        """)
+        
+        def submit():
+            if not all([name_input.text(), last_name_input.text(), gpa_input.text(),
+                       year_input.text(), email_input.text()]):
+                QMessageBox.warning(form, "Error", "All fields are required!")
+                return
+
+            try:
+                values = (
+                    name_input.text(),
+                    last_name_input.text(),
+                    float(gpa_input.text()),
+                    major_input.currentText(),
+                    int(year_input.text()),
+                    email_input.text()
+                )
+            except ValueError:
+                QMessageBox.warning(form, "Error", "Please enter valid values!")
+                return
+
+            def done(success):
+                submit_btn.setEnabled(True)
+                if success:
+                    QMessageBox.information(form, "Success", "Student added successfully!")
+                    form.close()
+                else:
+                    QMessageBox.warning(form, "Error", "Invalid email format or database error!")
+
+            submit_btn.setEnabled(False)
+            self.executor.submit(lambda db: db.add_student(*values), on_result=done)
+
+        submit_btn.clicked.connect(submit)
+        layout.addRow(submit_btn)
+        form.setLayout(layout)
+        form.show()
+
+    def delete_student(self):
+        # monishnuli rigebi erthi transakciit ishleba,tu araferia monishnuli - ID-it
+        ids = self.selected_student_ids()
+        if ids:
+            answer = QMessageBox.question(self, "Delete Students", f"Delete {len(ids)} selected student(s)?")
+            if answer != QMessageBox.Yes:
+                return
+        else:
+            student_id, ok = QInputDialog.getText(self, "Delete Student", "Enter Student ID:")
+            if not ok:
+                return
+
+            if not student_id.isdigit():
+                QMessageBox.warning(self, "Error", "Invalid Student ID format!")
+                return
+            ids = [int(student_id)]
+
+        def done(count):
+            if count:
+                self.deleted_student_ids = ids
+                self.undo_student_btn.setEnabled(True)
+                QMessageBox.information(self, "Success",
+                                        f"{count} student(s) deleted. Use Undo Delete to bring them back.")
+            else:
+                QMessageBox.warning(self, "Error", "Student not found or deletion failed!")
+
+        self.executor.submit(lambda db: db.delete_students(ids), on_result=done)
+
+    def undo_delete_students(self):
+        ids = self.deleted_student_ids
+
+        def done(count):
+            self.undo_student_btn.setEnabled(False)
+            QMessageBox.information(self, "Undo", f"{count} student(s) restored.")
+
+        self.executor.submit(lambda db: db.restore_students(ids), on_result=done)
+
+    #qmnis gamocdebis fanjaras anu tabs
+    def create_exam_tab(self):
+        exam_tab = QWidget()
+        layout = QVBoxLayout()
+
+       
+        self.exam_model = LazyTableModel(["ID", "Exam Name", "Date"], self.executor,
+                                         ["EXAM_ID", "EXAM_NAME", "EXAM_DATE"], right_aligned=(0,))
+        self.exam_proxy = TableSortProxy(self.exam_model, {0: "number", 2: "date"})
+        self.exam_proxy.sort(0)
+        self.exam_model.rowsInserted.connect(self.select_pending_exam)
+        self.exam_table = QTableView()
+        self.exam_table.setModel(self.exam_proxy)
+        self.exam_table.setSelectionBehavior(QTableView.SelectRows)
+        self.exam_table.setSelectionMode(QTableView.ExtendedSelection)
+        self.exam_table.verticalHeader().setVisible(False)
+        
+        header = self.exam_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+
+        table_font = self.exam_table.font()
+        table_font.setPointSize(11)
+        self.exam_table.setFont(table_font)
+
+        self.exam_table.setStyleSheet("""
+            QTableView {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+
+
+        exam_control_layout = QHBoxLayout()
+
+        self.exam_sort_combo = QComboBox()
+        self.exam_sort_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                padding: 4px;
+            }
+        """)
+        self.exam_sort_combo.addItems(self.EXAM_SORT_MAP.keys())
+        self.exam_sort_combo.currentIndexChanged.connect(self.on_exam_sort_change)
+        exam_control_layout.addWidget(QLabel("Sort by:"))
+        exam_control_layout.addWidget(self.exam_sort_combo)
+
+        self.refresh_exam_btn = self.create_button("Refresh Exams", "#2980b9", self.refresh_exam_data)
+        self.add_exam_btn = self.create_button("Add Exam", "#27ae60", self.add_exam)
+        self.delete_exam_btn = self.create_button("Delete Exam", "#c0392b", self.delete_exam)
+        self.undo_exam_btn = self.create_button("Undo Delete", "#7f8c8d", self.undo_delete_exams)
+        self.undo_exam_btn.setEnabled(False)
+        self.deleted_exam_ids = []
+
+        self.assign_student_btn = self.create_button("Assign Student", "#2980b9", self.assign_student_to_exam)
+        self.assign_cohort_btn = self.create_button("Assign Cohort", "#2980b9", self.assign_cohort_to_exam)
+
+        exam_control_layout.addStretch()
+        exam_control_layout.addWidget(self.refresh_exam_btn)
+        exam_control_layout.addWidget(self.assign_student_btn)
+        exam_control_layout.addWidget(self.assign_cohort_btn)
+        exam_control_layout.addWidget(self.add_exam_btn)
+        exam_control_layout.addWidget(self.delete_exam_btn)
+        exam_control_layout.addWidget(self.undo_exam_btn)
+        exam_control_layout.addWidget(self.create_button(
+            "Export", "#8e44ad",
+            lambda: self.export_table("exams", self.EXAM_SORT_MAP[self.exam_sort_combo.currentText()])))
+
+        layout.addLayout(exam_control_layout)
+        layout.addWidget(self.exam_table)
+
+        exam_tab.setLayout(layout)
+        self.refresh_exam_data()
+        return exam_tab
+
+    def on_exam_sort_change(self):
+        chosen_text = self.exam_sort_combo.currentText()
+        db_column = self.EXAM_SORT_MAP[chosen_text]
+        self.sort_table(self.exam_model, self.exam_proxy, db_column, self.refresh_exam_data)
+
+    def refresh_exam_data(self, order_by=None):
+        if not order_by:
+            order_by = "EXAM_ID"
+        self.exam_model.reset(self.snapshot_pages("exams_page", "get_exams_page", order_by, "EXAM_ID"), order_by)
+
+    def add_exam(self):
+        form = QWidget()
+        form.setWindowTitle("Add New Exam")
+        form.setMinimumWidth(400)
+        
+        layout = QFormLayout()
+        form.setStyleSheet("""
+            QWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+            }
+            QLineEdit, QComboBox {
+                padding: 6px;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+            }
+        """)
+
+
+        exam_name_input = QLineEdit()
+        exam_date_input = QLineEdit()
+        description_input = QLineEdit()
+
+        layout.addRow(QLabel("Exam Name:"), exam_name_input)
+        layout.addRow(QLabel("Exam Date (YYYY-MM-DD):"), exam_date_input)
+        layout.addRow(QLabel("Description:"), description_input)
+
+     
+        submit_btn = QPushButton("Submit")
+        submit_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #219a52;
+            }
+        """)
+
+        def submit():
+            if not all([exam_name_input.text(), exam_date_input.text()]):
+                QMessageBox.warning(form, "Error", "Exam Name and Date are required!")
+                return
+
+            values = (
+                exam_name_input.text(),
+                exam_date_input.text(),
+                description_input.text()
+            )
+
+            def done(success):
+                submit_btn.setEnabled(True)
+                if success:
+                    QMessageBox.information(form, "Success", "Exam added successfully!")
+                    form.close()
+                else:
+                    QMessageBox.warning(form, "Error", "Database error!")
+
+            submit_btn.setEnabled(False)
+            self.executor.submit(lambda db: db.add_exam(*values), on_result=done)
+
+        submit_btn.clicked.connect(submit)
+        layout.addRow(submit_btn)
+        form.setLayout(layout)
+        form.show()
+
+    def selected_exam_ids(self):
+        return [int(self.exam_proxy.data(index)) for index in self.exam_table.selectionModel().selectedRows(0)]
+
+    def delete_exam(self):
+        """
+        gamocdis washlis funqcia,romelic auqmebs da shlis gamocdas (an monishnul gamocdebs)
+        """
+        ids = self.selected_exam_ids()
+        if ids:
+            answer = QMessageBox.question(self, "Delete Exams", f"Delete {len(ids)} selected exam(s)?")
+            if answer != QMessageBox.Yes:
+                return
+        else:
+            exam_id_str, ok = QInputDialog.getText(self, "Delete Exam", "Enter Exam ID:")
+            if not ok or not exam_id_str.isdigit():
+                QMessageBox.warning(self, "Error", "Invalid Exam ID!")
+                return
+            ids = [int(exam_id_str)]
+
+        def done(count):
+            if count:
+                self.deleted_exam_ids = ids
+                self.undo_exam_btn.setEnabled(True)
+                QMessageBox.information(self, "Success",
+                                        f"{count} exam(s) deleted. Use Undo Delete to bring them back.")
+            else:
+                QMessageBox.warning(self, "Error", "Exam not found or deletion failed!")
+
+        self.executor.submit(lambda db: db.delete_exams(ids), on_result=done)
+
+    def undo_delete_exams(self):
+        ids = self.deleted_exam_ids
+
+        def done(count):
+            self.undo_exam_btn.setEnabled(False)
+            QMessageBox.information(self, "Undo", f"{count} exam(s) restored.")
+
+        self.executor.submit(lambda db: db.restore_exams(ids), on_result=done)
+
+    def apply_db_change(self, table, change, ids):
+        """
+        StudentDatabase-is cvlilebis shetyobineba: shesabamis cxrilshi mxolod
+        es rigebi emateba,gadaadgildeba an ishleba
+        """
+        # ar agebuli tabi agebisas mainc axal monacemebs chatvirtavs
+        if table == "students":
+            # statistikebi agregatebidan ikitxeba,iafia
+            if self.tab_built("Students") or self.tab_built("Statistics"):
+                self.refresh_statistics()
+            if not self.tab_built("Students"):
+                return
+            model, fetch = self.student_model, lambda db: db.get_students_by_ids(ids)
+        elif table == "exams":
+            if not self.tab_built("Exams"):
+                return
+            model, fetch = self.exam_model, lambda db: db.get_exams_by_ids(ids)
+        else:
+            if not self.tab_built("Assigned Students"):
+                return
+            model, fetch = self.assignments_model, lambda db: db.get_assignments_by_keys(ids)
+
+        keys = [tuple(i) if isinstance(i, (tuple, list)) else (i,) for i in ids]
+        if change == "deleted":
+            model.remove_keys(keys)
+        elif len(keys) > INCREMENTAL_UPDATE_LIMIT:
+            model.reload()
+        else:
+            model.refresh_rows(fetch, keys)
+
+    def purge_deleted(self):
+        # tombstone-ebis sabolood washla da failis shemcireba fonze
+        self.executor.submit(lambda db: db.purge_deleted(), key="purge")
+
+    def assign_student_to_exam(self):
+        """
+        Patara dialogs da fanjaras xsnis,gvadzlvs sashualebas rom studenti davnishnot gamocdaze
+        """
+        # Create a small QWidget as a dialog
+        dialog = QWidget()
+        dialog.setWindowTitle("Assign Student to Exam")
+        dialog.setMinimumWidth(300)
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+
+
+        exam_combo = QComboBox()
+
+        def fill_exams(all_exams):
+            for exam in all_exams:
+                exam_id, exam_name, exam_date = exam[:3]  # ignoring description
+                display_text = f"{exam_name} (ID: {exam_id})"
+                exam_combo.addItem(display_text, exam_id)
+            assign_btn.setEnabled(True)
+
+        student_id_input = QLineEdit()
+        student_id_input.setPlaceholderText("Enter Student ID")
+
+        form_layout.addRow(QLabel("Exam:"), exam_combo)
+        form_layout.addRow(QLabel("Student ID:"), student_id_input)
+        layout.addLayout(form_layout)
+
+        assign_btn = QPushButton("Assign")
+        assign_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2980b9;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #2471a3;
+            }
+        """)
+
+        def do_assign():
+            selected_exam_id = exam_combo.currentData()
+            sid_str = student_id_input.text().strip()
+            if not sid_str.isdigit():
+                QMessageBox.warning(dialog, "Error", "Invalid Student ID!")
+                return
+
+            student_id = int(sid_str)
+
+            def done(outcome):
+                assign_btn.setEnabled(True)
+                if outcome == ASSIGNED:
+                    QMessageBox.information(dialog, "Success", "Student assigned to exam successfully!")
+                    dialog.close()
+                elif outcome == ALREADY_ASSIGNED:
+                    QMessageBox.warning(dialog, "Error", "The student is already assigned to this exam!")
+                elif outcome == NOT_FOUND:
+                    QMessageBox.warning(dialog, "Error", "No such student or exam!")
+                else:
+                    QMessageBox.warning(dialog, "Error", "Assignment failed! (database error)")
+
+            assign_btn.setEnabled(False)
+            self.executor.submit(lambda db: db.assign_student_to_exam(student_id, selected_exam_id),
+                                 on_result=done)
+
+        assign_btn.clicked.connect(do_assign)
+        layout.addWidget(assign_btn)
+
+        # gamocdebis sia fonze itvirteba,manamde Assign gamortulia
+        assign_btn.setEnabled(False)
+        self.executor.submit(lambda db: db.get_all_exams(), on_result=fill_exams)
+
+        dialog.setLayout(layout)
+        dialog.show()
+
+    def selected_student_ids(self):
+        if not self.tab_built("Students"):
+            return []
+        return [int(self.student_proxy.data(index))
+                for index in self.student_table.selectionModel().selectedRows(0)]
+
+    def assign_cohort_to_exam(self):
+        """
+        Mteli jgufis (fakulteti/weli an Students tabze monishnuli studentebi)
+        danishvna gamocdaze erthi transakciit
+        """
+        dialog = QWidget()
+        dialog.setWindowTitle("Assign Cohort to Exam")
+        dialog.setMinimumWidth(350)
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+
+        exam_combo = QComboBox()
+        major_combo = QComboBox()
+        major_combo.addItem("Any", None)
+        year_combo = QComboBox()
+        year_combo.addItem("Any", None)
+
+        selected_ids = self.selected_student_ids()
+        selected_only = QCheckBox(f"Only students selected on the Students tab ({len(selected_ids)})")
+        selected_only.setChecked(bool(selected_ids))
+        selected_only.setEnabled(bool(selected_ids))
+
+        form_layout.addRow(QLabel("Exam:"), exam_combo)
+        form_layout.addRow(QLabel("Major:"), major_combo)
+        form_layout.addRow(QLabel("Year:"), year_combo)
+        layout.addLayout(form_layout)
+        layout.addWidget(selected_only)
+
+        assign_btn = self.create_button("Assign", "#2980b9", lambda: do_assign())
+        assign_btn.setEnabled(False)
+        layout.addWidget(assign_btn)
+
+        def fill_choices(result):
+            exams, summaries = result
+            for exam in exams:
+                exam_combo.addItem(f"{exam[1]} (ID: {exam[0]})", exam[0])
+            # fakultetebi da wlebi agregatebis cxrilidan,STUDENTS-is skanirebis gareshe
+            for major in sorted({s["major"] for s in summaries if s["major"]}):
+                major_combo.addItem(major, major)
+            for year in sorted({s["year"] for s in summaries if s["year"]}):
+                year_combo.addItem(str(year), year)
+            assign_btn.setEnabled(exam_combo.count() > 0)
+
+        def do_assign():
+            exam_id = exam_combo.currentData()
+            major = major_combo.currentData()
+            year = year_combo.currentData()
+            ids = selected_ids if selected_only.isChecked() else None
+            if major is None and year is None and ids is None:
+                QMessageBox.warning(dialog, "Error", "Choose a major, a year or select students first.")
+                return
+
+            def done(result):
+                inserted, skipped = result
+                assign_btn.setEnabled(True)
+                QMessageBox.information(
+                    dialog, "Success",
+                    f"Assigned {inserted} student(s), skipped {skipped} (already assigned or not matching).")
+                dialog.close()
+
+            def failed(error):
+                assign_btn.setEnabled(True)
+                QMessageBox.warning(dialog, "Error", f"Assignment failed: {error}")
+
+            assign_btn.setEnabled(False)
+            self.executor.submit(lambda db: db.assign_cohort_to_exam(exam_id, major, year, ids),
+                                 on_result=done, on_error=failed)
+
+        self.executor.submit(lambda db: (db.get_all_exams(), db.get_cohort_summaries()),
+                             on_result=fill_choices)
+
+        dialog.setLayout(layout)
+        self.cohort_dialog = dialog
+        dialog.show()
+
+    # ---------------------- Assignments Tab ---------------------- #
+    def create_assignments_tab(self):
+        assignments_tab = QWidget()
+        layout = QVBoxLayout()
+
+       
+        self.assignments_model = LazyTableModel(
+            ["Student ID", "Student Name", "Exam ID", "Exam Name"], self.executor,
+            ["STUDENT_EXAMS.STUDENT_ID", "STUDENTS.NAME", "STUDENT_EXAMS.EXAM_ID", "EXAMS.EXAM_NAME"],
+            key_columns=(0, 2), right_aligned=(0, 2))
+        self.assignments_proxy = TableSortProxy(self.assignments_model, {0: "number", 2: "number"})
+        self.assignments_proxy.sort(0)
+        self.assignments_table = QTableView()
+        self.assignments_table.setModel(self.assignments_proxy)
+        self.assignments_table.verticalHeader().setVisible(False)
+
+        header = self.assignments_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+
+        table_font = self.assignments_table.font()
+        table_font.setPointSize(11)
+        self.assignments_table.setFont(table_font)
+
+        self.assignments_table.setStyleSheet("""
+            QTableView {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+
+
+        control_layout = QHBoxLayout()
+
+        self.assign_sort_combo = QComboBox()
+        self.assign_sort_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                padding: 4px;
+            }
+        """)
+        self.assign_sort_combo.addItems(self.ASSIGN_SORT_MAP.keys())
+        self.assign_sort_combo.currentIndexChanged.connect(self.on_assign_sort_change)
+        control_layout.addWidget(QLabel("Sort by:"))
+        control_layout.addWidget(self.assign_sort_combo)
+
+        refresh_btn = self.create_button("Refresh", "#2980b9", self.refresh_assignments_data)
+
+        export_btn = self.create_button(
+            "Export", "#8e44ad",
+            lambda: self.export_table("assignments", self.ASSIGN_SORT_MAP[self.assign_sort_combo.currentText()]))
+
+        control_layout.addStretch()
+        control_layout.addWidget(refresh_btn)
+        control_layout.addWidget(export_btn)
+
+        layout.addLayout(control_layout)
+        layout.addWidget(self.assignments_table)
+        assignments_tab.setLayout(layout)
+
+        self.refresh_assignments_data()
+        return assignments_tab
+
+    def on_assign_sort_change(self):
+        chosen_text = self.assign_sort_combo.currentText()
+        db_column = self.ASSIGN_SORT_MAP[chosen_text]
+        self.sort_table(self.assignments_model, self.assignments_proxy, db_column,
+                        self.refresh_assignments_data)
+
+    def refresh_assignments_data(self, order_by=None):
+        """
+        Es funqia,da buttoni,ubralod anaxlebs informacias programashive
+        """
+        if not order_by:
+            order_by = "STUDENT_EXAMS.STUDENT_ID"
+
+        # rows -> (STUDENT_ID, STUDENT_NAME, EXAM_ID, EXAM_NAME)
+        self.assignments_model.reset(
+            self.snapshot_pages("assignments_page", "get_assignments_page", order_by, "STUDENT_EXAMS.STUDENT_ID"),
+            order_by)
+
+    #Tab 2 Student exams (meore gverdi Chveni programis,fanjara)
+    def create_student_exams_tab(self):
+        """
+        qmnis calke tabs anu meore fanjaras pyqtshi,studen idss tu chawert miabav anu danishnav mas gamocdaze
+        
+        """
+        tab = QWidget()
+        layout = QVBoxLayout()
+
+        # --- Search box: shedegebi ikhsneba akrefisas,debounce timer-it ---
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search students and exams...")
+        self.search_input.setStyleSheet("""
+            QLineEdit {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                padding: 6px;
+            }
+        """)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(160)
+        self.search_results.setStyleSheet("""
+            QListWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+            }
+        """)
+        self.search_results.itemActivated.connect(self.open_search_result)
+        self.search_results.itemClicked.connect(self.open_search_result)
+        self.search_results.hide()
+
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.search_results)
+
+        # --- Input field and button to load data ---
+        input_layout = QHBoxLayout()
+        self.student_id_input = QLineEdit()
+        self.student_id_input.setPlaceholderText("Enter Student ID")
+        self.student_id_input.setStyleSheet("""
+            QLineEdit {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                padding: 6px;
+            }
+        """)
+
+        load_button = self.create_button("Load Exams", "#2980b9", self.load_student_exams)
+
+        input_layout.addWidget(self.student_id_input)
+        input_layout.addWidget(load_button)
+
+        layout.addLayout(input_layout)
+
+        #qt labli,rom sruli studentis saxeli achvenos
+        self.student_name_label = QLabel("Student Name: N/A")
+        name_font = QFont()
+        name_font.setBold(True)
+        self.student_name_label.setFont(name_font)
+        layout.addWidget(self.student_name_label)
+
+
+        self.student_exams_table = QTableWidget()
+
+        self.student_exams_table.setColumnCount(4)
+        self.student_exams_table.setHorizontalHeaderLabels(["Exam ID", "Exam Name", "Exam Date", "Description"])
+        self.student_exams_table.verticalHeader().setVisible(False)
+
+        header = self.student_exams_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+
+        table_font = self.student_exams_table.font()
+        table_font.setPointSize(11)
+        self.student_exams_table.setFont(table_font)
+
+        self.student_exams_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+
+        layout.addWidget(self.student_exams_table)
+        tab.setLayout(layout)
+
+        return tab
+
+    def load_student_exams(self):
+        """
+
+        studentis aidis kitxulobis pyqts input yutshi,danishnul gamocdebsac igebs es funqcia,
+        da abrunebs da wers in examebis anu gamocdebis cxrilshi,
+        srul saxelsa da gvarsac wers tu napovnia
+        """
+        sid_text = self.student_id_input.text().strip()
+        if not sid_text.isdigit():
+            QMessageBox.warning(self, "Error", "Please enter a valid numeric Student ID.")
+            return
+
+        student_id = int(sid_text)
+
+        def query(db):
+            return db.get_student_by_id(student_id), db.get_exams_for_student(student_id)
+
+        self.executor.submit(query, key="student_exams", on_result=self.show_student_exams)
+
+    def show_student_exams(self, result):
+        student_data, exams = result
+
+        # 1) studetis sruli saxelis migeba
+        if student_data:
+            first_name, last_name = student_data
+            self.student_name_label.setText(f"Student Name: {first_name} {last_name}")
+        else:
+            self.student_name_label.setText("Student Name: Not found")
+
+        self.student_exams_table.setRowCount(len(exams))
+        for row_idx, exam in enumerate(exams):
+            # exam -> (EXAM_ID, EXAM_NAME, EXAM_DATE, DESCRIPTION)
+            for col_idx, val in enumerate(exam):
+                item = QTableWidgetItem(str(val))
+                if col_idx == 0:  # Right-align exam ID
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.student_exams_table.setItem(row_idx, col_idx, item)
+
+        if not exams:
+            QMessageBox.information(self, "No Exams Found", "This student is not assigned to any exams.")
+
+    # ---------------------- Export ---------------------- #
+    def export_table(self, table, order_by):
+        """
+        Mteli cxrili failshi (CSV/JSONL/columnar) fonze iwereba,progresi dialogshi chans
+        """
+        path, selected = QFileDialog.getSaveFileName(
+            self, f"Export {table}", f"{table}.csv", ";;".join(EXPORT_FILTERS))
+        if not path:
+            return
+        # gafartoebit gansazghvra,tu ar aris - dialogshi archeuli filtri
+        fmt = export.detect_format(path) if os.path.splitext(path)[1] else EXPORT_FILTERS[selected]
+
+        dialog = QProgressDialog(f"Exporting {table}...", "Cancel", 0, 0, self)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(500)
+        cancelled = threading.Event()
+        dialog.canceled.connect(cancelled.set)
+
+        progress = _ExportProgress(dialog)
+
+        def show_progress(done, total):
+            dialog.setMaximum(max(total, done))
+            dialog.setValue(done)
+
+        progress.changed.connect(show_progress)
+
+        def report(done, total):
+            progress.changed.emit(done, total or 0)
+            return not cancelled.is_set()
+
+        def done(count):
+            dialog.reset()
+            QMessageBox.information(self, "Export", f"Exported {count} row(s) to {path}.")
+
+        def failed(error):
+            dialog.reset()
+            if not isinstance(error, export.ExportCancelled):
+                QMessageBox.warning(self, "Export Failed", str(error))
+
+        self.executor.submit(lambda db: export.export_table(db, table, path, fmt, report, order_by),
+                             on_result=done, on_error=failed)
+
+    # ---------------------- Statistics Tab ---------------------- #
+    def create_statistics_tab(self):
+        """
+        GPA statistikebi fakultetebis da wlebis mixedvit,agregatebidan ikitxeba
+        """
+        tab = QWidget()
+        layout = QVBoxLayout()
+
+        control_layout = QHBoxLayout()
+        self.overall_stats_label = QLabel("All students: N/A")
+        stats_font = QFont()
+        stats_font.setBold(True)
+        self.overall_stats_label.setFont(stats_font)
+        control_layout.addWidget(self.overall_stats_label)
+        control_layout.addStretch()
+        control_layout.addWidget(self.create_button("Refresh", "#2980b9", self.refresh_statistics))
+        layout.addLayout(control_layout)
+
+        self.statistics_table = QTableWidget()
+        self.statistics_table.setColumnCount(8)
+        self.statistics_table.setHorizontalHeaderLabels(
+            ["Major", "Year", "Students", "Mean GPA", "Std Dev", "Median", "P10", "P90"])
+        self.statistics_table.verticalHeader().setVisible(False)
+        self.statistics_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        table_font = self.statistics_table.font()
+        table_font.setPointSize(11)
+        self.statistics_table.setFont(table_font)
+
+        self.statistics_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+
+        layout.addWidget(self.statistics_table)
+        tab.setLayout(layout)
+
+        self.refresh_statistics()
+        return tab
+
+    def refresh_statistics(self):
+        self.executor.submit(lambda db: (db.get_cohort_summary(), db.get_cohort_summaries()),
+                             key="statistics", on_result=self.show_statistics)
+
+    def show_statistics(self, result):
+        overall, summaries = result
+        if self.tab_built("Students"):
+            self.update_major_filter(summaries)
+        if not self.tab_built("Statistics"):
+            return
+        if overall["count"]:
+            self.overall_stats_label.setText(
+                f"All students: {overall['count']}   Mean GPA: {overall['mean']}   "
+                f"Median: {overall['median']}")
+        else:
+            self.overall_stats_label.setText("All students: N/A")
+
+        self.statistics_table.setRowCount(len(summaries))
+        for row, summary in enumerate(summaries):
+            values = [summary["major"], summary["year"], summary["count"], summary["mean"],
+                      summary["stddev"], summary["median"],
+                      summary["percentiles"].get(0.1), summary["percentiles"].get(0.9)]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.statistics_table.setItem(row, col, item)
+
+    def update_major_filter(self, summaries):
+        # Students tabis fakultetis filtri agregatebidan
+        majors = sorted({s["major"] for s in summaries if s["major"]})
+        current = self.major_filter_combo.currentData()
+        if majors != [self.major_filter_combo.itemData(i) for i in range(1, self.major_filter_combo.count())]:
+            self.major_filter_combo.blockSignals(True)
+            self.major_filter_combo.clear()
+            self.major_filter_combo.addItem("Any", None)
+            for major in majors:
+                self.major_filter_combo.addItem(major, major)
+            self.major_filter_combo.setCurrentIndex(max(self.major_filter_combo.findData(current), 0))
+            self.major_filter_combo.blockSignals(False)
+            if self.major_filter_combo.currentData() != current:
+                self.apply_student_filters()
+
+    # ---------------------- Schedule Tab ---------------------- #
+    def create_schedule_tab(self):
+        """
+        Otaxebi,dro-ebi da gamocdebis ganrigi konfliqtebis gareshe
+        """
+        tab = QWidget()
+        layout = QVBoxLayout()
+
+        control_layout = QHBoxLayout()
+        self.schedule_status_label = QLabel("")
+        control_layout.addWidget(self.schedule_status_label)
+        control_layout.addStretch()
+        control_layout.addWidget(self.create_button("Add Room", "#27ae60", self.add_room))
+        control_layout.addWidget(self.create_button("Add Time Slot", "#27ae60", self.add_time_slot))
+        control_layout.addWidget(self.create_button("Build Schedule", "#2980b9", self.build_schedule))
+        layout.addLayout(control_layout)
+
+        self.schedule_table = QTableWidget()
+        self.schedule_table.setColumnCount(7)
+        self.schedule_table.setHorizontalHeaderLabels(
+            ["Exam ID", "Exam", "Date", "Start", "End", "Rooms", "Students"])
+        self.schedule_table.verticalHeader().setVisible(False)
+        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.schedule_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+        layout.addWidget(self.schedule_table)
+
+        tab.setLayout(layout)
+        self.refresh_schedule()
+        return tab
+
+    def add_room(self):
+        name, ok = QInputDialog.getText(self, "Add Room", "Room name:")
+        if not ok or not name.strip():
+            return
+        capacity, ok = QInputDialog.getInt(self, "Add Room", "Capacity:", 30, 1, 100000)
+        if not ok:
+            return
+
+        def done(success):
+            if success:
+                self.refresh_schedule()
+            else:
+                QMessageBox.warning(self, "Error", "Could not add the room (is the name already used?)")
+
+        self.executor.submit(lambda db: db.add_room(name.strip(), capacity), on_result=done)
+
+    def add_time_slot(self):
+        slot_date, ok = QInputDialog.getText(self, "Add Time Slot", "Date (YYYY-MM-DD):")
+        if not ok:
+            return
+        start, ok = QInputDialog.getText(self, "Add Time Slot", "Start time (HH:MM):")
+        if not ok:
+            return
+        end, ok = QInputDialog.getText(self, "Add Time Slot", "End time (HH:MM):")
+        if not ok:
+            return
+        try:
+            datetime.datetime.strptime(slot_date.strip(), "%Y-%m-%d")
+            # "9:00" -> "09:00",rom dro-ebi tekstad shedardes
+            start, end = (datetime.datetime.strptime(value.strip(), "%H:%M").strftime("%H:%M")
+                          for value in (start, end))
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Invalid date or time format!")
+            return
+        if end <= start:
+            QMessageBox.warning(self, "Error", "The slot must end after it starts!")
+            return
+
+        def done(success):
+            if success:
+                self.refresh_schedule()
+            else:
+                QMessageBox.warning(self, "Error", "Could not add the time slot (does it already exist?)")
+
+        self.executor.submit(lambda db: db.add_time_slot(slot_date.strip(), start, end),
+                             on_result=done)
+
+    def build_schedule(self):
+        def done(result):
+            placements, unscheduled = result
+            if unscheduled:
+                QMessageBox.warning(
+                    self, "Schedule",
+                    f"Scheduled {len(placements)} exam(s); {len(unscheduled)} could not be placed "
+                    f"without a clash. Add rooms or time slots. Exam IDs: "
+                    + ", ".join(str(e) for e in unscheduled[:20]))
+            self.refresh_schedule()
+
+        self.executor.submit(lambda db: db.schedule_exams(), key="schedule", on_result=done)
+
+    def refresh_schedule(self):
+        self.executor.submit(
+            lambda db: (db.get_exam_schedule(), db.find_schedule_conflicts(),
+                        len(db.get_rooms()), len(db.get_time_slots())),
+            key="schedule_view", on_result=self.show_schedule)
+
+    def show_schedule(self, result):
+        rows, conflicts, room_count, slot_count = result
+        status = f"{room_count} room(s), {slot_count} time slot(s), {len(rows)} exam(s) scheduled"
+        if conflicts:
+            status += f", {len(conflicts)} conflict(s)!"
+        self.schedule_status_label.setText(status)
+
+        self.schedule_table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for col, value in enumerate(values):
+                item = QTableWidgetItem("" if value is None else str(value))
+                if col in (0, 6):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.schedule_table.setItem(row, col, item)
+
+    # ---------------------- Diagnostics Tab ---------------------- #
+    def create_diagnostics_tab(self):
+        """
+        Bazis metodebis latency da sruli cxrilis skanirebebi (mxolod STUDENT_DB_PROFILE-it)
+        """
+        tab = QWidget()
+        layout = QVBoxLayout()
+
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel(f"Metrics file: {self.profile_path}"))
+        self.cache_stats_label = QLabel("Cache: N/A")
+        control_layout.addWidget(self.cache_stats_label)
+        control_layout.addStretch()
+        control_layout.addWidget(self.create_button("Refresh", "#2980b9", self.refresh_diagnostics))
+        control_layout.addWidget(self.create_button("Dump", "#27ae60", self.dump_diagnostics))
+        layout.addLayout(control_layout)
+
+        self.diagnostics_table = QTableWidget()
+        self.diagnostics_table.setColumnCount(7)
+        self.diagnostics_table.setHorizontalHeaderLabels(
+            ["Method", "Calls", "Mean ms", "P95 ms", "Max ms", "Rows", "VM steps"])
+        self.diagnostics_table.verticalHeader().setVisible(False)
+        self.diagnostics_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.diagnostics_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #ecf0f1;
+                color: #2c3e50;
+                gridline-color: #bdc3c7;
+            }
+            QHeaderView::section {
+                background-color: #34495e;
+                color: white;
+                padding: 4px;
+            }
+        """)
+        layout.addWidget(self.diagnostics_table)
+
+        layout.addWidget(QLabel("Full table scans:"))
+        self.full_scan_list = QListWidget()
+        self.full_scan_list.setMaximumHeight(150)
+        layout.addWidget(self.full_scan_list)
+
+        tab.setLayout(layout)
+        return tab
+
+    def refresh_diagnostics(self):
+        self.executor.submit(lambda db: db.profile_report(), key="diagnostics",
+                             on_result=self.show_diagnostics)
+
+    def show_diagnostics(self, report):
+        cache = report.get("cache")
+        if cache:
+            self.cache_stats_label.setText(
+                f"Cache: {cache['hits']} hits / {cache['misses']} misses "
+                f"({cache['hit_rate']:.0%}), {cache['entries']} entries")
+        methods = report["methods"]
+        self.diagnostics_table.setRowCount(len(methods))
+        for row, (name, stats) in enumerate(methods.items()):
+            values = [name, stats["calls"], stats["mean_ms"], stats["p95_ms"], stats["max_ms"],
+                      stats["rows"], stats["vm_steps"]]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.diagnostics_table.setItem(row, col, item)
+
+        self.full_scan_list.clear()
+        for statement in report["statements"]:
+            if statement["full_scans"]:
+                self.full_scan_list.addItem(
+                    f"{', '.join(statement['full_scans'])} x{statement['count']}: {statement['sql']}")
+
+    def dump_diagnostics(self):
+        self.executor.submit(lambda db: self.write_profile(db), key="diagnostics_dump")
+
+    def write_profile(self, db):
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            json.dump(db.profile_report(), f, indent=2)
+
+    def run_search(self):
+        text = self.search_input.text()
+        # key="search": ufro dzveli dziebis shedegi axals ar gadaeweros
+        self.executor.submit(lambda db: db.search(text), key="search", on_result=self.show_search_results)
+
+    def show_search_results(self, results):
+        self.search_results.clear()
+        for kind, record_id, title, detail in results:
+            item = QListWidgetItem(f"[{kind.capitalize()} {record_id}] {title} - {detail}")
+            item.setData(Qt.UserRole, (kind, record_id))
+            self.search_results.addItem(item)
+        self.search_results.setVisible(bool(results))
+
+    def open_search_result(self, item):
+        kind, record_id = item.data(Qt.UserRole)
+        if kind == "student":
+            self.student_id_input.setText(str(record_id))
+            self.load_student_exams()
+        else:
+            self.tabs.setCurrentIndex(1)  # Exams tab
+            self.ensure_tab(1)
+            self.pending_exam = record_id
+            self.select_pending_exam()
+
+    def select_pending_exam(self, *args):
+        """
+        Selects and scrolls to the exam opened from the search tab, loading
+        further pages until its row arrives.
+        """
+        if self.pending_exam is None:
+            return
+        row = self.exam_model.row_of((self.pending_exam,))
+        if row is None:
+            if self.exam_model.canFetchMore():
+                self.exam_model.fetchMore()
+            elif self.exam_model.fully_loaded():
+                self.pending_exam = None
+            return
+        self.pending_exam = None
+        # cxrili proxy-s rigebs achvenebs,amitom rigi proxy-shi gadagvaqvs
+        index = self.exam_proxy.mapFromSource(self.exam_model.index(row, 0))
+        if index.isValid():
+            self.exam_table.selectRow(index.row())
+            self.exam_table.scrollTo(index, QTableView.PositionAtCenter)
+
+    def snapshot_pages(self, snapshot_method, db_method, order_by, snapshot_order):
+        """
+        fetch_page for a LazyTableModel: pages in snapshot_order come from the
+        snapshot file while nothing has changed since it was written (the
+        cursors are the same), everything else from the database.
+        """
+        def fetch(db, cursor, limit):
+            if order_by == snapshot_order:
+                with self.snapshot_lock:
+                    snapshot = self.snapshot
+                    if snapshot is not None and snapshot.is_current(db):
+                        return getattr(snapshot, snapshot_method)(cursor, limit)
+            return getattr(db, db_method)(order_by, cursor=cursor, page_size=limit)
+        return fetch
+
+    def refresh_snapshot(self):
+        # fonze: cvlilebebi failshi gadaitaneba (an tavidan iwereba),shemdegi gashveba swrafia
+        if self.snapshot_path is None:
+            return
+        path = self.snapshot_path
+
+        def refresh(db):
+            # Windows-ze mapirebuli faili ver shecvldeba: chveni mapireba jer daixureba,
+            # manamde gverdebi bazidan modis
+            self.release_snapshot()
+            return db.open_snapshot(path)
+
+        self.executor.submit(refresh, key="snapshot", on_result=self.use_snapshot)
+
+    def use_snapshot(self, snapshot):
+        if snapshot is None:
+            return
+        with self.snapshot_lock:
+            old, self.snapshot = self.snapshot, snapshot
+        if old is not None:
+            old.close()
+
+    def release_snapshot(self):
+        """
+        Unmaps the snapshot file; pages come from the database until
+        use_snapshot() is given a new one.
+        """
+        with self.snapshot_lock:
+            snapshot, self.snapshot = self.snapshot, None
+        if snapshot is not None:
+            snapshot.close()
+
+    def closeEvent(self, event):
+        # fonuri motxovnebi dasrulebamde unda daelodos,tore thread-i dakhuruli obieqts mimartavs
+        self.executor.wait()
+        self.release_snapshot()
+        if self.db.profiler is not None:
+            self.write_profile(self.db)
+        super().closeEvent(event)
+
+    def create_button(self, text, color, callback):
+        btn = QPushButton(text)
+        btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {color};
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+                min-width: 100px;
+            }}
+            QPushButton:hover {{
+                background-color: {self.darken_color(color)};
+            }}
+        """)
+        btn.clicked.connect(callback)
+        return btn
+
+    def darken_color(self, hex_color, factor=0.8):
+        rgb = [int(hex_color[i:i+2], 16) for i in (1, 3, 5)]
+        darkened = [max(0, int(c * factor)) for c in rgb]
+        return f'#{darkened[0]:02x}{darkened[1]:02x}{darkened[2]:02x}'
+
+
+def run(argv=None, trace=None):
+    """
+    trace (startup_trace.StartupTrace) gets a mark per start-up phase up
+    to the first paint of the window.
+    """
+    app = QApplication(sys.argv if argv is None else argv)
+    if trace is not None:
+        trace.mark("QApplication")
+    window = StudentManagementApp(trace)
+    window.show()
+    if trace is not None:
+        trace.mark("show")
+        if trace.quit_after:
+            trace.on_finish = app.quit
+    return app.exec_()
@@ -0,0 +1,36 @@
+"""
+Headless access to the student management database.
+
+    from student_db import StudentDatabase
+    db = StudentDatabase("students.db")
+
+Importing this package does not load PyQt5, so batch jobs (imports, reports)
+start without a display and without the Qt import cost.
+"""
+from .connections import ConnectionManager
+from .instrumentation import QueryProfiler
+from .roster import RosterSnapshot
+from .database import (
+    StudentDatabase,
+    EMAIL_PATTERN,
+    STUDENT_IMPORT_FIELDS,
+    ASSIGNED,
+    ALREADY_ASSIGNED,
+    NOT_FOUND,
+    encode_page_cursor,
+    decode_page_cursor,
+)
+
+__all__ = [
+    "StudentDatabase",
+    "ConnectionManager",
+    "QueryProfiler",
+    "RosterSnapshot",
+    "EMAIL_PATTERN",
+    "STUDENT_IMPORT_FIELDS",
+    "ASSIGNED",
+    "ALREADY_ASSIGNED",
+    "NOT_FOUND",
+    "encode_page_cursor",
+    "decode_page_cursor",
+]
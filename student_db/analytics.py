@@ -0,0 +1,216 @@
+"""
+Class ranks, GPA percentiles and honor-roll thresholds within every
+MAJOR/YEAR cohort, computed with NumPy over column arrays.
+
+    columns, ranks = db.rank_students()          # also saved to STUDENT_RANKS
+    cutoffs = analytics.thresholds(columns, 90)  # GPA of the 90th percentile per cohort
+
+The roster is read in one cursor pass straight into typed arrays (STUDENT_ID
+int64, GPA float64, YEAR int64, MAJOR as int32 codes into a list of names),
+so a million students cost tens of megabytes instead of a million tuples.
+columns_from_roster() instead wraps the buffers of a roster.RosterSnapshot
+without copying them, so the snapshot and the analytics share one copy.
+Ranking is one lexsort plus a few cumulative passes over the sorted arrays;
+no Python loop runs per student.
+
+Ranks are "competition" ranks by GPA descending (3.9, 3.9, 3.7 rank 1, 1, 3).
+The percentile is the share of the cohort with a lower GPA, ties counted as
+half, scaled to 0-100 (a cohort of one is 100). Students without a GPA get
+rank 0 and a NaN percentile and do not count towards cohort sizes.
+
+Needs NumPy; importing student_db does not, only this module does.
+"""
+import csv
+
+import numpy as np
+
+from .roster import NO_YEAR
+
+BATCH_SIZE = 65536
+
+
+class RosterColumns:
+    """
+    Column arrays of the live students, in STUDENT_ID order.
+    """
+    def __init__(self, ids, gpa, year, major_codes, majors):
+        self.ids = ids
+        self.gpa = gpa
+        self.year = year
+        self.major_codes = major_codes
+        self.majors = majors
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_columns(conn, batch_size=BATCH_SIZE):
+    cursor = conn.execute(f'''SELECT STUDENT_ID, GPA, IFNULL(YEAR, {NO_YEAR}), IFNULL(MAJOR, '')
+                              FROM STUDENTS WHERE DELETED_AT IS NULL ORDER BY STUDENT_ID''')
+    # yoveli batch-i calke masivebad,bolos erthi concatenate
+    ids, gpa, year, major_codes = [], [], [], []
+    major_index = {}
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        chunk_ids, chunk_gpa, chunk_year, chunk_major = zip(*rows)
+        ids.append(np.array(chunk_ids, dtype=np.int64))
+        # None -> NaN float64-ze gadayvanisas
+        gpa.append(np.array(chunk_gpa, dtype=np.float64))
+        year.append(np.array(chunk_year, dtype=np.int64))
+        major_codes.append(np.array([major_index.setdefault(m, len(major_index)) for m in chunk_major],
+                                    dtype=np.int32))
+    cursor.close()
+
+    def join(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    return RosterColumns(join(ids, np.int64), join(gpa, np.float64), join(year, np.int64),
+                         join(major_codes, np.int32), list(major_index))
+
+
+def columns_from_roster(roster):
+    """
+    RosterColumns viewing the snapshot's buffers (read-only, no copy).
+    """
+    # NULL MAJOR load_columns-shi '' aris, aqac igive saxeli
+    majors = ["" if major is None else major for major in roster.majors]
+    return RosterColumns(np.frombuffer(roster.ids, dtype=np.int64), np.frombuffer(roster.gpa, dtype=np.float64),
+                         np.frombuffer(roster.year, dtype=np.int64),
+                         np.frombuffer(roster.major_codes, dtype=np.int32), majors)
+
+
+def cohort_codes(columns):
+    """
+    Returns (codes, cohorts): a dense int64 cohort number per student and the
+    (major, year) of every number.
+    """
+    years, year_codes = np.unique(columns.year, return_inverse=True)
+    combined = columns.major_codes.astype(np.int64) * len(years) + year_codes
+    keys, codes = np.unique(combined, return_inverse=True)
+    cohorts = [(columns.majors[k // len(years)], _year_label(years[k % len(years)])) for k in keys.tolist()]
+    return codes.reshape(-1), cohorts
+
+
+def _year_label(year):
+    return None if year == NO_YEAR else int(year)
+
+
+def rank_within_groups(values, groups):
+    """
+    Competition rank (descending), group size and mid-rank percentile of
+    every value within its group. NaN values get rank 0, percentile NaN.
+    Returns (rank int64, size int64, percentile float64).
+    """
+    n = len(values)
+    rank = np.zeros(n, dtype=np.int64)
+    size = np.zeros(n, dtype=np.int64)
+    percentile = np.full(n, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return rank, size, percentile
+
+    v, g = values[valid], groups[valid]
+    # pirveli gasaghebi jgufi,shemdeg GPA klebadobit (lexsort bolo gasaghebs iyenebs pirvelad)
+    order = np.lexsort((-v, g))
+    v, g = v[order], g[order]
+    positions = np.arange(len(v))
+
+    new_group = np.ones(len(v), dtype=bool)
+    new_group[1:] = g[1:] != g[:-1]
+    new_value = new_group.copy()
+    new_value[1:] |= v[1:] != v[:-1]
+
+    group_start = np.maximum.accumulate(np.where(new_group, positions, 0))
+    value_start = np.maximum.accumulate(np.where(new_value, positions, 0))
+    group_id = np.cumsum(new_group) - 1
+    value_id = np.cumsum(new_value) - 1
+    sorted_size = np.bincount(group_id)[group_id]
+    ties = np.bincount(value_id)[value_id]
+    sorted_rank = value_start - group_start + 1
+
+    lower = sorted_size - (sorted_rank - 1) - ties
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sorted_percentile = np.where(sorted_size > 1,
+                                     100.0 * (lower + 0.5 * (ties - 1)) / (sorted_size - 1), 100.0)
+
+    target = valid[order]
+    rank[target] = sorted_rank
+    size[target] = sorted_size
+    percentile[target] = sorted_percentile
+    return rank, size, percentile
+
+
+def rank_cohorts(columns):
+    """
+    Dict of arrays aligned with columns: "rank", "size", "percentile", and
+    "cohort" (index into the "cohorts" list of (major, year)).
+    """
+    codes, cohorts = cohort_codes(columns)
+    rank, size, percentile = rank_within_groups(columns.gpa, codes)
+    return {"rank": rank, "size": size, "percentile": percentile, "cohort": codes, "cohorts": cohorts}
+
+
+def thresholds(columns, q, ranks=None):
+    """
+    GPA at percentile q (0-100, linear interpolation as numpy.percentile)
+    of every cohort: {(major, year): gpa}. Cohorts without GPAs are left out.
+    """
+    if ranks is None:
+        codes, cohorts = cohort_codes(columns)
+    else:
+        codes, cohorts = ranks["cohort"], ranks["cohorts"]
+    valid = ~np.isnan(columns.gpa)
+    v, g = columns.gpa[valid], codes[valid]
+    if not len(v):
+        return {}
+    order = np.lexsort((v, g))
+    v, g = v[order], g[order]
+
+    present, starts, counts = np.unique(g, return_index=True, return_counts=True)
+    position = q / 100.0 * (counts - 1)
+    low = np.floor(position).astype(np.int64)
+    high = np.minimum(low + 1, counts - 1)
+    cutoff = v[starts + low] + (v[starts + high] - v[starts + low]) * (position - low)
+    return {cohorts[c]: round(float(x), 4) for c, x in zip(present.tolist(), cutoff.tolist())}
+
+
+def honor_roll(columns, ranks, top_percent=10.0, min_gpa=3.5):
+    """
+    Indices (into columns) of students in the top top_percent of their cohort
+    with at least min_gpa, best first within each cohort.
+    """
+    with np.errstate(invalid="ignore"):
+        chosen = np.flatnonzero((ranks["percentile"] >= 100.0 - top_percent) & (columns.gpa >= min_gpa))
+    order = np.lexsort((ranks["rank"][chosen], ranks["cohort"][chosen]))
+    return chosen[order]
+
+
+def save_ranks(conn, columns, ranks):
+    """
+    Replaces STUDENT_RANKS with the ranks (inside the caller's transaction).
+    """
+    valid = ranks["rank"] > 0
+    conn.execute("DELETE FROM STUDENT_RANKS")
+    conn.executemany('''INSERT INTO STUDENT_RANKS (STUDENT_ID, COHORT_RANK, COHORT_SIZE, PERCENTILE)
+                        VALUES (?,?,?,?)''',
+                     zip(columns.ids[valid].tolist(), ranks["rank"][valid].tolist(),
+                         ranks["size"][valid].tolist(), np.round(ranks["percentile"][valid], 2).tolist()))
+    return int(valid.sum())
+
+
+def write_report(path, columns, ranks, indices):
+    """
+    CSV of the students at indices with their cohort, rank and percentile.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["STUDENT_ID", "MAJOR", "YEAR", "GPA", "COHORT_RANK", "COHORT_SIZE", "PERCENTILE"])
+        cohorts = ranks["cohorts"]
+        for i in indices.tolist():
+            major, year = cohorts[ranks["cohort"][i]]
+            writer.writerow([int(columns.ids[i]), major, "" if year is None else year,
+                             float(columns.gpa[i]), int(ranks["rank"][i]), int(ranks["size"][i]),
+                             round(float(ranks["percentile"][i]), 2)])
+    return len(indices)
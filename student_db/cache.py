@@ -0,0 +1,102 @@
+"""
+Read-through LRU cache for StudentDatabase lookups.
+
+Every entry remembers the generation it was read in. StudentDatabase bumps
+the generation whenever a write transaction ends, so anything read before the
+write is treated as a miss afterwards; there is no per-table bookkeeping to get
+wrong. Only writes made through the same StudentDatabase object are seen:
+another process writing to the same file is not, so long-running readers that
+share a database with other writers should call invalidate() or use
+cache_size=0.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+
+class QueryCache:
+    def __init__(self, max_entries=1024, max_rows=5000):
+        self.max_entries = max_entries
+        # ufro didi shedegebi (mag. 100k gamocda) keshshi ar inaxeba
+        self.max_rows = max_rows
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns (True, value) for a current entry, (False, generation) otherwise;
+        pass that generation to put() so a result read during a write is not kept.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, self.generation
+
+    def put(self, key, value, generation):
+        # None = "ar moidzebna" an shecdoma (get_student_by_id); shecdomas ar vinaxavt
+        if value is None or (isinstance(value, list) and len(value) > self.max_rows):
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            # dzveli chanawerebi mainc aghar gamoiyeneba,mexsierebas vatavisuflebt
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "generation": self.generation,
+            }
+
+
+def cached(method):
+    """
+    Decorator for read-only StudentDatabase methods; calls with unhashable
+    arguments bypass the cache. Cached lists are shared between callers and must not be modified; None
+    results are never cached.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # mag. then_by=[...] siit - keshis gareshe
+            return method(self, *args, **kwargs)
+        found, value = cache.get(key)
+        if found:
+            return value
+        result = method(self, *args, **kwargs)
+        cache.put(key, result, value)
+        return result
+
+    return wrapper
@@ -0,0 +1,219 @@
+"""
+Cohort GPA statistics kept up to date by SQLite triggers.
+
+COHORT_STATS holds count, GPA sum and sum of squares per (MAJOR, YEAR) and
+COHORT_GPA_HISTOGRAM holds how many students fall into each 0.1 wide GPA
+bucket. The triggers run inside the same transaction as the INSERT/UPDATE/
+DELETE on STUDENTS, so add_student, bulk imports and deletes keep them in
+sync and a summary never has to scan STUDENTS.
+"""
+import math
+
+BUCKET_WIDTH = 0.1
+BUCKET_COUNT = 40  # 0.0 - 4.0, GPA 4.0 itself goes into the last bucket
+
+# SQL gamosaxuleba romelic GPA-s bucket-is nomers ucvlis (ROUND floating shecdomebistvis)
+_BUCKET_SQL = "MIN(MAX(CAST(ROUND({gpa} * 10, 6) AS INTEGER), 0), 39)"
+
+
+def _add_sql(row):
+    bucket = _BUCKET_SQL.format(gpa=f"{row}.GPA")
+    return f"""
+        INSERT INTO COHORT_STATS (MAJOR, YEAR, STUDENT_COUNT, GPA_SUM, GPA_SQ_SUM)
+        VALUES (COALESCE({row}.MAJOR, ''), COALESCE({row}.YEAR, 0), 1, {row}.GPA, {row}.GPA * {row}.GPA)
+        ON CONFLICT(MAJOR, YEAR) DO UPDATE SET
+            STUDENT_COUNT = STUDENT_COUNT + 1,
+            GPA_SUM = GPA_SUM + excluded.GPA_SUM,
+            GPA_SQ_SUM = GPA_SQ_SUM + excluded.GPA_SQ_SUM;
+        INSERT INTO COHORT_GPA_HISTOGRAM (MAJOR, YEAR, BUCKET, STUDENT_COUNT)
+        VALUES (COALESCE({row}.MAJOR, ''), COALESCE({row}.YEAR, 0), {bucket}, 1)
+        ON CONFLICT(MAJOR, YEAR, BUCKET) DO UPDATE SET STUDENT_COUNT = STUDENT_COUNT + 1;"""
+
+
+def _remove_sql(row):
+    bucket = _BUCKET_SQL.format(gpa=f"{row}.GPA")
+    return f"""
+        UPDATE COHORT_STATS SET
+            STUDENT_COUNT = STUDENT_COUNT - 1,
+            GPA_SUM = GPA_SUM - {row}.GPA,
+            GPA_SQ_SUM = GPA_SQ_SUM - {row}.GPA * {row}.GPA
+        WHERE MAJOR = COALESCE({row}.MAJOR, '') AND YEAR = COALESCE({row}.YEAR, 0);
+        DELETE FROM COHORT_STATS
+        WHERE MAJOR = COALESCE({row}.MAJOR, '') AND YEAR = COALESCE({row}.YEAR, 0)
+          AND STUDENT_COUNT <= 0;
+        UPDATE COHORT_GPA_HISTOGRAM SET STUDENT_COUNT = STUDENT_COUNT - 1
+        WHERE MAJOR = COALESCE({row}.MAJOR, '') AND YEAR = COALESCE({row}.YEAR, 0)
+          AND BUCKET = {bucket};
+        DELETE FROM COHORT_GPA_HISTOGRAM
+        WHERE MAJOR = COALESCE({row}.MAJOR, '') AND YEAR = COALESCE({row}.YEAR, 0)
+          AND BUCKET = {bucket} AND STUDENT_COUNT <= 0;"""
+
+
+def install(conn):
+    """
+    Creates the aggregate tables and triggers. Called from a schema migration.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS COHORT_STATS(
+                        MAJOR TEXT NOT NULL,
+                        YEAR INT NOT NULL,
+                        STUDENT_COUNT INTEGER NOT NULL,
+                        GPA_SUM REAL NOT NULL,
+                        GPA_SQ_SUM REAL NOT NULL,
+                        PRIMARY KEY(MAJOR, YEAR)
+                    ) WITHOUT ROWID''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS COHORT_GPA_HISTOGRAM(
+                        MAJOR TEXT NOT NULL,
+                        YEAR INT NOT NULL,
+                        BUCKET INTEGER NOT NULL,
+                        STUDENT_COUNT INTEGER NOT NULL,
+                        PRIMARY KEY(MAJOR, YEAR, BUCKET)
+                    ) WITHOUT ROWID''')
+
+    _create_triggers(conn, soft_delete=False)
+
+
+def enable_soft_delete(conn):
+    """
+    Recreates the triggers so tombstoned students (DELETED_AT set) are left
+    out of the aggregates. Called from the migration that adds DELETED_AT.
+    """
+    for name in ("INSERT", "DELETE", "UPDATE_OLD", "UPDATE_NEW"):
+        conn.execute(f"DROP TRIGGER IF EXISTS TRG_COHORT_STATS_{name}")
+    _create_triggers(conn, soft_delete=True)
+    rebuild(conn)
+
+
+def _create_triggers(conn, soft_delete):
+    old_live = " AND OLD.DELETED_AT IS NULL" if soft_delete else ""
+    new_live = " AND NEW.DELETED_AT IS NULL" if soft_delete else ""
+
+    # studentebi GPA-s gareshe statistikashi ar itvleba
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_INSERT
+                     AFTER INSERT ON STUDENTS WHEN NEW.GPA IS NOT NULL{new_live}
+                     BEGIN {_add_sql("NEW")} END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_DELETE
+                     AFTER DELETE ON STUDENTS WHEN OLD.GPA IS NOT NULL{old_live}
+                     BEGIN {_remove_sql("OLD")} END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_UPDATE_OLD
+                     AFTER UPDATE OF GPA, MAJOR, YEAR ON STUDENTS WHEN OLD.GPA IS NOT NULL{old_live}
+                     BEGIN {_remove_sql("OLD")} END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_UPDATE_NEW
+                     AFTER UPDATE OF GPA, MAJOR, YEAR ON STUDENTS WHEN NEW.GPA IS NOT NULL{new_live}
+                     BEGIN {_add_sql("NEW")} END''')
+    if not soft_delete:
+        return
+
+    # washla (tombstone) da aghdgena statistikidan amoighebs/daabrunebs studentsa
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_TOMBSTONE
+                     AFTER UPDATE OF DELETED_AT ON STUDENTS
+                     WHEN OLD.GPA IS NOT NULL AND OLD.DELETED_AT IS NULL AND NEW.DELETED_AT IS NOT NULL
+                     BEGIN {_remove_sql("OLD")} END''')
+    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS TRG_COHORT_STATS_RESTORE
+                     AFTER UPDATE OF DELETED_AT ON STUDENTS
+                     WHEN NEW.GPA IS NOT NULL AND OLD.DELETED_AT IS NOT NULL AND NEW.DELETED_AT IS NULL
+                     BEGIN {_add_sql("NEW")} END''')
+
+
+def rebuild(conn):
+    """
+    Recomputes the aggregates from STUDENTS, e.g. after the first install or
+    to remove floating point drift accumulated by many updates.
+    """
+    # DELETED_AT mere migraciashi chndeba,manamde yvela studenti "cocxalia"
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(STUDENTS)")]
+    live = " AND DELETED_AT IS NULL" if "DELETED_AT" in columns else ""
+
+    conn.execute("DELETE FROM COHORT_STATS")
+    conn.execute("DELETE FROM COHORT_GPA_HISTOGRAM")
+    conn.execute(f'''INSERT INTO COHORT_STATS (MAJOR, YEAR, STUDENT_COUNT, GPA_SUM, GPA_SQ_SUM)
+                    SELECT COALESCE(MAJOR, ''), COALESCE(YEAR, 0), COUNT(*), SUM(GPA), SUM(GPA * GPA)
+                    FROM STUDENTS WHERE GPA IS NOT NULL{live}
+                    GROUP BY 1, 2''')
+    conn.execute(f'''INSERT INTO COHORT_GPA_HISTOGRAM (MAJOR, YEAR, BUCKET, STUDENT_COUNT)
+                     SELECT COALESCE(MAJOR, ''), COALESCE(YEAR, 0), {_BUCKET_SQL.format(gpa="GPA")}, COUNT(*)
+                     FROM STUDENTS WHERE GPA IS NOT NULL{live}
+                     GROUP BY 1, 2, 3''')
+
+
+def _percentile(histogram, total, fraction):
+    """
+    Percentile estimated from bucket counts, interpolated linearly inside the
+    bucket that contains it (accurate to within one bucket width). The n
+    students of a bucket are spread from its lower edge in steps of width/n,
+    so a bucket holding one student reports the lower edge and the estimate
+    never reaches the next bucket.
+    """
+    target = fraction * total
+    seen = 0
+    for bucket in range(BUCKET_COUNT):
+        count = histogram[bucket]
+        if count and seen + count >= target:
+            # target - seen aris (0, count]; pirveli studenti qveda kideze dgas
+            inside = max(target - seen - 1, 0) / count
+            return round((bucket + inside) * BUCKET_WIDTH, 2)
+        seen += count
+    return round(BUCKET_COUNT * BUCKET_WIDTH, 2)
+
+
+def _where(major, year):
+    clauses, params = [], []
+    if major is not None:
+        clauses.append("MAJOR = ?")
+        params.append(major)
+    if year is not None:
+        clauses.append("YEAR = ?")
+        params.append(year)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _summarize(major, year, count, gpa_sum, sq_sum, histogram, percentiles):
+    mean = gpa_sum / count
+    variance = max(sq_sum / count - mean * mean, 0.0)
+    return {
+        "major": major,
+        "year": year,
+        "count": count,
+        "mean": round(mean, 3),
+        "stddev": round(math.sqrt(variance), 3),
+        "median": _percentile(histogram, count, 0.5),
+        "percentiles": {p: _percentile(histogram, count, p) for p in percentiles},
+    }
+
+
+def cohort_summary(conn, major=None, year=None, percentiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+    """
+    Returns a dict with count, mean, stddev, median and the requested
+    percentiles for one cohort. major/year of None mean "all".
+    """
+    where, params = _where(major, year)
+    count, gpa_sum, sq_sum = conn.execute(
+        f"SELECT SUM(STUDENT_COUNT), SUM(GPA_SUM), SUM(GPA_SQ_SUM) FROM COHORT_STATS{where}",
+        params).fetchone()
+    if not count:
+        return {"major": major, "year": year, "count": 0, "mean": None, "stddev": None,
+                "median": None, "percentiles": {}}
+
+    histogram = [0] * BUCKET_COUNT
+    for bucket, bucket_count in conn.execute(
+            f"SELECT BUCKET, SUM(STUDENT_COUNT) FROM COHORT_GPA_HISTOGRAM{where} GROUP BY BUCKET",
+            params):
+        histogram[bucket] = bucket_count
+    return _summarize(major, year, count, gpa_sum, sq_sum, histogram, percentiles)
+
+
+def all_cohort_summaries(conn, percentiles=(0.1, 0.5, 0.9)):
+    """
+    Summaries for every (MAJOR, YEAR) cohort, ordered by major then year.
+    """
+    histograms = {}
+    for major, year, bucket, bucket_count in conn.execute(
+            "SELECT MAJOR, YEAR, BUCKET, STUDENT_COUNT FROM COHORT_GPA_HISTOGRAM"):
+        histograms.setdefault((major, year), [0] * BUCKET_COUNT)[bucket] = bucket_count
+
+    return [
+        _summarize(major, year, count, gpa_sum, sq_sum,
+                   histograms.get((major, year), [0] * BUCKET_COUNT), percentiles)
+        for major, year, count, gpa_sum, sq_sum in conn.execute(
+            '''SELECT MAJOR, YEAR, STUDENT_COUNT, GPA_SUM, GPA_SQ_SUM
+               FROM COHORT_STATS ORDER BY MAJOR, YEAR''')
+    ]
@@ -0,0 +1,154 @@
+"""
+SQLite connection handling for StudentDatabase.
+
+One writer connection, shared by every thread behind a lock, and a pool of
+read connections that threads check out for the duration of a query. The
+database runs in WAL mode so readers (other threads, a reporting script, a
+second copy of the GUI on the same machine) never block the writer or each
+other, and a busy timeout makes competing writers wait instead of failing
+with "database is locked".
+
+WAL needs shared memory between processes, so it only works when every
+process runs on the same host. For a students.db on a network share pass
+journal_mode="DELETE"; the busy timeout and BEGIN IMMEDIATE still apply.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# kompilirebuli statement-ebis keshi tithoeul kavshirze (sqlite3-is default 128);
+# keyset/sortirebis kombinaciebi (ix. queries.py) sruli siit unda chaeteva
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionManager:
+    def __init__(self, db_name, journal_mode="WAL", synchronous="NORMAL",
+                 busy_timeout=10.0, max_readers=8, on_connect=None,
+                 cached_statements=STATEMENT_CACHE_SIZE):
+        self.db_name = db_name
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout = busy_timeout
+        self.max_readers = max_readers
+        self.cached_statements = cached_statements
+        # yovel axal kavshirze gamoidzaxeba (mag. QueryProfiler.attach)
+        self.on_connect = on_connect
+
+        # ":memory:" yovel kavshirze axal bazas qmnis,amitom iq mkitxvelic writer-s iyenebs
+        self.in_memory = db_name == ":memory:" or db_name.startswith("file::memory:")
+
+        self._writer_lock = threading.RLock()
+        self._writer_depth = 0
+        self._writer = self._connect()
+        # axal bazaze moqmedebs (cxrilebamde): purge_deleted faili incremental_vacuum-it patardeba
+        self._writer.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if not self.in_memory:
+            self._writer.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+        self._local = threading.local()
+        self._idle_readers = []
+        self._all_readers = []
+        self._readers_available = threading.Condition()
+
+    def _connect(self):
+        # isolation_level=None: transakciebs chven vmartavt (BEGIN IMMEDIATE writer-shi),
+        # mkitxveli ki autocommit-shia da WAL snapshot-s dro-ze adre atavisuflebs
+        conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """
+        Yields the writer connection inside a transaction that commits on exit
+        and rolls back on an exception. Nested use on the same thread joins the
+        outer transaction.
+        """
+        with self._writer_lock:
+            if self._writer_depth:
+                self._writer_depth += 1
+                try:
+                    yield self._writer
+                finally:
+                    self._writer_depth -= 1
+                return
+
+            self._writer.execute("BEGIN IMMEDIATE")
+            self._writer_depth = 1
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._writer.execute("COMMIT")
+            finally:
+                self._writer_depth = 0
+
+    @contextmanager
+    def reader(self):
+        """
+        Yields a read-only connection checked out of the pool for this thread.
+        Nested use on the same thread reuses the same connection.
+        """
+        if self.in_memory:
+            with self._writer_lock:
+                yield self._writer
+            return
+
+        conn = getattr(self._local, "reader", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._checkout_reader()
+        self._local.reader = conn
+        try:
+            yield conn
+        finally:
+            self._local.reader = None
+            with self._readers_available:
+                self._idle_readers.append(conn)
+                self._readers_available.notify()
+
+    @contextmanager
+    def read_transaction(self):
+        """
+        Like reader(), but every query inside sees the same database state
+        (one WAL snapshot) instead of each statement seeing the latest commit.
+        """
+        with self.reader() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+
+    def _checkout_reader(self):
+        with self._readers_available:
+            while True:
+                if self._idle_readers:
+                    return self._idle_readers.pop()
+                if len(self._all_readers) < self.max_readers:
+                    conn = self._connect()
+                    conn.execute("PRAGMA query_only = ON")
+                    self._all_readers.append(conn)
+                    return conn
+                self._readers_available.wait()
+
+    def close(self):
+        with self._readers_available:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+            self._idle_readers.clear()
+        with self._writer_lock:
+            self._writer.close()
@@ -0,0 +1,1327 @@
+"""
+Data access layer: the SQLite schema, migrations and every query used by the
+GUI and the command line tools. Nothing here imports Qt.
+"""
+import sqlite3
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+from contextlib import contextmanager
+
+from . import cohort_stats, queries, roster, scheduler, snapshots
+from .cache import QueryCache, cached
+from .connections import ConnectionManager
+from .instrumentation import profiled
+from .queries import encode_page_cursor, decode_page_cursor
+
+logger = logging.getLogger(__name__)
+
+# emailis shemowmeba,erthxel kompilirdeba da yvela chanawerze gamoiyeneba
+EMAIL_PATTERN = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+# dziebis teqstidan sityvebis amoghebisas (FTS5 query-shi yvela sityva brchyalebshi svamt)
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+SEARCH_CANDIDATE_LIMIT = 2000
+
+# velebi romlebsac bulk importi elodeba (CSV headeri an JSONL gasaghebebi)
+STUDENT_IMPORT_FIELDS = ("name", "last_name", "gpa", "major", "year", "email")
+
+# keyset paginaciis aghwera tithoeuli siistvis: FROM nawili, SELECT svetebi
+# (isini arian dasashvebi sortirebis gasaghebebi), unikaluri tie-breaker svetebi
+# da WHERE piroba romelic washlil (tombstone) chanawerebs malavs
+STUDENT_PAGE_SPEC = (
+    "STUDENTS",
+    ("STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL"),
+    ("STUDENT_ID",),
+    "DELETED_AT IS NULL",
+)
+EXAM_PAGE_SPEC = (
+    "EXAMS",
+    ("EXAM_ID", "EXAM_NAME", "EXAM_DATE"),
+    ("EXAM_ID",),
+    "DELETED_AT IS NULL",
+)
+# get_all_exams / iter_exams agwerits (DESCRIPTION-it)
+EXAM_LIST_SPEC = (
+    "EXAMS",
+    ("EXAM_ID", "EXAM_NAME", "EXAM_DATE", "DESCRIPTION"),
+    ("EXAM_ID",),
+    "DELETED_AT IS NULL",
+)
+ASSIGNMENT_PAGE_SPEC = (
+    """STUDENT_EXAMS
+       JOIN STUDENTS ON STUDENTS.STUDENT_ID = STUDENT_EXAMS.STUDENT_ID
+       JOIN EXAMS ON EXAMS.EXAM_ID = STUDENT_EXAMS.EXAM_ID""",
+    ("STUDENT_EXAMS.STUDENT_ID", "STUDENTS.NAME", "STUDENT_EXAMS.EXAM_ID", "EXAMS.EXAM_NAME"),
+    ("STUDENT_EXAMS.STUDENT_ID", "STUDENT_EXAMS.EXAM_ID"),
+    "STUDENTS.DELETED_AT IS NULL AND EXAMS.DELETED_AT IS NULL",
+)
+
+# washlili chanawerebi (DELETED_AT) amdeni dghis shemdeg sabolood ishleba (purge_deleted)
+PURGE_AFTER_DAYS = 7
+
+# cvlilebis shetyobinebebi (add_listener): cxrilebi da cvlilebis saxeebi
+CHANGE_TABLES = ("students", "exams", "assignments")
+CHANGE_KINDS = ("inserted", "updated", "deleted")
+
+# assign_student_to_exam-is shedegebi (bazis shecdomaze None)
+ASSIGNED = "assigned"
+ALREADY_ASSIGNED = "already assigned"
+NOT_FOUND = "not found"
+
+# CHANGE_LOG-shi chaweruli cxrilebi da gasaghebi (snapshot failebis ganaxlebistvis)
+CHANGE_LOG_TABLES = (("STUDENTS", "STUDENT_ID"), ("EXAMS", "EXAM_ID"), ("STUDENT_EXAMS", "STUDENT_ID"))
+# amaze meti shecvlili studentis dros snapshot tavidan iqmneba,gadabmis nacvlad
+SNAPSHOT_MERGE_LIMIT = 0.25
+# CHANGE_LOG amaze met chanawers ar inaxavs (ufro dzveli snapshot-i tavidan iqmneba)
+CHANGE_LOG_MAX_ROWS = 500000
+# amdeni axali chanaweris shemdeg writer-i log-s tavad asuftavebs (prune_change_log)
+CHANGE_LOG_PRUNE_STEP = 10000
+
+
+# Klasi bazastvis gankutvnili
+class StudentDatabase:
+    def __init__(self, db_name="students.db", profiler=None, cache_size=1024, **connection_options):
+        # get_student_by_id da msgavsi lookup-ebis LRU keshi; cache_size=0 tishavs
+        self.cache = QueryCache(cache_size) if cache_size else None
+        # profiler = instrumentation.QueryProfiler an None (gatishuli, xarji ar aqvs)
+        self.profiler = profiler
+        if profiler is not None:
+            connection_options.setdefault("on_connect", profiler.attach)
+        # add_listener-it registrirebuli funqciebi,yovel commit-ze idzaxeba
+        self.listeners = []
+        self._write_state = threading.local()
+        # SEQ,romelzec log bolos shemowmda; None migraciebamde (CHANGE_LOG jer ar arsebobs)
+        self._change_log_checked = None
+        # writer + mkitxvelebis pool-i (WAL,busy timeout); ix. connections.py
+        self.connections = ConnectionManager(db_name, **connection_options)
+        self.create_tables()
+        self._change_log_checked = 0
+
+    def close(self):
+        self.connections.close()
+
+    def profile_report(self):
+        """
+        The profiler's report with query plans for every statement seen so far
+        and the cache counters, or None when profiling is off.
+        """
+        if self.profiler is None:
+            return None
+        with self._read() as conn:
+            report = self.profiler.report(conn)
+        report["cache"] = self.cache_stats()
+        return report
+
+    def add_listener(self, listener):
+        """
+        Registers listener(table, change, ids), called after every committed
+        write that changes visible rows. table is one of CHANGE_TABLES, change
+        one of CHANGE_KINDS; ids are STUDENT_ID or EXAM_ID values, or
+        (STUDENT_ID, EXAM_ID) pairs for "assignments". Deleting or restoring a
+        student or exam also reports the assignments it hides or brings back.
+        Listeners run on the thread that made the write and must be quick;
+        a GUI should hand the call over to its own thread.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def _record_change(self, table, change, ids):
+        # shetyobineba commit-mde inaxeba; rollback-ze ar igzavneba
+        changes = getattr(self._write_state, "changes", None)
+        if changes is not None and ids:
+            changes.append((table, change, list(ids)))
+
+    def _notify(self, changes):
+        for table, change, ids in changes:
+            for listener in list(self.listeners):
+                try:
+                    listener(table, change, ids)
+                except Exception:
+                    logger.exception("change listener failed")
+
+    @contextmanager
+    def _write(self):
+        state = self._write_state
+        depth = getattr(state, "depth", 0)
+        if depth == 0:
+            # cvlilebebs mxolod listener-ebis arsebobisas vagrovebt
+            state.changes = [] if self.listeners else None
+        state.depth = depth + 1
+        seq = None
+        try:
+            with self.connections.writer() as conn:
+                yield conn
+                if depth == 0 and self._change_log_checked is not None:
+                    seq = self._change_seq(conn)
+        finally:
+            state.depth = depth
+            # gare transakciis commit-is shemdeg keshi dzveli xdeba
+            if self.cache is not None:
+                self.cache.invalidate()
+        if depth == 0 and state.changes:
+            changes, state.changes = state.changes, None
+            self._notify(changes)
+        # log-s yvela procesi asuftavebs (importi,servisi),ara mxolod snapshot-is shemnaxveli GUI
+        if seq is not None and seq - self._change_log_checked >= CHANGE_LOG_PRUNE_STEP:
+            self._change_log_checked = seq
+            self.prune_change_log()
+
+    def cache_stats(self):
+        """
+        Hit/miss counters of the lookup cache, or None when caching is off.
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def _read(self):
+        return self.connections.reader()
+
+    def create_tables(self):
+        with self._write() as conn:
+            self._create_base_tables(conn)
+        self.migrate()
+
+    def _create_base_tables(self, conn):
+        # studentebis informacia am bazis tableshi mogrovdeba,da am qverit vqmnit
+        conn.execute('''CREATE TABLE IF NOT EXISTS STUDENTS(
+                                STUDENT_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                                NAME TEXT, LAST_NAME TEXT, GPA REAL,
+                                MAJOR TEXT, YEAR INT, EMAIL TEXT, GRADES TEXT)''')
+
+        # gamocdebis shesabamisi veli,table bazashi
+        conn.execute('''CREATE TABLE IF NOT EXISTS EXAMS(
+                                EXAM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                                EXAM_NAME TEXT, EXAM_DATE TEXT, DESCRIPTION TEXT)''')
+
+        # Table studentebis da gamocdebis shesabamisi
+        conn.execute('''CREATE TABLE IF NOT EXISTS STUDENT_EXAMS(
+                                STUDENT_ID INTEGER,
+                                EXAM_ID INTEGER,
+                                FOREIGN KEY(STUDENT_ID) REFERENCES STUDENTS(STUDENT_ID),
+                                FOREIGN KEY(EXAM_ID) REFERENCES EXAMS(EXAM_ID))''')
+
+    def migrate(self):
+        """
+        Brings the schema up to the latest version. The applied version is kept
+        in PRAGMA user_version and every step runs in its own transaction.
+        """
+        for target, step in enumerate(self.MIGRATIONS, start=1):
+            # versia transakciis shignit ikitxeba: ori procesi ertdroulad rom gaixsnas,
+            # meore pirvelis dasrulebas daelodeba da migracias tavidan agar gaushvebs
+            with self._write() as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= target:
+                    continue
+                step(self, conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+
+    def _migrate_assignment_keys_and_indexes(self, conn):
+        # STUDENT_EXAMS tavidan iqmneba primary key-it da cascade washlit,
+        # dublikatebi da oboli chanawerebi ar gadmogvaqvs
+        conn.execute('''CREATE TABLE STUDENT_EXAMS_NEW(
+                                STUDENT_ID INTEGER NOT NULL,
+                                EXAM_ID INTEGER NOT NULL,
+                                PRIMARY KEY(STUDENT_ID, EXAM_ID),
+                                FOREIGN KEY(STUDENT_ID) REFERENCES STUDENTS(STUDENT_ID) ON DELETE CASCADE,
+                                FOREIGN KEY(EXAM_ID) REFERENCES EXAMS(EXAM_ID) ON DELETE CASCADE
+                            ) WITHOUT ROWID''')
+        conn.execute('''INSERT OR IGNORE INTO STUDENT_EXAMS_NEW (STUDENT_ID, EXAM_ID)
+                            SELECT STUDENT_ID, EXAM_ID FROM STUDENT_EXAMS
+                            WHERE STUDENT_ID IN (SELECT STUDENT_ID FROM STUDENTS)
+                              AND EXAM_ID IN (SELECT EXAM_ID FROM EXAMS)''')
+        conn.execute("DROP TABLE STUDENT_EXAMS")
+        conn.execute("ALTER TABLE STUDENT_EXAMS_NEW RENAME TO STUDENT_EXAMS")
+        conn.execute("CREATE INDEX IDX_STUDENT_EXAMS_EXAM ON STUDENT_EXAMS(EXAM_ID)")
+
+        # sortirebis svetebi (STUDENT_SORT_MAP / EXAM_SORT_MAP)
+        for column in ("NAME", "LAST_NAME", "GPA", "YEAR"):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS IDX_STUDENTS_{column} ON STUDENTS({column})")
+        for column in ("EXAM_NAME", "EXAM_DATE"):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS IDX_EXAMS_{column} ON EXAMS({column})")
+
+    def _migrate_grades_table(self, conn):
+        # shefasebebi STUDENTS.GRADES JSON-is nacvlad calke cxrilshi,
+        # SCORE aris 0.0-4.0 skalaze rom GPA = AVG(SCORE) iyos
+        conn.execute('''CREATE TABLE GRADES(
+                                STUDENT_ID INTEGER NOT NULL,
+                                COURSE TEXT NOT NULL,
+                                SCORE REAL NOT NULL,
+                                TERM TEXT NOT NULL DEFAULT '',
+                                PRIMARY KEY(STUDENT_ID, COURSE, TERM),
+                                FOREIGN KEY(STUDENT_ID) REFERENCES STUDENTS(STUDENT_ID) ON DELETE CASCADE
+                            ) WITHOUT ROWID''')
+        conn.execute("CREATE INDEX IDX_GRADES_COURSE ON GRADES(COURSE, TERM)")
+
+        # dzveli JSON: {"kursi": qula} an {"kursi": {"semestri": qula}}
+        migrated = []
+        for student_id, grades_json in conn.execute(
+                "SELECT STUDENT_ID, GRADES FROM STUDENTS WHERE GRADES IS NOT NULL"):
+            try:
+                grades = json.loads(grades_json)
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(grades, dict):
+                continue
+            for course, value in grades.items():
+                per_term = value if isinstance(value, dict) else {"": value}
+                for term, score in per_term.items():
+                    if isinstance(score, (int, float)) and not isinstance(score, bool):
+                        migrated.append((student_id, str(course), float(score), str(term)))
+        conn.executemany('''INSERT OR REPLACE INTO GRADES (STUDENT_ID, COURSE, SCORE, TERM)
+                                VALUES (?,?,?,?)''', migrated)
+        conn.execute("UPDATE STUDENTS SET GRADES = NULL WHERE GRADES IS NOT NULL")
+
+    def _migrate_cohort_stats(self, conn):
+        cohort_stats.install(conn)
+        cohort_stats.rebuild(conn)
+
+    def _migrate_search_index(self, conn):
+        # FTS5 "external content" cxrilebi: teqsti STUDENTS/EXAMS-shi rcheba,
+        # indeksi triggerebit sinqronizdeba. prefix='2 3' prefiqsit dziebas achqarebs
+        conn.execute('''CREATE VIRTUAL TABLE STUDENTS_FTS USING fts5(
+                                NAME, LAST_NAME, MAJOR, EMAIL,
+                                content='STUDENTS', content_rowid='STUDENT_ID',
+                                prefix='2 3', tokenize='unicode61 remove_diacritics 2')''')
+        conn.execute('''CREATE VIRTUAL TABLE EXAMS_FTS USING fts5(
+                                EXAM_NAME, DESCRIPTION,
+                                content='EXAMS', content_rowid='EXAM_ID',
+                                prefix='2 3', tokenize='unicode61 remove_diacritics 2')''')
+
+        for table, fts, key, columns in (
+                ("STUDENTS", "STUDENTS_FTS", "STUDENT_ID", ("NAME", "LAST_NAME", "MAJOR", "EMAIL")),
+                ("EXAMS", "EXAMS_FTS", "EXAM_ID", ("EXAM_NAME", "DESCRIPTION"))):
+            names = ", ".join(columns)
+            new_values = ", ".join(f"NEW.{c}" for c in columns)
+            old_values = ", ".join(f"OLD.{c}" for c in columns)
+            insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (NEW.{key}, {new_values});"
+            delete_old = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+                          f"VALUES ('delete', OLD.{key}, {old_values});")
+            conn.execute(f"CREATE TRIGGER TRG_{fts}_INSERT AFTER INSERT ON {table} "
+                              f"BEGIN {insert_new} END")
+            conn.execute(f"CREATE TRIGGER TRG_{fts}_DELETE AFTER DELETE ON {table} "
+                              f"BEGIN {delete_old} END")
+            conn.execute(f"CREATE TRIGGER TRG_{fts}_UPDATE AFTER UPDATE OF {names} ON {table} "
+                              f"BEGIN {delete_old} {insert_new} END")
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def _migrate_cohort_index(self, conn):
+        # assign_cohort_to_exam fakultetit/welit filtravs
+        conn.execute("CREATE INDEX IF NOT EXISTS IDX_STUDENTS_MAJOR_YEAR ON STUDENTS(MAJOR, YEAR)")
+
+    def _migrate_exam_scheduling(self, conn):
+        # otaxebi,dro-ebi da gamocdebis ganrigi (ix. scheduler.py)
+        conn.execute('''CREATE TABLE ROOMS(
+                                ROOM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                                ROOM_NAME TEXT NOT NULL UNIQUE,
+                                CAPACITY INTEGER NOT NULL CHECK(CAPACITY > 0))''')
+        conn.execute('''CREATE TABLE TIME_SLOTS(
+                                SLOT_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+                                SLOT_DATE TEXT NOT NULL,
+                                START_TIME TEXT NOT NULL,
+                                END_TIME TEXT NOT NULL,
+                                UNIQUE(SLOT_DATE, START_TIME))''')
+        conn.execute('''CREATE TABLE EXAM_SCHEDULE(
+                                EXAM_ID INTEGER PRIMARY KEY,
+                                SLOT_ID INTEGER NOT NULL,
+                                FOREIGN KEY(EXAM_ID) REFERENCES EXAMS(EXAM_ID) ON DELETE CASCADE,
+                                FOREIGN KEY(SLOT_ID) REFERENCES TIME_SLOTS(SLOT_ID) ON DELETE CASCADE)''')
+        conn.execute("CREATE INDEX IDX_EXAM_SCHEDULE_SLOT ON EXAM_SCHEDULE(SLOT_ID)")
+        conn.execute('''CREATE TABLE EXAM_ROOMS(
+                                EXAM_ID INTEGER NOT NULL,
+                                ROOM_ID INTEGER NOT NULL,
+                                SEATS INTEGER NOT NULL,
+                                PRIMARY KEY(EXAM_ID, ROOM_ID),
+                                FOREIGN KEY(EXAM_ID) REFERENCES EXAM_SCHEDULE(EXAM_ID) ON DELETE CASCADE,
+                                FOREIGN KEY(ROOM_ID) REFERENCES ROOMS(ROOM_ID) ON DELETE CASCADE
+                            ) WITHOUT ROWID''')
+        conn.execute("CREATE INDEX IDX_EXAM_ROOMS_ROOM ON EXAM_ROOMS(ROOM_ID)")
+
+    def _migrate_soft_delete(self, conn):
+        # DELETED_AT = washlis dro (tombstone); NULL = cocxali chanaweri
+        conn.execute("ALTER TABLE STUDENTS ADD COLUMN DELETED_AT TEXT")
+        conn.execute("ALTER TABLE EXAMS ADD COLUMN DELETED_AT TEXT")
+
+        # sortirebis indeksebi mxolod cocxal chanawerebs sheicavs (partial index),
+        # amitom tombstone-ebi maT ar zrdis; query-shi "DELETED_AT IS NULL" unda ewere
+        for column in ("NAME", "LAST_NAME", "GPA", "YEAR"):
+            conn.execute(f"DROP INDEX IF EXISTS IDX_STUDENTS_{column}")
+            conn.execute(f"CREATE INDEX IDX_STUDENTS_{column} ON STUDENTS({column}) WHERE DELETED_AT IS NULL")
+        conn.execute("DROP INDEX IF EXISTS IDX_STUDENTS_MAJOR_YEAR")
+        conn.execute("CREATE INDEX IDX_STUDENTS_MAJOR_YEAR ON STUDENTS(MAJOR, YEAR) WHERE DELETED_AT IS NULL")
+        for column in ("EXAM_NAME", "EXAM_DATE"):
+            conn.execute(f"DROP INDEX IF EXISTS IDX_EXAMS_{column}")
+            conn.execute(f"CREATE INDEX IDX_EXAMS_{column} ON EXAMS({column}) WHERE DELETED_AT IS NULL")
+
+        # purge-stvis: mxolod washlilebi
+        conn.execute("CREATE INDEX IDX_STUDENTS_DELETED ON STUDENTS(DELETED_AT) WHERE DELETED_AT IS NOT NULL")
+        conn.execute("CREATE INDEX IDX_EXAMS_DELETED ON EXAMS(DELETED_AT) WHERE DELETED_AT IS NOT NULL")
+        cohort_stats.enable_soft_delete(conn)
+
+    def _migrate_student_ranks(self, conn):
+        # rank_students()-is shedegi (ix. analytics.py); STUDENTS-s ar vcvlit,
+        # rom FTS/cohort triggerebi ar gaeshvas milion rigze
+        conn.execute('''CREATE TABLE STUDENT_RANKS(
+                                STUDENT_ID INTEGER PRIMARY KEY,
+                                COHORT_RANK INTEGER NOT NULL,
+                                COHORT_SIZE INTEGER NOT NULL,
+                                PERCENTILE REAL NOT NULL,
+                                FOREIGN KEY(STUDENT_ID) REFERENCES STUDENTS(STUDENT_ID) ON DELETE CASCADE)''')
+
+    def _migrate_change_log(self, conn):
+        # yoveli shecvlili rigis gasaghebi SEQ rigit (ix. snapshots.py). AUTOINCREMENT ar aris
+        # (yovel rigze sqlite_sequence-s anaxlebda); SEQ rom ar gameordes, prune_change_log
+        # bolo chanawers tovebs
+        conn.execute('''CREATE TABLE CHANGE_LOG(
+                                SEQ INTEGER PRIMARY KEY,
+                                TABLE_NAME TEXT NOT NULL,
+                                ROW_KEY INTEGER NOT NULL)''')
+        for table, key in CHANGE_LOG_TABLES:
+            log = f"INSERT INTO CHANGE_LOG (TABLE_NAME, ROW_KEY) VALUES ('{table}', {{}}.{key});"
+            conn.execute(f"CREATE TRIGGER TRG_CHANGE_LOG_{table}_INSERT AFTER INSERT ON {table} "
+                         f"BEGIN {log.format('NEW')} END")
+            conn.execute(f"CREATE TRIGGER TRG_CHANGE_LOG_{table}_DELETE AFTER DELETE ON {table} "
+                         f"BEGIN {log.format('OLD')} END")
+            conn.execute(f"CREATE TRIGGER TRG_CHANGE_LOG_{table}_UPDATE AFTER UPDATE ON {table} "
+                         f"BEGIN {log.format('OLD')} "
+                         f"INSERT INTO CHANGE_LOG (TABLE_NAME, ROW_KEY) SELECT '{table}', NEW.{key} "
+                         f"WHERE NEW.{key} IS NOT OLD.{key}; END")
+
+    def _migrate_snapshot_consumers(self, conn):
+        # snapshot failebi da SEQ,romlidanac mat CHANGE_LOG jer kidev sachiroebt
+        conn.execute('''CREATE TABLE SNAPSHOT_CONSUMERS(
+                                PATH TEXT PRIMARY KEY,
+                                SEQ INTEGER NOT NULL)''')
+
+    # migraciebi rigze,pirveli elementi = versia 1. arsebuls nu shecvli,axali boloshi daamate
+    MIGRATIONS = (
+        _migrate_assignment_keys_and_indexes,
+        _migrate_grades_table,
+        _migrate_cohort_stats,
+        _migrate_search_index,
+        _migrate_cohort_index,
+        _migrate_exam_scheduling,
+        _migrate_soft_delete,
+        _migrate_student_ranks,
+        _migrate_change_log,
+        _migrate_snapshot_consumers,
+    )
+
+    @profiled
+    def add_student(self, name, last_name, gpa, major, year, email):
+        if not self.validate_email(email):
+            return False
+        
+        try:
+            with self._write() as conn:
+                cursor = conn.execute('''INSERT INTO STUDENTS 
+                                (NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL)
+                                VALUES (?,?,?,?,?,?)''', 
+                                (name, last_name, gpa, major, year, email))
+                self._record_change("students", "inserted", [cursor.lastrowid])
+            return True
+        except sqlite3.Error:
+            logger.exception("add_student failed")
+            return False
+
+    @profiled
+    def bulk_add_students(self, rows, chunk_size=5000):
+        """
+        Streams student rows into STUDENTS, committing once per chunk_size rows.
+        Each row is a mapping with the STUDENT_IMPORT_FIELDS keys (any case) or a
+        sequence in that order. Returns (inserted_count, rejections) where
+        rejections is a list of (row_number, reason) for rows that were skipped.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        inserted = 0
+        rejections = []
+        chunk = []
+        for row_number, row in enumerate(rows, start=1):
+            values, reason = self._prepare_import_row(row)
+            if reason:
+                rejections.append((row_number, reason))
+                continue
+            chunk.append((row_number, values))
+            if len(chunk) >= chunk_size:
+                inserted += self._insert_student_chunk(chunk, rejections)
+                chunk = []
+        if chunk:
+            inserted += self._insert_student_chunk(chunk, rejections)
+        rejections.sort()
+        return inserted, rejections
+
+    def _insert_student_chunk(self, chunk, rejections):
+        query = '''INSERT INTO STUDENTS
+                   (NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL)
+                   VALUES (?,?,?,?,?,?)'''
+        try:
+            with self._write() as conn:
+                conn.executemany(query, [values for _, values in chunk])
+                # AUTOINCREMENT + erthi writer: chunkis id-ebi zedized midis
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                self._record_change("students", "inserted", range(last_id - len(chunk) + 1, last_id + 1))
+            return len(chunk)
+        except sqlite3.Error:
+            logger.warning("chunk insert failed, retrying row by row", exc_info=True)
+
+        # chunki ver chaiwera,amitom titoeuls vcdit rom vipovot romeli rigi aris cudi
+        inserted = []
+        with self._write() as conn:
+            for row_number, values in chunk:
+                try:
+                    inserted.append(conn.execute(query, values).lastrowid)
+                except sqlite3.Error as e:
+                    rejections.append((row_number, f"database error: {e}"))
+            self._record_change("students", "inserted", inserted)
+        return len(inserted)
+
+    @staticmethod
+    def _prepare_import_row(row):
+        """
+        Validates one import row and returns (values_tuple, None) or (None, reason).
+        """
+        if row is None:
+            return None, "unreadable row"
+        if isinstance(row, dict):
+            lowered = {str(k).strip().lower(): v for k, v in row.items()}
+            missing = [f for f in STUDENT_IMPORT_FIELDS if f not in lowered]
+            if missing:
+                return None, "missing field(s): " + ", ".join(missing)
+            raw = [lowered[f] for f in STUDENT_IMPORT_FIELDS]
+        else:
+            raw = list(row)
+            if len(raw) != len(STUDENT_IMPORT_FIELDS):
+                return None, f"expected {len(STUDENT_IMPORT_FIELDS)} columns, got {len(raw)}"
+
+        name, last_name, gpa, major, year, email = (
+            v.strip() if isinstance(v, str) else v for v in raw
+        )
+        if not name or not last_name:
+            return None, "name and last name are required"
+        try:
+            gpa = float(gpa)
+        except (TypeError, ValueError):
+            return None, f"invalid GPA: {gpa!r}"
+        if not 0.0 <= gpa <= 4.0:
+            return None, f"GPA out of range (0.0-4.0): {gpa}"
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return None, f"invalid year: {year!r}"
+        if not isinstance(email, str) or EMAIL_PATTERN.match(email) is None:
+            return None, f"invalid email: {email!r}"
+        return (name, last_name, gpa, major or "", year, email), None
+
+    @profiled
+    def delete_student(self, student_id, soft=True):
+        return self.delete_students([student_id], soft) > 0
+
+    @profiled
+    def delete_students(self, ids, soft=True):
+        """
+        Deletes many students in one transaction and returns how many were
+        deleted. With soft (the default) the rows only get a DELETED_AT
+        tombstone and can be brought back with restore_students until
+        purge_deleted removes them; otherwise they and their exam assignments
+        and grades are removed immediately.
+        """
+        return self._delete_rows("STUDENTS", "STUDENT_ID", ids, soft)
+
+    @profiled
+    def restore_students(self, ids):
+        """
+        Undoes a soft delete; returns how many students were restored.
+        """
+        return self._restore_rows("STUDENTS", "STUDENT_ID", ids)
+
+    def _delete_rows(self, table, key, ids, soft):
+        ids = json.dumps(sorted(set(int(i) for i in ids)))
+        try:
+            with self._write() as conn:
+                # mxolod cocxali chanawerebi,romlebic marthla ishleba
+                deleted = [row[0] for row in conn.execute(
+                    f'''SELECT {key} FROM {table}
+                        WHERE {key} IN (SELECT value FROM json_each(?)) AND DELETED_AT IS NULL''', (ids,))]
+                if soft and not deleted:
+                    return 0
+                deleted_ids = json.dumps(deleted)
+                self._record_assignment_change(conn, table, "deleted", deleted_ids)
+                if soft:
+                    cursor = conn.execute(f'''UPDATE {table} SET DELETED_AT = datetime('now')
+                                              WHERE {key} IN (SELECT value FROM json_each(?))''',
+                                          (deleted_ids,))
+                else:
+                    # sabolood washla tombstone-ebsac shlis
+                    cursor = conn.execute(f"DELETE FROM {table} WHERE {key} IN (SELECT value FROM json_each(?))",
+                                          (ids,))
+                self._record_change(table.lower(), "deleted", deleted)
+            return cursor.rowcount
+        except sqlite3.Error:
+            logger.exception("deleting from %s failed", table)
+            return 0
+
+    def _restore_rows(self, table, key, ids):
+        ids = json.dumps(sorted(set(int(i) for i in ids)))
+        with self._write() as conn:
+            restored = [row[0] for row in conn.execute(
+                f'''SELECT {key} FROM {table}
+                    WHERE {key} IN (SELECT value FROM json_each(?)) AND DELETED_AT IS NOT NULL''', (ids,))]
+            if not restored:
+                return 0
+            restored_ids = json.dumps(restored)
+            conn.execute(f'''UPDATE {table} SET DELETED_AT = NULL
+                             WHERE {key} IN (SELECT value FROM json_each(?))''', (restored_ids,))
+            self._record_change(table.lower(), "inserted", restored)
+            self._record_assignment_change(conn, table, "inserted", restored_ids)
+        return len(restored)
+
+    def _record_assignment_change(self, conn, table, change, ids):
+        """
+        Reports the assignments of the given students or exams (a json id
+        list) whose other side is not deleted, i.e. the rows the assignments
+        view shows or is about to show again.
+        """
+        if getattr(self._write_state, "changes", None) is None:
+            return
+        if table == "STUDENTS":
+            key, other, other_key = "STUDENT_ID", "EXAMS", "EXAM_ID"
+        else:
+            key, other, other_key = "EXAM_ID", "STUDENTS", "STUDENT_ID"
+        pairs = conn.execute(f'''SELECT STUDENT_EXAMS.STUDENT_ID, STUDENT_EXAMS.EXAM_ID
+                                 FROM STUDENT_EXAMS
+                                 JOIN {other} ON {other}.{other_key} = STUDENT_EXAMS.{other_key}
+                                 WHERE STUDENT_EXAMS.{key} IN (SELECT value FROM json_each(?))
+                                   AND {other}.DELETED_AT IS NULL''', (ids,)).fetchall()
+        self._record_change("assignments", change, pairs)
+
+    @profiled
+    def purge_deleted(self, older_than_days=PURGE_AFTER_DAYS, batch_size=1000, vacuum_pages=2000):
+        """
+        Permanently removes students and exams soft-deleted more than
+        older_than_days ago, batch_size rows per transaction so the writer is
+        never held for long, then returns up to vacuum_pages free pages to the
+        file system with PRAGMA incremental_vacuum. Databases created before
+        auto_vacuum was switched on need one full VACUUM for that last step.
+        Returns (students_purged, exams_purged).
+        """
+        cutoff = f"-{float(older_than_days) * 86400} seconds"
+        purged = []
+        for table, key in (("STUDENTS", "STUDENT_ID"), ("EXAMS", "EXAM_ID")):
+            total = 0
+            while True:
+                # cascade: STUDENT_EXAMS, GRADES, EXAM_SCHEDULE aseve ishleba
+                with self._write() as conn:
+                    cursor = conn.execute(f'''DELETE FROM {table} WHERE {key} IN (
+                                                 SELECT {key} FROM {table}
+                                                 WHERE DELETED_AT IS NOT NULL
+                                                   AND DELETED_AT <= datetime('now', ?)
+                                                 LIMIT ?)''', (cutoff, batch_size))
+                total += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    break
+            purged.append(total)
+
+        self.prune_change_log()
+        with self._write() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # 2 = INCREMENTAL
+                conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+        return tuple(purged)
+
+    @profiled
+    def get_all_students(self, order_by="STUDENT_ID", descending=False, then_by=()):
+        """
+        Yvela informacias abrunebs studentze,es modis ra tqma unda bazidan,laqdeba aseve zrdadobit.
+        order_by and then_by are column names, optionally followed by ASC or DESC
+        (see queries.py); STUDENT_ID breaks the remaining ties.
+        """
+        query = queries.select_all(STUDENT_PAGE_SPEC,
+                                   queries.sort_terms(STUDENT_PAGE_SPEC, order_by, descending, then_by))
+        with self._read() as conn:
+            return conn.execute(query).fetchall()
+
+    def iter_students(self, order_by="STUDENT_ID", batch_size=1000, descending=False, then_by=()):
+        """
+        Yields every student row (same columns as get_all_students) straight
+        from the cursor, batch_size rows at a time, so memory stays constant
+        however big the table is. Consume it on the thread that created it.
+        """
+        query = queries.select_all(STUDENT_PAGE_SPEC,
+                                   queries.sort_terms(STUDENT_PAGE_SPEC, order_by, descending, then_by))
+        return self._iter_query(query, batch_size)
+
+    def _iter_query(self, query, batch_size):
+        # kursori bolomde erth read-transakciashia,amitom mteli eqsporti erthi snapshot-ia
+        with self._read() as conn:
+            cursor = conn.execute(query)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def count_rows(self, table):
+        """
+        Row count of "students", "exams" or "assignments" (for progress reporting).
+        """
+        specs = {"students": STUDENT_PAGE_SPEC, "exams": EXAM_PAGE_SPEC, "assignments": ASSIGNMENT_PAGE_SPEC}
+        if table not in specs:
+            raise ValueError(f"unknown table {table!r}")
+        source, _, _, live = specs[table]
+        with self._read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {live}").fetchone()[0]
+
+    @profiled
+    def record_grades(self, grades):
+        """
+        Inserts or updates many grades in one transaction. Each item is
+        (student_id, course, score) or (student_id, course, score, term) with
+        score on the 0.0-4.0 scale.
+        """
+        rows = ((g[0], g[1], g[2], g[3] if len(g) > 3 else "") for g in grades)
+        try:
+            with self._write() as conn:
+                conn.executemany('''INSERT INTO GRADES (STUDENT_ID, COURSE, SCORE, TERM)
+                                        VALUES (?,?,?,?)
+                                        ON CONFLICT(STUDENT_ID, COURSE, TERM)
+                                        DO UPDATE SET SCORE = excluded.SCORE''', rows)
+            return True
+        except sqlite3.Error:
+            logger.exception("record_grades failed")
+            return False
+
+    @profiled
+    def get_grades(self, student_id):
+        """
+        Returns (COURSE, TERM, SCORE) rows for one student.
+        """
+        with self._read() as conn:
+            return conn.execute('''SELECT COURSE, TERM, SCORE FROM GRADES
+                                  WHERE STUDENT_ID = ? ORDER BY TERM, COURSE''',
+                                (student_id,)).fetchall()
+
+    @profiled
+    def compute_gpa(self, student_id):
+        """
+        GPA calculated from GRADES, or None when the student has no grades.
+        """
+        with self._read() as conn:
+            row = conn.execute("SELECT ROUND(AVG(SCORE), 2) FROM GRADES WHERE STUDENT_ID = ?",
+                               (student_id,)).fetchone()
+        return row[0]
+
+    @profiled
+    def recalculate_gpas(self):
+        """
+        Rewrites STUDENTS.GPA from GRADES for every student that has grades,
+        as a single statement. Returns the number of students updated.
+        """
+        with self._write() as conn:
+            cursor = conn.execute('''UPDATE STUDENTS
+                                         SET GPA = (SELECT ROUND(AVG(SCORE), 2) FROM GRADES
+                                                    WHERE GRADES.STUDENT_ID = STUDENTS.STUDENT_ID)
+                                         WHERE STUDENT_ID IN (SELECT STUDENT_ID FROM GRADES)''')
+            if self.listeners:
+                self._record_change("students", "updated", [row[0] for row in conn.execute(
+                    "SELECT DISTINCT STUDENT_ID FROM GRADES")])
+        return cursor.rowcount
+
+    @profiled
+    def roster_snapshot(self):
+        """
+        Read-only columnar snapshot of the live students (see roster.py),
+        or None on a database error.
+        """
+        try:
+            with self._read() as conn:
+                return roster.build(conn)
+        except sqlite3.Error:
+            logger.exception("roster_snapshot failed")
+            return None
+
+    @profiled
+    def change_seq(self):
+        """
+        Sequence number of the last change logged in CHANGE_LOG (0 before any).
+        """
+        with self._read() as conn:
+            return self._change_seq(conn)
+
+    @staticmethod
+    def _change_seq(conn):
+        return conn.execute("SELECT IFNULL(MAX(SEQ), 0) FROM CHANGE_LOG").fetchone()[0]
+
+    def schema_version(self):
+        with self._read() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _changes_since(self, conn, seq, current):
+        """
+        {table: keys} changed after seq up to current, or None when the log
+        no longer reaches back to seq (pruned, or a different database).
+        """
+        if seq > current:
+            return None
+        first = conn.execute("SELECT MIN(SEQ) FROM CHANGE_LOG").fetchone()[0]
+        if seq < current and first > seq + 1:
+            return None
+        changes = {}
+        for table, key in conn.execute("SELECT TABLE_NAME, ROW_KEY FROM CHANGE_LOG WHERE SEQ > ? AND SEQ <= ?",
+                                       (seq, current)):
+            changes.setdefault(table, set()).add(key)
+        return changes
+
+    @profiled
+    def prune_change_log(self, seq=None):
+        """
+        Drops the CHANGE_LOG entries no snapshot file registered by
+        save_snapshot() still needs, and never keeps more than
+        CHANGE_LOG_MAX_ROWS; a file older than that is unregistered and
+        rebuilt in full next time. The last entry always stays, so the
+        sequence keeps counting from it. Writers call this every
+        CHANGE_LOG_PRUNE_STEP entries and purge_deleted() on its own
+        schedule, so the log stays bounded in processes that never save a
+        snapshot. With seq, entries before seq go even if a file still needs
+        them. Returns the number of entries dropped.
+        """
+        with self._write() as conn:
+            current = self._change_seq(conn)
+            needed = conn.execute("SELECT MIN(SEQ) FROM SNAPSHOT_CONSUMERS").fetchone()[0]
+            bound = current if needed is None else min(needed, current)
+            bound = max(bound, current - CHANGE_LOG_MAX_ROWS, min(seq or 0, current))
+            conn.execute("DELETE FROM SNAPSHOT_CONSUMERS WHERE SEQ < ?", (bound,))
+            return conn.execute("DELETE FROM CHANGE_LOG WHERE SEQ < ?", (bound,)).rowcount
+
+    @profiled
+    def save_snapshot(self, path):
+        """
+        Brings the snapshot file at path (see snapshots.py) up to date:
+        nothing to do when it is current, merged from the change log when few
+        rows changed, otherwise written from the tables. The file is registered
+        in SNAPSHOT_CONSUMERS so prune_change_log() keeps the entries it will
+        need next time. Returns the change sequence the file now matches, or
+        None on a database error.
+        """
+        try:
+            old = snapshots.load(path)
+        except (OSError, snapshots.SnapshotError):
+            old = None
+        try:
+            with self.connections.read_transaction() as conn:
+                seq = self._change_seq(conn)
+                schema = conn.execute("PRAGMA user_version").fetchone()[0]
+                if old is not None and old.seq == seq and old.schema == schema:
+                    old.close()
+                    return seq
+                changes = None
+                if old is not None and old.schema == schema:
+                    changes = self._changes_since(conn, old.seq, seq)
+                if changes is not None and len(changes.get("STUDENTS", ())) <= SNAPSHOT_MERGE_LIMIT * len(old.roster):
+                    snapshot = snapshots.merge(conn, old, changes, seq, schema)
+                else:
+                    snapshot = snapshots.dump(conn, seq, schema)
+        except sqlite3.Error:
+            logger.exception("save_snapshot failed")
+            return None
+        finally:
+            # Windows-ze gaxsnili (mmap) faili ver shecvldeba
+            if old is not None:
+                old.close()
+        try:
+            snapshots.save(path, snapshot)
+            with self._write() as conn:
+                conn.execute("INSERT OR REPLACE INTO SNAPSHOT_CONSUMERS (PATH, SEQ) VALUES (?,?)",
+                             (os.path.abspath(path), seq))
+            self.prune_change_log()
+        except (OSError, sqlite3.Error):
+            logger.exception("save_snapshot failed")
+            return None
+        return seq
+
+    def open_snapshot(self, path, refresh=True):
+        """
+        Maps the snapshot file at path, after save_snapshot() with refresh.
+        Returns a snapshots.Snapshot, or None when there is no usable file.
+        """
+        if refresh and self.save_snapshot(path) is None:
+            return None
+        try:
+            return snapshots.load(path)
+        except (OSError, snapshots.SnapshotError):
+            return None
+
+    @profiled
+    def rank_students(self, save=True, snapshot=None):
+        """
+        Ranks every student by GPA within their MAJOR/YEAR cohort with NumPy
+        (see analytics.py) and, with save, replaces STUDENT_RANKS in one
+        transaction. Returns (columns, ranks) for reports and thresholds.
+        With a snapshot from roster_snapshot() the columns are views of its
+        buffers and no query runs for them.
+        """
+        # NumPy mxolod aq chaitvirteba,paketis importi mas ar sachiroebs
+        from . import analytics
+        if snapshot is not None:
+            columns = analytics.columns_from_roster(snapshot)
+        else:
+            with self._read() as conn:
+                columns = analytics.load_columns(conn)
+        ranks = analytics.rank_cohorts(columns)
+        if save:
+            with self._write() as conn:
+                analytics.save_ranks(conn, columns, ranks)
+        return columns, ranks
+
+    @profiled
+    def get_student_rank(self, student_id):
+        """
+        (COHORT_RANK, COHORT_SIZE, PERCENTILE) from the last saved
+        rank_students() run, or None.
+        """
+        with self._read() as conn:
+            return conn.execute('''SELECT COHORT_RANK, COHORT_SIZE, PERCENTILE FROM STUDENT_RANKS
+                                  WHERE STUDENT_ID = ?''', (student_id,)).fetchone()
+
+    @profiled
+    def search(self, text, limit=20):
+        """
+        Full-text prefix search over students (name, last name, major, email)
+        and exams (name, description). Every word in text must match the start
+        of a word in the record. Returns up to limit rows of
+        (KIND, ID, TITLE, DETAIL) with KIND "student" or "exam", best first.
+        Text shorter than two characters returns nothing.
+
+        Recall is traded for latency on common prefixes: when more than
+        SEARCH_CANDIDATE_LIMIT records match, only the first
+        SEARCH_CANDIDATE_LIMIT of them (oldest ids first) are ranked, so a
+        better-ranked match with a higher id can be missing from the results.
+        Type more of the word to narrow the matches. A query that matches
+        fewer records than the limit is ranked in full.
+        """
+        tokens = SEARCH_TOKEN_PATTERN.findall(text)
+        # erti aso prefix-indeksshi ar aris da titqmis mtel cxrils daemtxveva
+        if sum(len(t) for t in tokens) < 2:
+            return []
+        match = " ".join(f'"{t}"*' for t in tokens)
+
+        with self._read() as conn:
+            students = self._search_table(conn, '''
+            SELECT 'student', STUDENTS.STUDENT_ID,
+                   STUDENTS.NAME || ' ' || STUDENTS.LAST_NAME,
+                   STUDENTS.MAJOR || ', ' || STUDENTS.EMAIL,
+                   bm25(STUDENTS_FTS, 10.0, 10.0, 2.0, 5.0) AS SCORE
+            FROM STUDENTS_FTS
+            JOIN STUDENTS ON STUDENTS.STUDENT_ID = STUDENTS_FTS.rowid
+            WHERE STUDENTS_FTS MATCH ? AND STUDENTS_FTS.rowid <= ? AND STUDENTS.DELETED_AT IS NULL
+            ORDER BY SCORE LIMIT ?''', "STUDENTS_FTS", match, limit)
+            exams = self._search_table(conn, '''
+            SELECT 'exam', EXAMS.EXAM_ID, EXAMS.EXAM_NAME,
+                   EXAMS.EXAM_DATE || ', ' || EXAMS.DESCRIPTION,
+                   bm25(EXAMS_FTS, 10.0, 2.0) AS SCORE
+            FROM EXAMS_FTS
+            JOIN EXAMS ON EXAMS.EXAM_ID = EXAMS_FTS.rowid
+            WHERE EXAMS_FTS MATCH ? AND EXAMS_FTS.rowid <= ? AND EXAMS.DELETED_AT IS NULL
+            ORDER BY SCORE LIMIT ?''', "EXAMS_FTS", match, limit)
+
+        results = sorted(students + exams, key=lambda r: r[4])[:limit]
+        return [r[:4] for r in results]
+
+    @staticmethod
+    def _search_table(conn, query, fts_table, match, limit):
+        """
+        Scoring every matching row with bm25 is too slow when a short prefix
+        matches most of the table. Ranking is limited to the first
+        SEARCH_CANDIDATE_LIMIT matches (in rowid order) by bounding the rowid.
+        bm25 still reads the whole match list once to count the documents
+        that contain the prefix, about 16 ms for a prefix found in every one
+        of 1M students, so a larger window costs more time than it saves.
+        """
+        row = conn.execute(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ? "
+                           "LIMIT 1 OFFSET ?", (match, SEARCH_CANDIDATE_LIMIT - 1)).fetchone()
+        rowid_bound = row[0] if row else sys.maxsize
+        return conn.execute(query, (match, rowid_bound, limit)).fetchall()
+
+    @profiled
+    def get_cohort_summary(self, major=None, year=None):
+        """
+        GPA count/mean/stddev/median/percentiles for a MAJOR and/or YEAR (None = all),
+        read from the trigger-maintained aggregate tables.
+        """
+        with self._read() as conn:
+            return cohort_stats.cohort_summary(conn, major, year)
+
+    @profiled
+    def get_cohort_summaries(self):
+        with self._read() as conn:
+            return cohort_stats.all_cohort_summaries(conn)
+
+    @profiled
+    def get_students_page(self, order_by="STUDENT_ID", descending=False, cursor=None, page_size=200):
+        """
+        Returns (rows, next_cursor) for one page of students sorted by order_by.
+        Pass next_cursor back to get the following page; it is None after the
+        last page. Rows are (ID, NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL).
+        """
+        return self._keyset_page(STUDENT_PAGE_SPEC, order_by, descending, cursor, page_size)
+
+    def _keyset_page(self, spec, order_by, descending, cursor, page_size):
+        """
+        Keyset (seek) pagination: instead of OFFSET the query continues after
+        the (sort value, unique id...) of the previous page's last row, so every
+        page costs the same however deep it is.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if order_by not in spec[1]:
+            # keyset-s erthi mimartuleba sachiroebs,"GPA DESC" aq ar gamodgeba (descending gamoiyene)
+            raise ValueError(f"cannot sort by {order_by!r}")
+
+        terms = queries.sort_terms(spec, order_by, descending)
+        key_columns = [column for column, _ in terms]
+        after = None
+        params = []
+        if cursor is not None:
+            # unikaluri svetebi NOT NULL-ia; mxolod sortirebis mnishvneloba sheidzleba iyos NULL
+            values = decode_page_cursor(cursor, not_null=[i for i, column in enumerate(key_columns)
+                                                          if column in spec[2]])
+            if len(values) != len(key_columns):
+                raise ValueError(f"page cursor does not match sort key {order_by!r}")
+            after = "value"
+            if values[0] is None:
+                after = "null"
+                values = values[1:]
+            params.extend(values)
+        params.append(page_size)
+
+        with self._read() as conn:
+            rows = conn.execute(queries.keyset_page(spec, terms, after), params).fetchall()
+            # NULL-ebi ASC-shi pirvelia,DESC-shi bolo: gverdi meore nawilshi grdzeldeba
+            if len(rows) < page_size and after is not None and (after == "null") == (terms[0][1] == "ASC"):
+                rows += conn.execute(queries.keyset_page(spec, terms, "rest"),
+                                     (page_size - len(rows),)).fetchall()
+        if len(rows) < page_size:
+            return rows, None
+        positions = [spec[1].index(c) for c in key_columns]
+        return rows, encode_page_cursor(rows[-1][i] for i in positions)
+
+    @profiled
+    def add_exam(self, exam_name, exam_date, description):
+        try:
+            with self._write() as conn:
+                cursor = conn.execute('''INSERT INTO EXAMS 
+                                (EXAM_NAME, EXAM_DATE, DESCRIPTION)
+                                VALUES (?,?,?)''', 
+                                (exam_name, exam_date, description))
+                self._record_change("exams", "inserted", [cursor.lastrowid])
+            return True
+        except sqlite3.Error:
+            logger.exception("add_exam failed")
+            return False
+
+    @profiled
+    @cached
+    def get_all_exams(self, order_by="EXAM_ID", descending=False, then_by=()):
+        query = queries.select_all(EXAM_LIST_SPEC,
+                                   queries.sort_terms(EXAM_LIST_SPEC, order_by, descending, then_by))
+        with self._read() as conn:
+            return conn.execute(query).fetchall()
+
+    def iter_exams(self, order_by="EXAM_ID", batch_size=1000, descending=False, then_by=()):
+        """
+        Streams (EXAM_ID, EXAM_NAME, EXAM_DATE, DESCRIPTION) rows, see iter_students.
+        """
+        query = queries.select_all(EXAM_LIST_SPEC,
+                                   queries.sort_terms(EXAM_LIST_SPEC, order_by, descending, then_by))
+        return self._iter_query(query, batch_size)
+
+    @profiled
+    def get_exams_page(self, order_by="EXAM_ID", descending=False, cursor=None, page_size=200):
+        """
+        Same as get_students_page for exams; rows are (EXAM_ID, EXAM_NAME, EXAM_DATE).
+        """
+        return self._keyset_page(EXAM_PAGE_SPEC, order_by, descending, cursor, page_size)
+
+    @profiled
+    def delete_exam(self, exam_id, soft=True):
+        return self.delete_exams([exam_id], soft) > 0
+
+    @profiled
+    def delete_exams(self, ids, soft=True):
+        """
+        Same as delete_students for exams.
+        """
+        return self._delete_rows("EXAMS", "EXAM_ID", ids, soft)
+
+    @profiled
+    def restore_exams(self, ids):
+        return self._restore_rows("EXAMS", "EXAM_ID", ids)
+
+    @profiled
+    def assign_student_to_exam(self, student_id, exam_id):
+        """
+        Returns ASSIGNED, ALREADY_ASSIGNED, NOT_FOUND (no such student or
+        exam, or it is deleted) or None on a database error.
+        """
+        try:
+            with self._write() as conn:
+                # washlil studentsa an gamocdaze danishvna ar xdeba
+                cursor = conn.execute('''INSERT OR IGNORE INTO STUDENT_EXAMS (STUDENT_ID, EXAM_ID)
+                                SELECT ?, ?
+                                WHERE EXISTS (SELECT 1 FROM STUDENTS WHERE STUDENT_ID = ? AND DELETED_AT IS NULL)
+                                  AND EXISTS (SELECT 1 FROM EXAMS WHERE EXAM_ID = ? AND DELETED_AT IS NULL)''',
+                                (student_id, exam_id, student_id, exam_id))
+                if cursor.rowcount > 0:
+                    self._record_change("assignments", "inserted", [(student_id, exam_id)])
+                    return ASSIGNED
+                # araferi chaiwera: an ukve danishnulia,an studenti/gamocda ar arsebobs
+                exists = conn.execute('''SELECT 1 FROM STUDENT_EXAMS
+                                        JOIN STUDENTS ON STUDENTS.STUDENT_ID = STUDENT_EXAMS.STUDENT_ID
+                                        JOIN EXAMS ON EXAMS.EXAM_ID = STUDENT_EXAMS.EXAM_ID
+                                        WHERE STUDENT_EXAMS.STUDENT_ID = ? AND STUDENT_EXAMS.EXAM_ID = ?
+                                          AND STUDENTS.DELETED_AT IS NULL AND EXAMS.DELETED_AT IS NULL''',
+                                     (student_id, exam_id)).fetchone()
+                return ALREADY_ASSIGNED if exists else NOT_FOUND
+        except sqlite3.Error:
+            logger.exception("assign_student_to_exam failed")
+            return None
+
+    @profiled
+    def assign_cohort_to_exam(self, exam_id, major=None, year=None, ids=None):
+        """
+        Assigns every student matching major, year and/or the ids list to the
+        exam with one INSERT ... SELECT in a single transaction. Students who
+        are already assigned, and ids that do not exist or do not match major
+        and year, are counted as skipped. Returns (inserted, skipped).
+        """
+        if major is None and year is None and ids is None:
+            raise ValueError("give a major, a year or a list of student ids")
+
+        conditions = ["DELETED_AT IS NULL"]
+        params = []
+        if major is not None:
+            conditions.append("MAJOR = ?")
+            params.append(major)
+        if year is not None:
+            conditions.append("YEAR = ?")
+            params.append(year)
+        if ids is not None:
+            ids = sorted(set(int(i) for i in ids))
+            # json_each: rame raodenobis id erthi parametrit (SQLite-s parametrebis limiti ar gvichirs)
+            conditions.append("STUDENT_ID IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(ids))
+        where = " AND ".join(conditions)
+
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM EXAMS WHERE EXAM_ID = ? AND DELETED_AT IS NULL", (exam_id,)).fetchone() is None:
+                raise ValueError(f"no exam with id {exam_id}")
+            if ids is not None:
+                requested = len(ids)
+            else:
+                requested = conn.execute(f"SELECT COUNT(*) FROM STUDENTS WHERE {where}", params).fetchone()[0]
+            if self.listeners:
+                # axlad danishnulebi = jer ar danishnuli shesabamisi studentebi
+                new_ids = [row[0] for row in conn.execute(
+                    f'''SELECT STUDENT_ID FROM STUDENTS WHERE {where}
+                          AND STUDENT_ID NOT IN (SELECT STUDENT_ID FROM STUDENT_EXAMS WHERE EXAM_ID = ?)''',
+                    params + [exam_id])]
+                self._record_change("assignments", "inserted", [(i, exam_id) for i in new_ids])
+            cursor = conn.execute(f'''INSERT OR IGNORE INTO STUDENT_EXAMS (STUDENT_ID, EXAM_ID)
+                                         SELECT STUDENT_ID, ? FROM STUDENTS WHERE {where}''',
+                                  [exam_id] + params)
+        return cursor.rowcount, requested - cursor.rowcount
+
+    @profiled
+    def get_all_assignments(self, order_by="STUDENT_EXAMS.STUDENT_ID", descending=False, then_by=()):
+        """
+        (STUDENT_ID, STUDENT_NAME, EXAM_ID, EXAM_NAME) rows of students and
+        exams that are not deleted.
+        """
+        query = queries.select_all(ASSIGNMENT_PAGE_SPEC,
+                                   queries.sort_terms(ASSIGNMENT_PAGE_SPEC, order_by, descending, then_by))
+        with self._read() as conn:
+            return conn.execute(query).fetchall()
+
+    def iter_assignments(self, order_by="STUDENT_EXAMS.STUDENT_ID", batch_size=1000, descending=False,
+                         then_by=()):
+        """
+        Streams (STUDENT_ID, STUDENT_NAME, EXAM_ID, EXAM_NAME) rows, see iter_students.
+        """
+        query = queries.select_all(ASSIGNMENT_PAGE_SPEC,
+                                   queries.sort_terms(ASSIGNMENT_PAGE_SPEC, order_by, descending, then_by))
+        return self._iter_query(query, batch_size)
+
+    @profiled
+    def get_assignments_page(self, order_by="STUDENT_EXAMS.STUDENT_ID", descending=False,
+                             cursor=None, page_size=200):
+        """
+        Same as get_students_page for assignments;
+        rows are (STUDENT_ID, STUDENT_NAME, EXAM_ID, EXAM_NAME).
+        """
+        return self._keyset_page(ASSIGNMENT_PAGE_SPEC, order_by, descending, cursor, page_size)
+
+    @profiled
+    def get_students_by_ids(self, ids):
+        """
+        Rows of the given students in get_students_page format, skipping
+        deleted and unknown ids (used to apply change notifications).
+        """
+        return self._rows_by_keys(STUDENT_PAGE_SPEC, [int(i) for i in ids])
+
+    @profiled
+    def get_exams_by_ids(self, ids):
+        return self._rows_by_keys(EXAM_PAGE_SPEC, [int(i) for i in ids])
+
+    @profiled
+    def get_assignments_by_keys(self, pairs):
+        """
+        Rows for (STUDENT_ID, EXAM_ID) pairs in get_assignments_page format.
+        """
+        return self._rows_by_keys(ASSIGNMENT_PAGE_SPEC, [[int(s), int(e)] for s, e in pairs])
+
+    def _rows_by_keys(self, spec, keys):
+        source, columns, unique, live = spec
+        if len(unique) == 1:
+            match = f"{unique[0]} IN (SELECT value FROM json_each(?))"
+        else:
+            # gasaghebi = [STUDENT_ID, EXAM_ID] json masivebi
+            parts = ", ".join(f"json_extract(value, '$[{i}]')" for i in range(len(unique)))
+            match = f"({', '.join(unique)}) IN (SELECT {parts} FROM json_each(?))"
+        query = f"SELECT {', '.join(columns)} FROM {source} WHERE {live} AND {match}"
+        with self._read() as conn:
+            return conn.execute(query, (json.dumps(keys),)).fetchall()
+
+    @profiled
+    @cached
+    def get_exams_for_student(self, student_id):
+        """
+     
+        Abrunebs bazidan da moaqvs monacemebi gamocdebze,student aidi primary keyt
+        """
+        query = """
+            SELECT EXAMS.EXAM_ID, EXAMS.EXAM_NAME, EXAMS.EXAM_DATE, EXAMS.DESCRIPTION
+            FROM STUDENT_EXAMS
+            JOIN STUDENTS ON STUDENT_EXAMS.STUDENT_ID = STUDENTS.STUDENT_ID
+            JOIN EXAMS ON STUDENT_EXAMS.EXAM_ID = EXAMS.EXAM_ID
+            WHERE STUDENT_EXAMS.STUDENT_ID = ? AND STUDENTS.DELETED_AT IS NULL AND EXAMS.DELETED_AT IS NULL
+        """
+        with self._read() as conn:
+            return conn.execute(query, (student_id,)).fetchall()
+
+    @profiled
+    @cached
+    def get_student_by_id(self, student_id):
+        """
+        Returns (NAME, LAST_NAME) for the given student_id, or None if not found.
+        """
+        try:
+            with self._read() as conn:
+                row = conn.execute("SELECT NAME, LAST_NAME FROM STUDENTS WHERE STUDENT_ID=? AND DELETED_AT IS NULL",
+                                   (student_id,)).fetchone()
+            if row:
+                
+                return row
+            return None
+        except sqlite3.Error:
+            logger.exception("get_student_by_id failed")
+            return None
+
+    @profiled
+    def add_room(self, room_name, capacity):
+        try:
+            with self._write() as conn:
+                conn.execute("INSERT INTO ROOMS (ROOM_NAME, CAPACITY) VALUES (?,?)", (room_name, capacity))
+            return True
+        except sqlite3.Error:
+            logger.exception("add_room failed")
+            return False
+
+    @profiled
+    def get_rooms(self):
+        """
+        Returns (ROOM_ID, ROOM_NAME, CAPACITY) rows.
+        """
+        with self._read() as conn:
+            return conn.execute("SELECT ROOM_ID, ROOM_NAME, CAPACITY FROM ROOMS ORDER BY ROOM_NAME").fetchall()
+
+    @profiled
+    def add_time_slot(self, slot_date, start_time, end_time):
+        """
+        Times are "HH:MM"; a slot must end after it starts.
+        """
+        if end_time <= start_time:
+            return False
+
+        try:
+            with self._write() as conn:
+                conn.execute('''INSERT INTO TIME_SLOTS (SLOT_DATE, START_TIME, END_TIME)
+                                VALUES (?,?,?)''', (slot_date, start_time, end_time))
+            return True
+        except sqlite3.Error:
+            logger.exception("add_time_slot failed")
+            return False
+
+    @profiled
+    def get_time_slots(self):
+        """
+        Returns (SLOT_ID, SLOT_DATE, START_TIME, END_TIME) rows in time order.
+        """
+        with self._read() as conn:
+            return conn.execute('''SELECT SLOT_ID, SLOT_DATE, START_TIME, END_TIME FROM TIME_SLOTS
+                                  ORDER BY SLOT_DATE, START_TIME''').fetchall()
+
+    @profiled
+    def schedule_exams(self, save=True):
+        """
+        Computes a conflict-free slot and room for every exam (see scheduler.py)
+        and, with save, replaces the stored schedule with it. Returns
+        (placements, unscheduled): {exam_id: (slot_id, [(room_id, seats)])} and
+        the ids of exams that could not be placed without a clash.
+        """
+        with self._write() as conn:
+            # writer-shi: gamotvlasa da shenaxvas shoris danishvnebi ver sheicvleba
+            placements, unscheduled = scheduler.schedule(conn)
+            if save:
+                scheduler.save(conn, placements)
+        return placements, unscheduled
+
+    @profiled
+    def get_exam_schedule(self):
+        """
+        Returns (EXAM_ID, EXAM_NAME, SLOT_DATE, START_TIME, END_TIME, ROOMS, STUDENTS)
+        rows for scheduled exams; ROOMS is a comma separated list of room names.
+        """
+        with self._read() as conn:
+            return conn.execute('''
+            SELECT EXAMS.EXAM_ID, EXAMS.EXAM_NAME, TIME_SLOTS.SLOT_DATE,
+                   TIME_SLOTS.START_TIME, TIME_SLOTS.END_TIME,
+                   (SELECT GROUP_CONCAT(ROOMS.ROOM_NAME, ', ') FROM EXAM_ROOMS
+                    JOIN ROOMS ON ROOMS.ROOM_ID = EXAM_ROOMS.ROOM_ID
+                    WHERE EXAM_ROOMS.EXAM_ID = EXAMS.EXAM_ID),
+                   (SELECT COUNT(*) FROM STUDENT_EXAMS WHERE STUDENT_EXAMS.EXAM_ID = EXAMS.EXAM_ID)
+            FROM EXAM_SCHEDULE
+            JOIN EXAMS ON EXAMS.EXAM_ID = EXAM_SCHEDULE.EXAM_ID
+            JOIN TIME_SLOTS ON TIME_SLOTS.SLOT_ID = EXAM_SCHEDULE.SLOT_ID
+            WHERE EXAMS.DELETED_AT IS NULL
+            ORDER BY TIME_SLOTS.SLOT_DATE, TIME_SLOTS.START_TIME, EXAMS.EXAM_NAME''').fetchall()
+
+    @profiled
+    def find_schedule_conflicts(self):
+        """
+        Clashes in the stored schedule (assignments made after scheduling can
+        create them); see scheduler.find_conflicts for the row format.
+        """
+        with self._read() as conn:
+            return scheduler.find_conflicts(conn)
+
+    @staticmethod
+    def validate_email(email):
+        return EMAIL_PATTERN.match(email) is not None
@@ -0,0 +1,291 @@
+"""
+Streaming export of students, exams and assignments.
+
+    from student_db import StudentDatabase, export
+    export.export_table(db, "students", "students.csv")
+
+Rows come from the StudentDatabase.iter_* cursors and are written as they
+arrive, so memory use does not grow with the table. Supported formats:
+
+csv      header row plus one line per record
+jsonl    one JSON object per line
+columnar compact binary file (".sdbc"), described below; read it back with
+         read_columnar()
+
+Columnar layout, loosely after Parquet: the file starts with MAGIC, then row
+groups of up to ROW_GROUP_SIZE rows. Every row group stores each column as one
+zlib-compressed chunk: an optional null bitmap followed by int64 or float64
+values, or UTF-8 strings (dictionary encoded when a column repeats a few
+values, as MAJOR and YEAR do). A JSON footer lists the columns and the offset,
+row count and encoding of every chunk; the file ends with the footer length
+and MAGIC again.
+"""
+import csv
+import json
+import os
+import struct
+import zlib
+from array import array
+
+MAGIC = b"SDBCOL1\n"
+ROW_GROUP_SIZE = 16384
+PROGRESS_EVERY = 10000
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+# cxrili -> (StudentDatabase iteratori, svetebis saxelebi failshi)
+EXPORT_TABLES = {
+    "students": ("iter_students", ("STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL")),
+    "exams": ("iter_exams", ("EXAM_ID", "EXAM_NAME", "EXAM_DATE", "DESCRIPTION")),
+    "assignments": ("iter_assignments", ("STUDENT_ID", "STUDENT_NAME", "EXAM_ID", "EXAM_NAME")),
+}
+
+
+class ExportCancelled(Exception):
+    """
+    Raised by export_table when the progress callback returns False.
+    """
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext in (".sdbc", ".columnar"):
+        return "columnar"
+    return "csv"
+
+
+def export_table(db, table, path, fmt=None, progress=None, order_by=None):
+    """
+    Writes every row of table ("students", "exams" or "assignments") to path
+    and returns the number of rows written. progress(done, total) is called
+    every PROGRESS_EVERY rows and at the end; returning False stops the export
+    and raises ExportCancelled. The file is written under a temporary name and
+    only renamed to path when complete.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"unknown table {table!r}")
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}")
+
+    method, columns = EXPORT_TABLES[table]
+    iterate = getattr(db, method)
+    rows = iterate(order_by) if order_by else iterate()
+    total = db.count_rows(table) if progress is not None else None
+
+    writer = {"csv": write_csv, "jsonl": write_jsonl, "columnar": write_columnar}[fmt]
+    tmp_path = path + ".part"
+    try:
+        if fmt == "columnar":
+            f = open(tmp_path, "wb")
+        else:
+            f = open(tmp_path, "w", newline="", encoding="utf-8")
+        with f:
+            written = writer(f, columns, _report_progress(rows, progress, total))
+        os.replace(tmp_path, path)
+    except BaseException:
+        # natsili faili ar unda darches
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+    return written
+
+
+def _report_progress(rows, progress, total):
+    if progress is None:
+        yield from rows
+        return
+    done = 0
+    for row in rows:
+        yield row
+        done += 1
+        if done % PROGRESS_EVERY == 0 and progress(done, total) is False:
+            raise ExportCancelled(f"export cancelled after {done} rows")
+    progress(done, total)
+
+
+def write_csv(f, columns, rows):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(f, columns, rows):
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    for row in rows:
+        f.write(encode(dict(zip(columns, row))) + "\n")
+        count += 1
+    return count
+
+
+def write_columnar(f, columns, rows):
+    f.write(MAGIC)
+    row_groups = []
+    count = 0
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) >= ROW_GROUP_SIZE:
+            row_groups.append(_write_row_group(f, columns, group))
+            count += len(group)
+            group = []
+    if group:
+        row_groups.append(_write_row_group(f, columns, group))
+        count += len(group)
+
+    footer = json.dumps({"version": 1, "columns": list(columns), "rows": count,
+                         "row_groups": row_groups}).encode("utf-8")
+    f.write(footer)
+    f.write(struct.pack("<I", len(footer)))
+    f.write(MAGIC)
+    return count
+
+
+def _write_row_group(f, columns, group):
+    chunks = []
+    for i in range(len(columns)):
+        encoding, payload = _encode_column([row[i] for row in group])
+        data = zlib.compress(payload, 6)
+        chunks.append({"offset": f.tell(), "size": len(data), "encoding": encoding})
+        f.write(data)
+    return {"rows": len(group), "chunks": chunks}
+
+
+def _encode_column(values):
+    """
+    Picks the narrowest encoding for one column chunk. SQLite does not enforce
+    column types, so a chunk with mixed values falls back to text.
+    """
+    nulls = [v is None for v in values]
+    has_nulls = any(nulls)
+    present = [v for v in values if v is not None]
+
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present) \
+            and all(-2**63 <= v < 2**63 for v in present):
+        encoding, body = "int64", array("q", (0 if v is None else v for v in values))
+        body = _little_endian(body)
+    elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        encoding, body = "float64", _little_endian(array("d", (0.0 if v is None else v for v in values)))
+    else:
+        strings = ["" if v is None else str(v) for v in values]
+        distinct = {}
+        for s in strings:
+            distinct.setdefault(s, len(distinct))
+        # gameorebadi mnishvnelobebi (MAJOR, YEAR) leksikonit,danarcheni pirdapir
+        if len(distinct) <= len(strings) // 4 and len(distinct) < 2**32:
+            encoding = "dict"
+            body = (_encode_strings(list(distinct))
+                    + _little_endian(array("I", (distinct[s] for s in strings))))
+        else:
+            encoding, body = "text", _encode_strings(strings)
+
+    if has_nulls:
+        return encoding + "+nulls", _pack_bitmap(nulls) + body
+    return encoding, body
+
+
+def _encode_strings(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    lengths = _little_endian(array("I", (len(b) for b in encoded)))
+    return struct.pack("<I", len(encoded)) + lengths + b"".join(encoded)
+
+
+def _little_endian(arr):
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _pack_bitmap(flags):
+    bitmap = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+
+def read_columnar(path):
+    """
+    Yields the rows of a columnar export as tuples, one row group in memory at a time.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a columnar export")
+        f.seek(-(len(MAGIC) + 4), os.SEEK_END)
+        (footer_size,) = struct.unpack("<I", f.read(4))
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is truncated")
+        f.seek(-(len(MAGIC) + 4 + footer_size), os.SEEK_END)
+        footer = json.loads(f.read(footer_size))
+
+        for group in footer["row_groups"]:
+            columns = []
+            for chunk in group["chunks"]:
+                f.seek(chunk["offset"])
+                payload = zlib.decompress(f.read(chunk["size"]))
+                columns.append(_decode_column(chunk["encoding"], payload, group["rows"]))
+            yield from zip(*columns)
+
+
+def read_columnar_header(path):
+    """
+    Returns the column names of a columnar export.
+    """
+    with open(path, "rb") as f:
+        f.seek(-(len(MAGIC) + 4), os.SEEK_END)
+        (footer_size,) = struct.unpack("<I", f.read(4))
+        f.seek(-(len(MAGIC) + 4 + footer_size), os.SEEK_END)
+        return json.loads(f.read(footer_size))["columns"]
+
+
+def _decode_column(encoding, payload, rows):
+    nulls = None
+    if encoding.endswith("+nulls"):
+        encoding = encoding[:-len("+nulls")]
+        size = (rows + 7) // 8
+        bitmap, payload = payload[:size], payload[size:]
+        nulls = [bool(bitmap[i >> 3] & (1 << (i & 7))) for i in range(rows)]
+
+    if encoding in ("int64", "float64"):
+        values = _from_little_endian("q" if encoding == "int64" else "d", payload)
+    elif encoding == "text":
+        values, _ = _decode_strings(payload)
+    elif encoding == "dict":
+        dictionary, offset = _decode_strings(payload)
+        values = [dictionary[i] for i in _from_little_endian("I", payload[offset:])]
+    else:
+        raise ValueError(f"unknown column encoding {encoding!r}")
+
+    if nulls is not None:
+        values = [None if null else v for v, null in zip(values, nulls)]
+    return values
+
+
+def _decode_strings(payload):
+    (count,) = struct.unpack_from("<I", payload)
+    offset = 4 + 4 * count
+    lengths = _from_little_endian("I", payload[4:offset])
+    strings = []
+    for length in lengths:
+        strings.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def _from_little_endian(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        arr.byteswap()
+    return arr.tolist()
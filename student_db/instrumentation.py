@@ -0,0 +1,247 @@
+"""
+Optional query profiling for StudentDatabase.
+
+    db = StudentDatabase("students.db", profiler=QueryProfiler())
+    ...
+    db.profiler.dump("metrics.json")
+
+The profiler records a latency histogram and returned row counts for every
+profiled StudentDatabase method, sees every SQL statement through the
+connection trace callback (including statements run by triggers), counts
+SQLite VM work through the progress handler, and at report time runs
+EXPLAIN QUERY PLAN once per distinct statement to flag full table scans.
+Without a profiler the only cost is one attribute check per call.
+"""
+import functools
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# histogramis zeda sazghvrebi milisekundebshi
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_PROFILED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+# FTS5-is shida statement-ebi sqemas brchyalebshi weren ('main'.'STUDENTS_FTS_data')
+_INTERNAL_STATEMENT = re.compile(r"""['"]main['"]\.""")
+
+
+def normalize_sql(sql):
+    """
+    Replaces literal values with ? so the same statement with different
+    parameters is counted once.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+_LIMIT_CLAUSE = re.compile(r"\bLIMIT\s+\S+(\s+OFFSET\s+\S+)?\s*$", re.IGNORECASE)
+
+
+def full_scans(sql, plan):
+    """
+    Plan lines that read a whole table. "SCAN STUDENTS" with a trailing LIMIT
+    and no temp b-tree sort walks the table in order and stops early (the
+    first keyset page), so it is not reported.
+    """
+    # "SCAN ... USING INDEX" an virtualuri cxrili (FTS) - ar aris sruli skanireba
+    scans = [detail for detail in plan
+             if detail.startswith("SCAN ") and "USING" not in detail
+             and "VIRTUAL TABLE" not in detail]
+    if scans and _LIMIT_CLAUSE.search(sql) and not any("TEMP B-TREE" in d for d in plan):
+        return []
+    return scans
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.vm_steps = 0
+
+    def add(self, elapsed_ms, rows, vm_steps):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.counts[i] += 1
+                break
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows or 0
+        self.vm_steps += vm_steps
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket containing the percentile (capped at max).
+        """
+        target = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "vm_steps": self.vm_steps,
+            "histogram": {str(b): c for b, c in zip(LATENCY_BUCKETS_MS, self.counts) if c},
+        }
+
+
+class QueryProfiler:
+    def __init__(self, progress_interval=1000):
+        self.progress_interval = progress_interval
+        self.methods = {}
+        self.statements = {}
+        self._plans = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def attach(self, conn):
+        """
+        Installs the trace callback and progress handler on a connection;
+        passed to ConnectionManager as on_connect.
+        """
+        conn.set_trace_callback(self._on_statement)
+        conn.set_progress_handler(self._on_progress, self.progress_interval)
+
+    def _on_statement(self, sql):
+        if sql.startswith("--"):
+            # trigger-is shignit gashvebuli statement-ebi "-- TRIGGER ..." prefiqsit modis
+            sql = sql.split("\n", 1)[-1] if "\n" in sql else sql[2:]
+        stripped = sql.lstrip()
+        if not stripped[:7].upper().startswith(_PROFILED_STATEMENTS):
+            return
+        if _INTERNAL_STATEMENT.search(stripped):
+            return
+        key = normalize_sql(stripped)
+        with self._lock:
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = self.statements[key] = {"count": 0, "example": stripped, "methods": set()}
+            entry["count"] += 1
+            method = getattr(self._local, "method", None)
+            if method:
+                entry["methods"].add(method)
+
+    def _on_progress(self):
+        self._local.vm_steps = getattr(self._local, "vm_steps", 0) + self.progress_interval
+        return 0  # 0 = ar gaauqmo
+
+    def record(self, method, elapsed_ms, rows, vm_steps):
+        with self._lock:
+            histogram = self.methods.get(method)
+            if histogram is None:
+                histogram = self.methods[method] = LatencyHistogram()
+            histogram.add(elapsed_ms, rows, vm_steps)
+
+    def explain(self, conn):
+        """
+        Runs EXPLAIN QUERY PLAN for every statement not explained yet and logs
+        a warning for each new full table scan.
+        """
+        with self._lock:
+            pending = [(k, e["example"]) for k, e in self.statements.items() if k not in self._plans]
+        for key, example in pending:
+            try:
+                plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + example)]
+            except Exception as e:
+                plan = [f"(plan unavailable: {e})"]
+            scans = full_scans(key, plan)
+            if scans:
+                logger.warning("full table scan: %s -- %s", "; ".join(scans), key)
+            with self._lock:
+                self._plans[key] = (plan, scans)
+
+    def report(self, conn=None):
+        """
+        Dict with per-method latency stats and per-statement counts, plans and
+        full-scan flags. Pass a connection to explain statements seen so far.
+        """
+        if conn is not None:
+            self.explain(conn)
+        with self._lock:
+            methods = {name: h.as_dict() for name, h in sorted(self.methods.items())}
+            statements = []
+            for key, entry in self.statements.items():
+                plan, scans = self._plans.get(key, ([], []))
+                statements.append({
+                    "sql": key,
+                    "count": entry["count"],
+                    "methods": sorted(entry["methods"]),
+                    "plan": plan,
+                    "full_scans": scans,
+                })
+        statements.sort(key=lambda s: s["count"], reverse=True)
+        return {"methods": methods, "statements": statements}
+
+    def dump(self, path, conn=None):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(conn), f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self.methods.clear()
+            self.statements.clear()
+            self._plans.clear()
+
+
+def _row_count(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])  # (rows, next_cursor)
+    if (isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], list)
+            and isinstance(result[0], int) and not isinstance(result[0], bool)):
+        return result[0]  # (inserted, rejections)
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    return 0
+
+
+def profiled(method):
+    """
+    Decorator for StudentDatabase methods: records latency, rows and VM steps
+    in self.profiler when one is set.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+
+        local = profiler._local
+        outer_method = getattr(local, "method", None)
+        outer_steps = getattr(local, "vm_steps", 0)
+        local.method, local.vm_steps = name, 0
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            vm_steps = local.vm_steps
+            local.method, local.vm_steps = outer_method, outer_steps + vm_steps
+        profiler.record(name, elapsed_ms, _row_count(result), vm_steps)
+        return result
+
+    return wrapper
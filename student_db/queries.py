@@ -0,0 +1,143 @@
+"""
+Whitelisted ORDER BY for the list, page and export queries.
+
+Sort columns and directions come from callers (the GUI sort combos,
+export_data --order-by, scripts) and cannot be bound as parameters, so they
+are checked against the columns the query selects and only then written into
+the SQL. Every (spec, sort) combination produces the same statement text, built
+once and memoized, so sqlite3's per-connection statement cache (see
+STATEMENT_CACHE_SIZE in connections.py) reuses the compiled statement instead
+of preparing it again on every call. The spec's unique columns are always
+appended as the last sort keys, which makes the order stable between calls
+and between pages.
+
+A spec is (source, columns, unique, live_filter) as in database.py. The
+opaque keyset page cursors (encode_page_cursor) are built here as well, so
+snapshot files (snapshots.py) can hand out the same cursors as the database.
+"""
+import base64
+import functools
+import json
+
+DIRECTIONS = ("ASC", "DESC")
+
+
+def parse_sort_term(term, columns, descending=False):
+    """
+    Returns (column, "ASC"/"DESC") for "COLUMN", "COLUMN ASC" or "COLUMN DESC",
+    raising ValueError when the column is not one of columns.
+    """
+    parts = str(term).split()
+    direction = "DESC" if descending else "ASC"
+    if len(parts) == 2 and parts[1].upper() in DIRECTIONS:
+        direction = parts[1].upper()
+        parts = parts[:1]
+    if len(parts) != 1 or parts[0] not in columns:
+        raise ValueError(f"cannot sort by {term!r}")
+    return parts[0], direction
+
+
+def sort_terms(spec, order_by, descending=False, then_by=()):
+    """
+    The full, validated sort key: order_by, then the then_by terms, then the
+    unique columns not used yet (in order_by's direction), as a tuple of
+    (column, direction) pairs.
+    """
+    _, columns, unique, _ = spec
+    first = parse_sort_term(order_by, columns, descending)
+    terms = [first]
+    for term in then_by:
+        column, direction = parse_sort_term(term, columns)
+        # unikaluri gasaghebis shemdeg sxva sveti rigs aghar cvlis
+        if set(unique) <= {c for c, _ in terms}:
+            break
+        if column not in (c for c, _ in terms):
+            terms.append((column, direction))
+    for column in unique:
+        if column not in (c for c, _ in terms):
+            terms.append((column, first[1]))
+    return tuple(terms)
+
+
+def order_clause(terms):
+    return "ORDER BY " + ", ".join(f"{column} {direction}" for column, direction in terms)
+
+
+@functools.lru_cache(maxsize=512)
+def select_all(spec, terms):
+    """
+    SELECT of every live row of spec in the order of terms (from sort_terms).
+    """
+    source, columns, _, live = spec
+    return f"SELECT {', '.join(columns)} FROM {source} WHERE {live} {order_clause(terms)}"
+
+
+@functools.lru_cache(maxsize=512)
+def keyset_page(spec, terms, after=None):
+    """
+    One keyset page of spec. after says where the page starts:
+
+        None     the first page
+        "value"  after the key values of the previous page's last row
+        "null"   the same, when that row's sort value (the first term) is NULL;
+                 its first key value is not bound
+        "rest"   the start of the other part of the order: the non-NULL sort
+                 values after the NULLs (ASC), or the NULLs after the values (DESC)
+
+    The key values are bound as the first parameters and the page size is
+    always the last one. Every term must have the same direction, since the
+    continuation is a single row-value comparison, and only the first term
+    may be NULL (the unique columns are NOT NULL). NULLs sort first in ASC
+    and last in DESC, as SQLite sorts them anyway; a row-value comparison
+    with a NULL is never true, so the NULL part is read with its own
+    predicate instead of one OR that would cost the index seek.
+    """
+    source, columns, _, live = spec
+    key_columns = [column for column, _ in terms]
+    first, direction = terms[0]
+    operator = "<" if direction == "DESC" else ">"
+    query = f"SELECT {', '.join(columns)} FROM {source} WHERE {live}"
+    if after == "value":
+        query += f" AND ({', '.join(key_columns)}) {operator} ({', '.join('?' * len(key_columns))})"
+    elif after == "null":
+        rest = key_columns[1:]
+        query += f" AND {first} IS NULL AND ({', '.join(rest)}) {operator} ({', '.join('?' * len(rest))})"
+    elif after == "rest":
+        query += f" AND {first} IS {'NOT ' if direction == 'ASC' else ''}NULL"
+    nulls = "NULLS FIRST" if direction == "ASC" else "NULLS LAST"
+    order = ", ".join(f"{column} {d}" + (f" {nulls}" if i == 0 else "") for i, (column, d) in enumerate(terms))
+    return f"{query} ORDER BY {order} LIMIT ?"
+
+
+def encode_page_cursor(values):
+    """
+    Packs the sort key values of the last row of a page into an opaque string.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_page_cursor(cursor, length=None, not_null=()):
+    """
+    The key values packed by encode_page_cursor. Cursors come back from
+    clients, so anything else raises ValueError: a value that is not an
+    int (64-bit), float, str or None, a list of another length than length,
+    or None at one of the not_null positions (the unique columns).
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(str(cursor).encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"invalid page cursor: {cursor!r}") from e
+    if not isinstance(values, list) or (length is not None and len(values) != length):
+        raise ValueError(f"invalid page cursor: {cursor!r}")
+    for i, value in enumerate(values):
+        if value is None:
+            valid = i not in not_null
+        elif isinstance(value, int):
+            # sqlite3 64-bit-ze did ricxvs ver abavs (OverflowError)
+            valid = -2**63 <= value < 2**63
+        else:
+            valid = isinstance(value, (float, str))
+        if not valid:
+            raise ValueError(f"invalid page cursor: {cursor!r}")
+    return values
@@ -0,0 +1,213 @@
+"""
+Compact read-only snapshot of the live students.
+
+    roster = db.roster_snapshot()
+    roster.get(1042)           # (STUDENT_ID, NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL) or None
+    roster[0:50]               # rows by position (STUDENT_ID order)
+    columns = analytics.columns_from_roster(roster)   # NumPy views, no copy
+
+A list of row tuples costs a Python object per value, several hundred bytes a
+student. Here every column is one typed buffer: STUDENT_ID, GPA and YEAR are
+int64/float64/int64, NAME, LAST_NAME and MAJOR are int32 codes into tables of
+distinct strings (each string stored once), and EMAIL, which is unique, is one
+UTF-8 blob with an offset per student. Rows are rebuilt only when asked for.
+A NULL GPA is NaN, a NULL YEAR is NO_YEAR and a NULL EMAIL is marked in a
+one-byte-per-student mask.
+
+Lookup by STUDENT_ID is a single index into a position table when the ids are
+dense (AUTOINCREMENT ids with few gaps); for sparse ids it falls back to a
+binary search over the sorted ids.
+
+The columns are plain buffers (memoryview), so NumPy and other readers can use
+the same memory, and a snapshot can also sit on top of a memory-mapped file.
+"""
+import math
+from array import array
+from bisect import bisect_left
+
+NO_YEAR = -1
+# id-ebis diapazoni amaze metjer tu aghemateba studentebis raodenobas,pozitsiebis cxrili ar igeba
+DENSE_INDEX_FACTOR = 4
+BATCH_SIZE = 65536
+
+COLUMNS = ("STUDENT_ID", "NAME", "LAST_NAME", "GPA", "MAJOR", "YEAR", "EMAIL")
+
+
+class RosterSnapshot:
+    """
+    ids, gpa, year, name_codes, last_name_codes, major_codes and email_offsets
+    are buffers of int64 / float64 / int64 / int32 / int32 / int32 / int64;
+    names, last_names and majors are the string tables the codes point into;
+    emails is the UTF-8 blob and email_nulls has a 1 for every NULL EMAIL.
+    positions (int32, -1 = no student) maps STUDENT_ID - first id to a row,
+    or is None for sparse ids.
+    """
+    def __init__(self, ids, gpa, year, name_codes, last_name_codes, major_codes,
+                 names, last_names, majors, emails, email_offsets, email_nulls, positions=None):
+        self.ids = _typed(ids, "q")
+        self.gpa = _typed(gpa, "d")
+        self.year = _typed(year, "q")
+        self.name_codes = _typed(name_codes, "i")
+        self.last_name_codes = _typed(last_name_codes, "i")
+        self.major_codes = _typed(major_codes, "i")
+        self.names = names
+        self.last_names = last_names
+        self.majors = majors
+        self.emails = memoryview(emails)
+        self.email_offsets = _typed(email_offsets, "q")
+        self.email_nulls = _typed(email_nulls, "B")
+        self.positions = _typed(positions, "i") if positions is not None else None
+        self.first_id = self.ids[0] if len(self.ids) else 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("roster index out of range")
+        return self.row(index)
+
+    def row(self, i):
+        gpa = self.gpa[i]
+        year = self.year[i]
+        email = None
+        if not self.email_nulls[i]:
+            email = str(self.emails[self.email_offsets[i]:self.email_offsets[i + 1]], "utf-8")
+        return (self.ids[i], self.names[self.name_codes[i]], self.last_names[self.last_name_codes[i]],
+                None if math.isnan(gpa) else gpa, self.majors[self.major_codes[i]],
+                None if year == NO_YEAR else year, email)
+
+    def position(self, student_id):
+        """
+        Row position of student_id, or -1.
+        """
+        if self.positions is not None:
+            offset = student_id - self.first_id
+            if 0 <= offset < len(self.positions):
+                return self.positions[offset]
+            return -1
+        i = bisect_left(self.ids, student_id)
+        return i if i < len(self.ids) and self.ids[i] == student_id else -1
+
+    def get(self, student_id):
+        i = self.position(student_id)
+        return self.row(i) if i >= 0 else None
+
+    def __contains__(self, student_id):
+        return self.position(student_id) >= 0
+
+    def nbytes(self):
+        """
+        Bytes held by the column buffers (string tables not counted).
+        """
+        buffers = [self.ids, self.gpa, self.year, self.name_codes, self.last_name_codes,
+                   self.major_codes, self.emails, self.email_offsets, self.email_nulls]
+        if self.positions is not None:
+            buffers.append(self.positions)
+        return sum(b.nbytes for b in buffers)
+
+
+def raw_bytes(buffer):
+    """
+    buffer as unsigned bytes (array.frombytes takes no typed memoryview).
+    """
+    return memoryview(buffer).cast("B")
+
+
+def _typed(buffer, fmt):
+    view = memoryview(buffer)
+    if view.format != fmt:
+        view = view.cast("B").cast(fmt)
+    return view
+
+
+def build(conn, batch_size=BATCH_SIZE):
+    """
+    Reads the live students in STUDENT_ID order in one cursor pass.
+    """
+    builder = RosterBuilder()
+    cursor = conn.execute('''SELECT STUDENT_ID, NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL
+                             FROM STUDENTS WHERE DELETED_AT IS NULL ORDER BY STUDENT_ID''')
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            builder.append(row)
+    cursor.close()
+    return builder.finish()
+
+
+class RosterBuilder:
+    """
+    Builds a RosterSnapshot from rows appended in STUDENT_ID order. With base,
+    the string tables of that snapshot are kept (so its codes stay valid) and
+    copy() can take over whole ranges of its rows buffer by buffer.
+    """
+    def __init__(self, base=None):
+        self.ids, self.gpa, self.year = array("q"), array("d"), array("q")
+        self.name_codes, self.last_name_codes, self.major_codes = array("i"), array("i"), array("i")
+        self.emails = bytearray()
+        self.email_offsets = array("q", [0])
+        self.email_nulls = bytearray()
+        tables = (base.names, base.last_names, base.majors) if base is not None else ((), (), ())
+        self.name_index, self.last_name_index, self.major_index = (
+            {value: code for code, value in enumerate(table)} for table in tables)
+
+    def append(self, row):
+        """
+        row is (STUDENT_ID, NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL); GPA and
+        YEAR may be None.
+        """
+        student_id, name, last_name, gpa, major, year, email = row
+        self.ids.append(student_id)
+        self.gpa.append(math.nan if gpa is None else float(gpa))
+        self.year.append(NO_YEAR if year is None else int(year))
+        self.name_codes.append(self.name_index.setdefault(name, len(self.name_index)))
+        self.last_name_codes.append(self.last_name_index.setdefault(last_name, len(self.last_name_index)))
+        self.major_codes.append(self.major_index.setdefault(major, len(self.major_index)))
+        if email is not None:
+            self.emails += email.encode("utf-8")
+        self.email_nulls.append(email is None)
+        self.email_offsets.append(len(self.emails))
+
+    def copy(self, base, start, stop):
+        """
+        Appends rows start..stop-1 of base (the snapshot given to __init__).
+        """
+        if stop <= start:
+            return
+        for name in ("ids", "gpa", "year", "name_codes", "last_name_codes", "major_codes"):
+            getattr(self, name).frombytes(raw_bytes(getattr(base, name)[start:stop]))
+        self.email_nulls += base.email_nulls[start:stop]
+        first, last = base.email_offsets[start], base.email_offsets[stop]
+        # ofsetebi axal blob-shi gadaadgildeba
+        shift = len(self.emails) - first
+        self.emails += base.emails[first:last]
+        self.email_offsets.extend(offset + shift for offset in base.email_offsets[start + 1:stop + 1])
+
+    def finish(self):
+        return RosterSnapshot(self.ids, self.gpa, self.year, self.name_codes, self.last_name_codes,
+                              self.major_codes, list(self.name_index), list(self.last_name_index),
+                              list(self.major_index), bytes(self.emails), self.email_offsets,
+                              bytes(self.email_nulls), build_positions(self.ids))
+
+
+def build_positions(ids):
+    """
+    STUDENT_ID -> row table for sorted ids, or None when they are too sparse.
+    """
+    if not len(ids):
+        return None
+    span = ids[-1] - ids[0] + 1
+    if span > DENSE_INDEX_FACTOR * len(ids) or span >= 2**31:
+        return None
+    positions = array("i", [-1]) * span
+    first = ids[0]
+    for row, student_id in enumerate(ids):
+        positions[student_id - first] = row
+    return positions
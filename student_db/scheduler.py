@@ -0,0 +1,209 @@
+"""
+Exam timetabling: puts every exam into a time slot and rooms so that no
+student sits two exams at once and no room holds two exams in one slot.
+
+Exams are the vertices of a conflict graph with an edge between two exams
+that share at least one student (built from STUDENT_EXAMS in one grouped
+self-join). Slots are colours, coloured with the DSatur heuristic: the next
+exam is always the one whose neighbours already use the most distinct slots,
+ties going to the exam with the most conflicts and then the most students.
+An exam goes into the earliest slot that none of its neighbours use and
+whose remaining rooms can seat it, possibly across several rooms. Exams that
+fit nowhere are returned as unscheduled rather than placed with a clash.
+
+An exam whose EXAM_DATE matches the date of at least one slot is kept to the
+slots of that day.
+
+Slots on the same date whose times overlap (09:00-12:00 and 10:00-11:00)
+count as one time for students and rooms: an exam cannot go into a slot that
+overlaps a neighbour's slot, and a room taken in one slot is taken in every
+slot overlapping it. Times are zero-padded "HH:MM" strings, so they compare
+as text.
+"""
+from collections import defaultdict
+
+# TA da TB slot-ebi erthi dghisaa da drois intervalebi ikveteba
+SLOTS_OVERLAP = '''TB.SLOT_DATE = TA.SLOT_DATE
+                    AND (TB.SLOT_ID = TA.SLOT_ID
+                         OR (TB.START_TIME < TA.END_TIME AND TA.START_TIME < TB.END_TIME))'''
+
+
+def conflict_graph(conn):
+    """
+    Returns {exam_id: {other_exam_id: shared_students}} for every exam that
+    shares a student with another exam.
+    """
+    graph = defaultdict(dict)
+    for exam_a, exam_b, shared in conn.execute(
+            '''SELECT A.EXAM_ID, B.EXAM_ID, COUNT(*)
+               FROM STUDENT_EXAMS A
+               JOIN STUDENT_EXAMS B ON B.STUDENT_ID = A.STUDENT_ID AND B.EXAM_ID > A.EXAM_ID
+               JOIN STUDENTS ON STUDENTS.STUDENT_ID = A.STUDENT_ID
+               WHERE STUDENTS.DELETED_AT IS NULL
+               GROUP BY A.EXAM_ID, B.EXAM_ID'''):
+        graph[exam_a][exam_b] = shared
+        graph[exam_b][exam_a] = shared
+    return graph
+
+
+def enrollments(conn):
+    """
+    Returns {exam_id: student_count} for every exam that is not deleted,
+    including empty ones.
+    """
+    return dict(conn.execute(
+        '''SELECT EXAMS.EXAM_ID, COUNT(STUDENTS.STUDENT_ID)
+           FROM EXAMS
+           LEFT JOIN STUDENT_EXAMS ON STUDENT_EXAMS.EXAM_ID = EXAMS.EXAM_ID
+           LEFT JOIN STUDENTS ON STUDENTS.STUDENT_ID = STUDENT_EXAMS.STUDENT_ID
+                             AND STUDENTS.DELETED_AT IS NULL
+           WHERE EXAMS.DELETED_AT IS NULL
+           GROUP BY EXAMS.EXAM_ID'''))
+
+
+def allocate_rooms(size, free_rooms):
+    """
+    Picks rooms from free_rooms ({room_id: capacity}) to seat size students:
+    the smallest single room that fits, otherwise the largest rooms first.
+    Returns [(room_id, seats), ...] or None when the rooms are too small.
+    """
+    if not free_rooms:
+        return None
+    size = max(size, 1)  # studentebis gareshe gamocdasac erthi otaxi sachiroa
+    fitting = [(capacity, room_id) for room_id, capacity in free_rooms.items() if capacity >= size]
+    if fitting:
+        capacity, room_id = min(fitting)
+        return [(room_id, size)]
+    if sum(free_rooms.values()) < size:
+        return None
+    allocation = []
+    remaining = size
+    for room_id, capacity in sorted(free_rooms.items(), key=lambda r: (-r[1], r[0])):
+        seats = min(capacity, remaining)
+        allocation.append((room_id, seats))
+        remaining -= seats
+        if not remaining:
+            break
+    return allocation
+
+
+def overlapping_slots(slots):
+    """
+    Returns {slot_id: {slot_ids overlapping it, itself included}} for slots
+    [(slot_id, slot_date, start_time, end_time)].
+    """
+    by_date = defaultdict(list)
+    for slot in slots:
+        by_date[slot[1]].append(slot)
+    overlaps = {}
+    for day in by_date.values():
+        for slot_id, _, start, end in day:
+            overlaps[slot_id] = {other_id for other_id, _, other_start, other_end in day
+                                 if other_id == slot_id or (other_start < end and start < other_end)}
+    return overlaps
+
+
+def build_schedule(sizes, graph, slots, rooms, exam_dates=None):
+    """
+    sizes: {exam_id: students}, graph: from conflict_graph(), slots: ordered
+    [(slot_id, slot_date, start_time, end_time)], rooms: {room_id: capacity},
+    exam_dates: {exam_id: EXAM_DATE}. Returns (placements, unscheduled) where
+    placements is {exam_id: (slot_id, [(room_id, seats), ...])}.
+    """
+    exam_dates = exam_dates or {}
+    slot_ids = [slot[0] for slot in slots]
+    slots_by_date = defaultdict(list)
+    for slot_id, slot_date, _, _ in slots:
+        slots_by_date[slot_date].append(slot_id)
+    overlaps = overlapping_slots(slots)
+
+    free_rooms = {slot_id: dict(rooms) for slot_id in slot_ids}
+    neighbour_slots = {exam_id: set() for exam_id in sizes}
+    degree = {exam_id: len(graph.get(exam_id, ())) for exam_id in sizes}
+    placements = {}
+    unscheduled = []
+    pending = set(sizes)
+
+    while pending:
+        # DSatur: yvelaze "shezghuduli" gamocda pirveli
+        exam_id = max(pending, key=lambda e: (len(neighbour_slots[e]), degree[e], sizes[e], -e))
+        pending.discard(exam_id)
+
+        candidates = slots_by_date.get(exam_dates.get(exam_id)) or slot_ids
+        for slot_id in candidates:
+            if not overlaps[slot_id].isdisjoint(neighbour_slots[exam_id]):
+                continue
+            allocation = allocate_rooms(sizes[exam_id], free_rooms[slot_id])
+            if allocation is None:
+                continue
+            placements[exam_id] = (slot_id, allocation)
+            # otaxi dakavebulia yvela slot-shi,romelic am slot-s efareba
+            for other_id in overlaps[slot_id]:
+                for room_id, _ in allocation:
+                    free_rooms[other_id].pop(room_id, None)
+            for neighbour in graph.get(exam_id, ()):
+                if neighbour in neighbour_slots:
+                    neighbour_slots[neighbour].add(slot_id)
+            break
+        else:
+            unscheduled.append(exam_id)
+
+    unscheduled.sort()
+    return placements, unscheduled
+
+
+def schedule(conn):
+    """
+    Builds a schedule for every exam from the rooms, slots and assignments in
+    the database. Returns (placements, unscheduled) as build_schedule().
+    """
+    rooms = dict(conn.execute("SELECT ROOM_ID, CAPACITY FROM ROOMS"))
+    slots = conn.execute('''SELECT SLOT_ID, SLOT_DATE, START_TIME, END_TIME FROM TIME_SLOTS
+                            ORDER BY SLOT_DATE, START_TIME, SLOT_ID''').fetchall()
+    exam_dates = dict(conn.execute("SELECT EXAM_ID, EXAM_DATE FROM EXAMS"))
+    return build_schedule(enrollments(conn), conflict_graph(conn), slots, rooms, exam_dates)
+
+
+def save(conn, placements):
+    """
+    Replaces the stored schedule with placements (inside the caller's transaction).
+    """
+    conn.execute("DELETE FROM EXAM_ROOMS")
+    conn.execute("DELETE FROM EXAM_SCHEDULE")
+    conn.executemany("INSERT INTO EXAM_SCHEDULE (EXAM_ID, SLOT_ID) VALUES (?,?)",
+                     ((exam_id, slot_id) for exam_id, (slot_id, _) in placements.items()))
+    conn.executemany("INSERT INTO EXAM_ROOMS (EXAM_ID, ROOM_ID, SEATS) VALUES (?,?,?)",
+                     ((exam_id, room_id, seats)
+                      for exam_id, (_, allocation) in placements.items()
+                      for room_id, seats in allocation))
+
+
+def find_conflicts(conn):
+    """
+    Pairs of exams in the same or overlapping slots that share students, and
+    rooms booked twice at one time, as (kind, first_id, second_id, slot_id,
+    count) rows with kind "students" (ids are exams, slot_id is the first
+    exam's) or "room" (first_id is the room, count the exams holding it in
+    slot_id or a slot overlapping it).
+    """
+    student_clashes = conn.execute(
+        f'''SELECT 'students', A.EXAM_ID, B.EXAM_ID, A.SLOT_ID, COUNT(*)
+           FROM EXAM_SCHEDULE A
+           JOIN TIME_SLOTS TA ON TA.SLOT_ID = A.SLOT_ID
+           JOIN TIME_SLOTS TB ON {SLOTS_OVERLAP}
+           JOIN EXAM_SCHEDULE B ON B.SLOT_ID = TB.SLOT_ID AND B.EXAM_ID > A.EXAM_ID
+           JOIN STUDENT_EXAMS SA ON SA.EXAM_ID = A.EXAM_ID
+           JOIN STUDENT_EXAMS SB ON SB.STUDENT_ID = SA.STUDENT_ID AND SB.EXAM_ID = B.EXAM_ID
+           JOIN STUDENTS ON STUDENTS.STUDENT_ID = SA.STUDENT_ID
+           WHERE STUDENTS.DELETED_AT IS NULL
+           GROUP BY A.EXAM_ID, B.EXAM_ID''').fetchall()
+    room_clashes = conn.execute(
+        f'''SELECT 'room', RA.ROOM_ID, NULL, A.SLOT_ID, COUNT(DISTINCT RB.EXAM_ID)
+           FROM EXAM_ROOMS RA
+           JOIN EXAM_SCHEDULE A ON A.EXAM_ID = RA.EXAM_ID
+           JOIN TIME_SLOTS TA ON TA.SLOT_ID = A.SLOT_ID
+           JOIN TIME_SLOTS TB ON {SLOTS_OVERLAP}
+           JOIN EXAM_SCHEDULE B ON B.SLOT_ID = TB.SLOT_ID
+           JOIN EXAM_ROOMS RB ON RB.EXAM_ID = B.EXAM_ID AND RB.ROOM_ID = RA.ROOM_ID
+           GROUP BY RA.ROOM_ID, A.SLOT_ID HAVING COUNT(DISTINCT RB.EXAM_ID) > 1''').fetchall()
+    return student_clashes + room_clashes
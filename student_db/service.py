@@ -0,0 +1,306 @@
+"""
+Local HTTP/JSON service over StudentDatabase for many concurrent clients
+(registration day: hundreds of browsers and scripts at once).
+
+    python serve_api.py --db students.db --port 8080
+
+Endpoints (all responses are JSON):
+
+GET  /health
+GET  /students?order_by=NAME&descending=1&cursor=...&limit=200
+GET  /students/<id>
+GET  /students/<id>/exams
+GET  /exams?order_by=EXAM_DATE
+GET  /assignments?order_by=STUDENTS.NAME&cursor=...&limit=200
+POST /assignments      {"student_id": 1, "exam_id": 2}
+                       (201; 404 no such student or exam, 409 already assigned,
+                       503 database busy or failing)
+
+Lists are keyset pages: the response carries "next_cursor", pass it back as
+cursor= for the following page (null after the last one).
+
+The HTTP layer runs on one asyncio event loop (stdlib streams, HTTP/1.1 with
+keep-alive); every database call runs on a bounded thread pool so a slow
+query never blocks the loop and SQLite never sees more threads than the pool
+size. Concurrent identical reads are coalesced: while one GET /exams is
+running, the others wait for its result instead of queueing their own query.
+Writes are never coalesced.
+"""
+import asyncio
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .database import ASSIGNED, ALREADY_ASSIGNED, NOT_FOUND
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 5000
+DEFAULT_PAGE_SIZE = 200
+MAX_BODY_BYTES = 64 * 1024
+# kavshiri am dros ushedegod ikhureba (keep-alive klientebi)
+IDLE_TIMEOUT = 30.0
+
+STUDENT_FIELDS = ("student_id", "name", "last_name", "gpa", "major", "year", "email")
+EXAM_FIELDS = ("exam_id", "exam_name", "exam_date", "description")
+ASSIGNMENT_FIELDS = ("student_id", "student_name", "exam_id", "exam_name")
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _records(fields, rows):
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def _int_param(query, name, default=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+
+
+def _page_params(query, default_order):
+    order_by = query.get("order_by", [default_order])[0]
+    descending = query.get("descending", ["0"])[0].lower() in ("1", "true", "yes")
+    cursor = query.get("cursor", [None])[0]
+    limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return order_by, descending, cursor, limit
+
+
+class StudentService:
+    """
+    Routes requests to a StudentDatabase. db is shared by the worker threads
+    (its ConnectionManager gives each thread its own read connection).
+    """
+    ROUTES = [
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("GET", re.compile(r"^/students$"), "list_students"),
+        ("GET", re.compile(r"^/students/(\d+)$"), "get_student"),
+        ("GET", re.compile(r"^/students/(\d+)/exams$"), "student_exams"),
+        ("GET", re.compile(r"^/exams$"), "list_exams"),
+        ("GET", re.compile(r"^/assignments$"), "list_assignments"),
+        ("POST", re.compile(r"^/assignments$"), "create_assignment"),
+    ]
+
+    def __init__(self, db, max_workers=8):
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="student-db")
+        # (metodi, argumentebi) -> mimdinare asyncio.Future; identuri kitxvebi erthad sruldeba
+        self._in_flight = {}
+        self.coalesced = 0
+        self.requests = 0
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def read(self, method, *args):
+        """
+        Runs db.<method>(*args) on the pool, sharing the result with every
+        identical call that starts before it finishes.
+        """
+        key = (method, args)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, lambda: getattr(self.db, method)(*args))
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def write(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: getattr(self.db, method)(*args))
+
+    async def dispatch(self, method, target, body):
+        """
+        Returns (status, payload) for one request.
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        allowed = False
+        for route_method, pattern, handler in self.ROUTES:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            allowed = True
+            if route_method == method:
+                return await getattr(self, handler)(query, body, *match.groups())
+        if allowed:
+            raise HTTPError(405, f"{method} not allowed on {url.path}")
+        raise HTTPError(404, f"no such resource {url.path}")
+
+    async def health(self, query, body):
+        return 200, {"status": "ok", "requests": self.requests, "coalesced": self.coalesced}
+
+    async def list_students(self, query, body):
+        order_by, descending, cursor, limit = _page_params(query, "STUDENT_ID")
+        rows, next_cursor = await self._page("get_students_page", order_by, descending, cursor, limit)
+        return 200, {"students": _records(STUDENT_FIELDS, rows), "next_cursor": next_cursor}
+
+    async def get_student(self, query, body, student_id):
+        rows = await self.read("get_students_by_ids", (int(student_id),))
+        if not rows:
+            raise HTTPError(404, f"no student with id {student_id}")
+        return 200, _records(STUDENT_FIELDS, rows)[0]
+
+    async def student_exams(self, query, body, student_id):
+        student, exams = await asyncio.gather(self.read("get_student_by_id", int(student_id)),
+                                              self.read("get_exams_for_student", int(student_id)))
+        if student is None:
+            raise HTTPError(404, f"no student with id {student_id}")
+        return 200, {"student_id": int(student_id), "name": student[0], "last_name": student[1],
+                     "exams": _records(EXAM_FIELDS, exams)}
+
+    async def list_exams(self, query, body):
+        order_by = query.get("order_by", ["EXAM_ID"])[0]
+        descending = query.get("descending", ["0"])[0].lower() in ("1", "true", "yes")
+        rows = await self._call(self.read("get_all_exams", order_by, descending))
+        return 200, {"exams": _records(EXAM_FIELDS, rows)}
+
+    async def list_assignments(self, query, body):
+        order_by, descending, cursor, limit = _page_params(query, "STUDENT_EXAMS.STUDENT_ID")
+        rows, next_cursor = await self._page("get_assignments_page", order_by, descending, cursor, limit)
+        return 200, {"assignments": _records(ASSIGNMENT_FIELDS, rows), "next_cursor": next_cursor}
+
+    async def create_assignment(self, query, body):
+        try:
+            data = json.loads(body or b"{}")
+            student_id, exam_id = int(data["student_id"]), int(data["exam_id"])
+        except (ValueError, TypeError, KeyError):
+            raise HTTPError(400, 'body must be {"student_id": <int>, "exam_id": <int>}') from None
+        outcome = await self.write("assign_student_to_exam", student_id, exam_id)
+        if outcome == ALREADY_ASSIGNED:
+            raise HTTPError(409, "student is already assigned to this exam")
+        if outcome == NOT_FOUND:
+            raise HTTPError(404, "no such student or exam")
+        if outcome != ASSIGNED:
+            # bazis shecdoma (mag. "database is locked") - klientma sheidzleba tavidan scados
+            raise HTTPError(503, "database unavailable, try again")
+        return 201, {"student_id": student_id, "exam_id": exam_id}
+
+    async def _page(self, method, order_by, descending, cursor, limit):
+        return await self._call(self.read(method, order_by, descending, cursor, limit))
+
+    @staticmethod
+    async def _call(awaitable):
+        # StudentDatabase ValueError-s agdebs cudi sortirebis/kursoris dros
+        try:
+            return await awaitable
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, error = request
+                self.requests += 1
+                if error is not None:
+                    status, payload = error.status, {"error": error.message}
+                else:
+                    try:
+                        status, payload = await self.dispatch(method, target, body)
+                    except HTTPError as e:
+                        status, payload = e.status, {"error": e.message}
+                    except Exception:
+                        logger.exception("%s %s failed", method, target)
+                        status, payload = 500, {"error": "internal error"}
+                keep_alive = headers.get("connection", "").lower() != "close" and error is None
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """
+    Returns (method, target, headers, body, error) or None at end of stream.
+    error is an HTTPError for a request that was read but cannot be served.
+    """
+    # stream-is limitze (64 KB) grdzeli xazi readline-shi ValueError-s agdebs
+    try:
+        line = await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        return "", "", {}, b"", HTTPError(400, "request line too long")
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    headers = {}
+    while True:
+        try:
+            header = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            return "", "", {}, b"", HTTPError(431, "header line too long")
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if len(parts) != 3:
+        return "", "", {}, b"", HTTPError(400, "malformed request line")
+
+    method, target, _ = parts
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        length = -1
+    if length < 0:
+        return method, target, headers, b"", HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        return method, target, headers, b"", HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body, None
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(db, host="127.0.0.1", port=8080, max_workers=8, ready=None):
+    """
+    Serves db until cancelled. ready(server), if given, is called once the
+    socket is listening (the load test uses it to learn the port).
+    """
+    service = StudentService(db, max_workers)
+    # backlog: registraciisas asobit kavshiri erthdroulad modis
+    server = await asyncio.start_server(service.handle_connection, host, port, backlog=1024)
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
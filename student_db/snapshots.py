@@ -0,0 +1,327 @@
+"""
+Snapshot files: the live students, exams and assignments in one
+memory-mapped binary file that opens without running a query.
+
+    snapshot = db.open_snapshot("students.db.snapshot")   # writes or updates it first
+    snapshot.roster.get(1042)
+    rows, cursor = snapshot.students_page(None, 200)      # same pages as db.get_students_page()
+    snapshot.is_current(db)
+
+Layout: MAGIC, then one section per column buffer, every section aligned to
+8 bytes so it can be used in place as an int64/float64/int32 array (the
+RosterSnapshot columns of roster.py plus the STUDENT_ID and EXAM_ID of every
+assignment, ordered by STUDENT_ID, EXAM_ID). A JSON footer holds the format
+version, the byte order, the section offsets, the small string tables
+(names, majors, exams), and the database state the file matches: the schema
+version and the CHANGE_LOG sequence number. The file ends with the footer
+length and MAGIC again. load() maps the file and wraps the sections as
+memoryviews; nothing is copied or parsed per student.
+
+The database logs the key of every changed student, exam and assignment in
+CHANGE_LOG (see StudentDatabase._migrate_change_log). A file whose sequence
+number is behind is brought up to date by merge(): unchanged runs of rows are
+copied buffer by buffer and only the changed keys are read from the tables.
+PRAGMA data_version cannot be used for this, since it only compares states
+seen by one connection and does not survive a restart.
+
+The file is replaced atomically (written under a temporary name, then
+renamed). Mapped files cannot be replaced on Windows, so close() the
+snapshot before writing it again there.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .queries import decode_page_cursor, encode_page_cursor
+from .roster import RosterBuilder, RosterSnapshot, build as build_roster, raw_bytes
+
+MAGIC = b"SDBSNAP1"
+FORMAT_VERSION = 1
+ALIGN = 8
+BATCH_SIZE = 65536
+
+ROSTER_SECTIONS = ("ids", "gpa", "year", "name_codes", "last_name_codes", "major_codes",
+                   "emails", "email_offsets", "email_nulls", "positions")
+
+EXAMS_QUERY = '''SELECT EXAM_ID, EXAM_NAME, EXAM_DATE, DESCRIPTION FROM EXAMS
+                 WHERE DELETED_AT IS NULL ORDER BY EXAM_ID'''
+ASSIGNMENTS_QUERY = '''SELECT STUDENT_EXAMS.STUDENT_ID, STUDENT_EXAMS.EXAM_ID
+                       FROM STUDENT_EXAMS
+                       JOIN STUDENTS ON STUDENTS.STUDENT_ID = STUDENT_EXAMS.STUDENT_ID
+                       JOIN EXAMS ON EXAMS.EXAM_ID = STUDENT_EXAMS.EXAM_ID
+                       WHERE STUDENTS.DELETED_AT IS NULL AND EXAMS.DELETED_AT IS NULL {}
+                       ORDER BY STUDENT_EXAMS.STUDENT_ID, STUDENT_EXAMS.EXAM_ID'''
+
+
+class SnapshotError(ValueError):
+    """
+    Raised by load() for a file that is not a snapshot, is truncated or was
+    written by an incompatible version.
+    """
+
+
+class Snapshot:
+    """
+    roster is a RosterSnapshot; exams the live (EXAM_ID, EXAM_NAME,
+    EXAM_DATE, DESCRIPTION) rows by EXAM_ID; assignment_students and
+    assignment_exams int64 buffers of the live assignments by STUDENT_ID,
+    EXAM_ID. seq and schema are the CHANGE_LOG sequence and PRAGMA
+    user_version the data matches.
+    """
+    def __init__(self, roster, exams, assignment_students, assignment_exams, seq, schema):
+        self.roster = roster
+        self.exams = exams
+        self.assignment_students = assignment_students
+        self.assignment_exams = assignment_exams
+        self.seq = seq
+        self.schema = schema
+        self.path = None
+        self._mapping = None
+        self._views = []
+        self._exams_by_id = {exam[0]: exam for exam in exams}
+        self._exam_ids = [exam[0] for exam in exams]
+
+    def is_current(self, db):
+        """
+        True when nothing has changed in db since the snapshot was taken.
+        """
+        return db.change_seq() == self.seq and db.schema_version() == self.schema
+
+    def exam(self, exam_id):
+        return self._exams_by_id.get(exam_id)
+
+    def assignment(self, i):
+        student_id, exam_id = self.assignment_students[i], self.assignment_exams[i]
+        return (student_id, self.roster.names[self.roster.name_codes[self.roster.position(student_id)]],
+                exam_id, self._exams_by_id[exam_id][1])
+
+    # gverdebi igive formatisaa,rac StudentDatabase.get_*_page() (default sortireba),
+    # amitom kursori erthidan meoreze gadadis
+    def students_page(self, cursor, limit):
+        ids = self.roster.ids
+        start = bisect_right(ids, _id_cursor(cursor, 1)[0]) if cursor is not None else 0
+        rows = self.roster[start:start + limit]
+        return rows, _next_cursor(rows, limit, (0,))
+
+    def exams_page(self, cursor, limit):
+        start = bisect_right(self._exam_ids, _id_cursor(cursor, 1)[0]) if cursor is not None else 0
+        rows = [exam[:3] for exam in self.exams[start:start + limit]]
+        return rows, _next_cursor(rows, limit, (0,))
+
+    def assignments_page(self, cursor, limit):
+        students, exams = self.assignment_students, self.assignment_exams
+        start = 0
+        if cursor is not None:
+            student_id, exam_id = _id_cursor(cursor, 2)
+            low, high = bisect_left(students, student_id), bisect_right(students, student_id)
+            start = bisect_right(exams, exam_id, low, high)
+        rows = [self.assignment(i) for i in range(start, min(start + limit, len(students)))]
+        return rows, _next_cursor(rows, limit, (0, 2))
+
+    def close(self):
+        """
+        Unmaps the file. Views handed out elsewhere (NumPy arrays of the
+        roster) keep the mapping alive until they are gone.
+        """
+        views = [self.assignment_students, self.assignment_exams]
+        if self.roster is not None:
+            views += [value for value in vars(self.roster).values() if isinstance(value, memoryview)]
+        for view in views + self._views[::-1]:
+            try:
+                view.release()
+            except (BufferError, AttributeError):
+                pass
+        self._views = []
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                pass
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _id_cursor(cursor, length):
+    # id-ebit sortirebis kursori: mxolod mteli ricxvebi (bisect sxva tips ver adarebs)
+    values = decode_page_cursor(cursor, length, range(length))
+    if not all(isinstance(value, int) for value in values):
+        raise ValueError(f"invalid page cursor: {cursor!r}")
+    return values
+
+
+def _next_cursor(rows, limit, key_positions):
+    if len(rows) < limit:
+        return None
+    return encode_page_cursor(rows[-1][i] for i in key_positions)
+
+
+def dump(conn, seq, schema, batch_size=BATCH_SIZE):
+    """
+    Reads a full snapshot; conn should be in a read transaction (see
+    ConnectionManager.read_transaction) so every table matches seq.
+    """
+    exams = [tuple(row) for row in conn.execute(EXAMS_QUERY)]
+    students, exam_ids = _assignments(conn, "", (), batch_size)
+    return Snapshot(build_roster(conn, batch_size), exams, students, exam_ids, seq, schema)
+
+
+def merge(conn, old, changes, seq, schema):
+    """
+    Applies changes ({"STUDENTS": ids, "EXAMS": ids, "STUDENT_EXAMS":
+    student ids}, from the change log) to old and returns the new snapshot.
+    Only the changed keys are read from conn.
+    """
+    changed_students = sorted(changes.get("STUDENTS", ()))
+    changed_exams = sorted(changes.get("EXAMS", ()))
+
+    roster = old.roster
+    fresh = {}
+    if changed_students:
+        cursor = conn.execute('''SELECT STUDENT_ID, NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL FROM STUDENTS
+                                 WHERE DELETED_AT IS NULL AND STUDENT_ID IN (SELECT value FROM json_each(?))''',
+                              (json.dumps(changed_students),))
+        fresh = {row[0]: row for row in cursor}
+    builder = RosterBuilder(roster)
+    done = 0
+    for student_id in changed_students:
+        position = bisect_left(roster.ids, student_id)
+        builder.copy(roster, done, position)
+        done = position + 1 if position < len(roster) and roster.ids[position] == student_id else position
+        if student_id in fresh:
+            builder.append(fresh[student_id])
+    builder.copy(roster, done, len(roster))
+
+    exams = old.exams
+    affected = set(changed_students) | set(changes.get("STUDENT_EXAMS", ()))
+    if changed_exams:
+        exams = [tuple(row) for row in conn.execute(EXAMS_QUERY)]
+        # washlili/aghdgenili gamocdis danishvnebi studentebis mikhedvit gadaitvleba
+        affected.update(row[0] for row in conn.execute(
+            "SELECT DISTINCT STUDENT_ID FROM STUDENT_EXAMS WHERE EXAM_ID IN (SELECT value FROM json_each(?))",
+            (json.dumps(changed_exams),)))
+    affected = sorted(affected)
+    new_students, new_exams = array("q"), array("q")
+    if affected:
+        new_students, new_exams = _assignments(
+            conn, "AND STUDENT_EXAMS.STUDENT_ID IN (SELECT value FROM json_each(?))", (json.dumps(affected),))
+
+    students, exam_ids = array("q"), array("q")
+    done = fresh_done = 0
+    for student_id in affected:
+        low = bisect_left(old.assignment_students, student_id, done)
+        high = bisect_right(old.assignment_students, student_id, low)
+        students.frombytes(raw_bytes(old.assignment_students[done:low]))
+        exam_ids.frombytes(raw_bytes(old.assignment_exams[done:low]))
+        fresh_low = bisect_left(new_students, student_id, fresh_done)
+        fresh_done = bisect_right(new_students, student_id, fresh_low)
+        students.frombytes(raw_bytes(new_students[fresh_low:fresh_done]))
+        exam_ids.frombytes(raw_bytes(new_exams[fresh_low:fresh_done]))
+        done = high
+    students.frombytes(raw_bytes(old.assignment_students[done:]))
+    exam_ids.frombytes(raw_bytes(old.assignment_exams[done:]))
+    return Snapshot(builder.finish(), exams, students, exam_ids, seq, schema)
+
+
+def _assignments(conn, condition, params, batch_size=BATCH_SIZE):
+    students, exams = array("q"), array("q")
+    cursor = conn.execute(ASSIGNMENTS_QUERY.format(condition), params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for student_id, exam_id in rows:
+            students.append(student_id)
+            exams.append(exam_id)
+    cursor.close()
+    return students, exams
+
+
+def save(path, snapshot):
+    """
+    Writes snapshot to path atomically.
+    """
+    roster = snapshot.roster
+    buffers = [(name, getattr(roster, name)) for name in ROSTER_SECTIONS if getattr(roster, name) is not None]
+    buffers += [("assignment_students", snapshot.assignment_students),
+                ("assignment_exams", snapshot.assignment_exams)]
+
+    tmp_path = path + ".part"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            sections = {}
+            for name, buffer in buffers:
+                view = memoryview(buffer)
+                f.write(b"\0" * (-f.tell() % ALIGN))
+                sections[name] = [f.tell(), view.nbytes, view.format]
+                f.write(view)
+            footer = json.dumps({
+                "version": FORMAT_VERSION, "byteorder": sys.byteorder,
+                "seq": snapshot.seq, "schema": snapshot.schema, "sections": sections,
+                "names": roster.names, "last_names": roster.last_names, "majors": roster.majors,
+                "exams": snapshot.exams,
+            }, separators=(",", ":")).encode("utf-8")
+            f.write(footer)
+            f.write(struct.pack("<Q", len(footer)))
+            f.write(MAGIC)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load(path):
+    """
+    Maps the snapshot at path read-only. Raises OSError when it cannot be
+    opened and SnapshotError when it is not a usable snapshot.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 2 * len(MAGIC) + 8:
+            raise SnapshotError(f"{path} is not a snapshot")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if mapping[:len(MAGIC)] != MAGIC or mapping[-len(MAGIC):] != MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot or is truncated")
+        (footer_size,) = struct.unpack("<Q", mapping[-len(MAGIC) - 8:-len(MAGIC)])
+        footer_end = size - len(MAGIC) - 8
+        try:
+            footer = json.loads(mapping[footer_end - footer_size:footer_end])
+        except ValueError as e:
+            raise SnapshotError(f"{path} has a damaged footer") from e
+        if footer.get("version") != FORMAT_VERSION or footer.get("byteorder") != sys.byteorder:
+            raise SnapshotError(f"{path} was written by an incompatible version")
+
+        whole = memoryview(mapping)
+        views = [whole]
+
+        def section(name):
+            if name not in footer["sections"]:
+                return None
+            offset, nbytes, fmt = footer["sections"][name]
+            view = whole[offset:offset + nbytes]
+            views.append(view)
+            return view.cast(fmt) if fmt != "B" else view
+
+        roster = RosterSnapshot(names=footer["names"], last_names=footer["last_names"],
+                                majors=footer["majors"], **{name: section(name) for name in ROSTER_SECTIONS})
+        snapshot = Snapshot(roster, [tuple(exam) for exam in footer["exams"]],
+                            section("assignment_students"), section("assignment_exams"),
+                            footer["seq"], footer["schema"])
+    except BaseException:
+        mapping.close()
+        raise
+    snapshot.path = path
+    snapshot._mapping = mapping
+    snapshot._views = views
+    return snapshot
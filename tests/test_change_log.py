@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from student_db import StudentDatabase, database
+
+
+def student_rows(count, start=0):
+    return [(f"N{i}", f"L{i}", 3.0, "CS", 2024, f"s{i}@uni.edu") for i in range(start, start + count)]
+
+
+class ChangeLogTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.db = StudentDatabase(os.path.join(self.dir, "students.db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dir)
+
+    def log_size(self):
+        with self.db._read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM CHANGE_LOG").fetchone()[0]
+
+    def test_log_stays_bounded_without_snapshots(self):
+        for n in range(6):
+            inserted, rejections = self.db.bulk_add_students(student_rows(5000, n * 5000), chunk_size=1000)
+            self.assertEqual(inserted, 5000)
+        self.assertLessEqual(self.log_size(), database.CHANGE_LOG_PRUNE_STEP + 1000)
+        self.assertEqual(self.db.change_seq(), 30000)
+
+    def test_purge_keeps_only_last_entry(self):
+        self.db.bulk_add_students(student_rows(100))
+        self.db.purge_deleted()
+        self.assertEqual(self.log_size(), 1)
+        seq = self.db.change_seq()
+        self.db.add_student("A", "B", 3.0, "CS", 2024, "ab@uni.edu")
+        self.assertEqual(self.db.change_seq(), seq + 1)
+
+    def test_registered_snapshot_keeps_entries_it_needs(self):
+        path = os.path.join(self.dir, "students.db.snapshot")
+        self.db.bulk_add_students(student_rows(100))
+        seq = self.db.save_snapshot(path)
+        self.db.bulk_add_students(student_rows(10, 100))
+        self.db.purge_deleted()
+        self.assertEqual(self.log_size(), 11)
+        snapshot = self.db.open_snapshot(path)
+        self.assertEqual(snapshot.seq, seq + 10)
+        self.assertEqual(len(snapshot.roster), 110)
+        snapshot.close()
+        self.assertEqual(self.log_size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from student_db import StudentDatabase
+
+
+class CohortStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.db = StudentDatabase(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_single_student(self):
+        self.db.add_student("A", "B", 3.5, "CS", 2024, "a@uni.edu")
+        summary = self.db.get_cohort_summary("CS", 2024)
+        self.assertEqual(summary["median"], 3.5)
+        self.assertEqual(set(summary["percentiles"].values()), {3.5})
+
+    def test_estimate_stays_inside_the_bucket(self):
+        for i, gpa in enumerate([2.0, 2.0, 3.5, 3.5]):
+            self.db.add_student("A", "B", gpa, "CS", 2024, f"s{i}@uni.edu")
+        summary = self.db.get_cohort_summary("CS", 2024)
+        for value in [summary["median"]] + list(summary["percentiles"].values()):
+            self.assertTrue(2.0 <= value < 2.1 or 3.5 <= value < 3.6, value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from student_db import StudentDatabase
+
+
+def create_baseline(path):
+    # pirveli versiis sqema (main.py), user_version = 0
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE STUDENTS(
+            STUDENT_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            NAME TEXT, LAST_NAME TEXT, GPA REAL,
+            MAJOR TEXT, YEAR INT, EMAIL TEXT, GRADES TEXT);
+        CREATE TABLE EXAMS(
+            EXAM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+            EXAM_NAME TEXT, EXAM_DATE TEXT, DESCRIPTION TEXT);
+        CREATE TABLE STUDENT_EXAMS(
+            STUDENT_ID INTEGER,
+            EXAM_ID INTEGER,
+            FOREIGN KEY(STUDENT_ID) REFERENCES STUDENTS(STUDENT_ID),
+            FOREIGN KEY(EXAM_ID) REFERENCES EXAMS(EXAM_ID));
+    ''')
+    conn.executemany("INSERT INTO STUDENTS (NAME, LAST_NAME, GPA, MAJOR, YEAR, EMAIL, GRADES) VALUES (?,?,?,?,?,?,?)", [
+        ("Nino", "Beridze", 3.5, "Physics", 2024, "nino@uni.edu",
+         json.dumps({"Algebra": 4.0, "Physics": {"2024-fall": 3.0}})),
+        ("Luka", "Lomidze", 2.0, "Physics", 2024, "luka@uni.edu", json.dumps({})),
+        ("Ana", "Gogua", None, None, None, "ana@uni.edu", "not json"),
+    ])
+    conn.execute("INSERT INTO EXAMS (EXAM_NAME, EXAM_DATE, DESCRIPTION) VALUES ('Algebra', '2026-06-01', 'Final')")
+    # dublikati da oboli chanawerebi
+    conn.executemany("INSERT INTO STUDENT_EXAMS VALUES (?,?)", [(1, 1), (1, 1), (2, 1), (9, 1), (1, 7)])
+    conn.commit()
+    conn.close()
+
+
+class BaselineMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "students.db")
+        create_baseline(self.path)
+        self.db = StudentDatabase(self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_schema_is_current(self):
+        self.assertEqual(self.db.schema_version(), len(StudentDatabase.MIGRATIONS))
+
+    def test_data_survives(self):
+        self.assertEqual([row[:3] for row in self.db.get_all_students()],
+                         [(1, "Nino", "Beridze"), (2, "Luka", "Lomidze"), (3, "Ana", "Gogua")])
+        self.assertEqual(self.db.get_all_exams(), [(1, "Algebra", "2026-06-01", "Final")])
+        self.assertEqual([(row[0], row[2]) for row in self.db.get_all_assignments()], [(1, 1), (2, 1)])
+
+    def test_grades_move_to_their_table(self):
+        self.assertEqual(self.db.get_grades(1), [("Algebra", "", 4.0), ("Physics", "2024-fall", 3.0)])
+        self.assertEqual(self.db.get_grades(3), [])
+
+    def test_derived_tables_are_filled(self):
+        self.assertEqual([row[1] for row in self.db.search("nino")], [1])
+        self.assertEqual(self.db.get_cohort_summary("Physics", 2024)["count"], 2)
+        rows, cursor = self.db.get_students_page("GPA", page_size=2)
+        self.assertEqual([row[0] for row in rows], [3, 2])
+
+    def test_reopening_does_not_migrate_again(self):
+        self.db.close()
+        self.db = StudentDatabase(self.path)
+        self.assertEqual(self.db.schema_version(), len(StudentDatabase.MIGRATIONS))
+        self.assertEqual(self.db.get_grades(1), [("Algebra", "", 4.0), ("Physics", "2024-fall", 3.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
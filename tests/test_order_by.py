@@ -0,0 +1,56 @@
+import unittest
+
+from student_db import StudentDatabase
+
+INJECTIONS = [
+    "GPA; DROP TABLE STUDENTS",
+    "GPA DESC, (SELECT 1)",
+    "GPA DESC LIMIT 1",
+    "gpa",
+    "1",
+    "",
+]
+
+
+class OrderByTest(unittest.TestCase):
+    def setUp(self):
+        self.db = StudentDatabase(":memory:")
+        for i, gpa in enumerate([3.0, 1.0, 2.0]):
+            self.db.add_student(f"N{i}", "L", gpa, "CS", 2024, f"s{i}@uni.edu")
+        self.db.add_exam("Algebra", "2026-06-01", "")
+        self.db.assign_student_to_exam(1, 1)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_rejected_everywhere(self):
+        calls = [
+            lambda term: self.db.get_all_students(term),
+            lambda term: self.db.get_all_students("GPA", then_by=[term]),
+            lambda term: self.db.iter_students(term),
+            lambda term: self.db.get_students_page(term),
+            lambda term: self.db.get_all_exams(term),
+            lambda term: self.db.get_exams_page(term),
+            lambda term: self.db.get_all_assignments(term),
+            lambda term: self.db.get_assignments_page(term),
+        ]
+        for call in calls:
+            for term in INJECTIONS:
+                with self.subTest(term=term), self.assertRaises(ValueError):
+                    call(term)
+        self.assertEqual(self.db.count_rows("students"), 3)
+
+    def test_page_rejects_a_direction(self):
+        # gverdebi mimartulebas descending-it igeben
+        with self.assertRaises(ValueError):
+            self.db.get_students_page("GPA DESC")
+
+    def test_whitelisted_terms(self):
+        self.assertEqual([row[0] for row in self.db.get_all_students("GPA DESC")], [1, 3, 2])
+        self.assertEqual([row[0] for row in self.db.get_all_students("LAST_NAME", then_by=["GPA"])], [2, 3, 1])
+        rows, _ = self.db.get_students_page("GPA", descending=True)
+        self.assertEqual([row[0] for row in rows], [1, 3, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
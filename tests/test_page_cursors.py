@@ -0,0 +1,64 @@
+import base64
+import json
+import unittest
+
+from student_db import StudentDatabase, encode_page_cursor, snapshots
+
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+class PageCursorTest(unittest.TestCase):
+    def setUp(self):
+        self.db = StudentDatabase(":memory:")
+        for i in range(25):
+            self.assertTrue(self.db.add_student(f"N{i}", f"L{i}", None if i % 3 else 3.0,
+                                                None if i % 2 else "CS", 2024, f"s{i}@uni.edu"))
+
+    def tearDown(self):
+        self.db.close()
+
+    def page_all(self, order_by, descending=False, page_size=4):
+        rows, cursor = self.db.get_students_page(order_by, descending, page_size=page_size)
+        while cursor is not None:
+            page, cursor = self.db.get_students_page(order_by, descending, cursor, page_size)
+            rows += page
+        return rows
+
+    def test_paging_through_null_sort_values(self):
+        for order_by in ("GPA", "MAJOR"):
+            for descending in (False, True):
+                rows = self.page_all(order_by, descending)
+                self.assertEqual(sorted(r[0] for r in rows), list(range(1, 26)), (order_by, descending))
+
+    def test_tampered_cursors_raise_value_error(self):
+        tampered = [
+            "not base64!", raw_cursor({"a": 1}), raw_cursor([{}]), raw_cursor([[1]]),
+            raw_cursor([None]), raw_cursor([1, 2]), raw_cursor([2**70]), raw_cursor([]),
+        ]
+        for cursor in tampered:
+            with self.assertRaises(ValueError, msg=cursor):
+                self.db.get_students_page("STUDENT_ID", cursor=cursor)
+        # GPA-s NULL sheidzleba,STUDENT_ID-s ara
+        self.db.get_students_page("GPA", cursor=encode_page_cursor([None, 3]))
+        with self.assertRaises(ValueError):
+            self.db.get_students_page("GPA", cursor=encode_page_cursor([3.0, None]))
+
+    def test_snapshot_pages_reject_tampered_cursors(self):
+        with self.db._read() as conn:
+            snapshot = snapshots.dump(conn, 0, 0)
+        rows, cursor = snapshot.students_page(None, 10)
+        self.assertEqual(snapshot.students_page(cursor, 10)[0], self.db.get_students_page(cursor=cursor,
+                                                                                            page_size=10)[0])
+        for cursor in (raw_cursor(["1"]), raw_cursor([None]), raw_cursor([1, 2])):
+            with self.assertRaises(ValueError):
+                snapshot.students_page(cursor, 10)
+            with self.assertRaises(ValueError):
+                snapshot.exams_page(cursor, 10)
+        with self.assertRaises(ValueError):
+            snapshot.assignments_page(raw_cursor([1, "x"]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from student_db import QueryProfiler, StudentDatabase
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_rows_per_method(self):
+        db = StudentDatabase(":memory:", profiler=QueryProfiler())
+        db.bulk_add_students([(f"N{i}", "L", 3.0, "CS", 2024, f"s{i}@uni.edu") for i in range(30)]
+                             + [("Bad", "Row", 9.0, "CS", 2024, "bad")])
+        db.get_students_page(page_size=10)
+        db.get_all_students()
+        methods = db.profile_report()["methods"]
+        db.close()
+        self.assertEqual(methods["bulk_add_students"]["rows"], 30)
+        self.assertEqual(methods["get_students_page"]["rows"], 10)
+        self.assertEqual(methods["get_all_students"]["rows"], 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
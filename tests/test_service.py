@@ -0,0 +1,97 @@
+import asyncio
+import json
+import unittest
+
+from student_db import ALREADY_ASSIGNED, ASSIGNED, NOT_FOUND, StudentDatabase, service
+
+
+class ServiceTest(unittest.TestCase):
+    """
+    Runs the HTTP service on a free port and talks raw HTTP/1.1 to it.
+    """
+    def setUp(self):
+        self.db = StudentDatabase(":memory:")
+        self.db.add_student("Nino", "Beridze", 3.5, "CS", 2024, "nino@uni.edu")
+        self.db.add_exam("Algebra", "2026-06-01", "")
+
+    def tearDown(self):
+        self.db.close()
+
+    def exchange(self, *requests):
+        """
+        Sends every raw request on its own connection; returns [(status, payload)].
+        """
+        async def run():
+            listening = asyncio.get_running_loop().create_future()
+            server = asyncio.create_task(service.serve(self.db, port=0, ready=listening.set_result))
+            port = (await listening).sockets[0].getsockname()[1]
+            responses = []
+            try:
+                for request in requests:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    writer.write(request)
+                    await writer.drain()
+                    data = await asyncio.wait_for(reader.read(), 5)
+                    writer.close()
+                    head, _, body = data.partition(b"\r\n\r\n")
+                    responses.append((int(head.split()[1]), json.loads(body)))
+            finally:
+                server.cancel()
+                await asyncio.gather(server, return_exceptions=True)
+            return responses
+        return asyncio.run(run())
+
+    @staticmethod
+    def get(target):
+        return f"GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode("latin-1")
+
+    @staticmethod
+    def post(target, payload):
+        body = json.dumps(payload).encode("utf-8")
+        return (f"POST {target} HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(body)}\r\n\r\n"
+                .encode("latin-1") + body)
+
+    def test_ok(self):
+        [(status, payload)] = self.exchange(self.get("/students?order_by=MAJOR"))
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["students"][0]["name"], "Nino")
+
+    def test_bad_requests(self):
+        responses = self.exchange(
+            self.get("/students?order_by=GPA;DROP%20TABLE%20STUDENTS"),
+            self.get("/students?cursor=WzEsMl0="),
+            self.get("/students?limit=0"),
+            b"POST /assignments HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+            b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n",
+            self.post("/assignments", {"student_id": "x"}),
+        )
+        self.assertEqual([status for status, _ in responses], [400] * 6)
+        self.assertEqual(self.db.get_students_page()[0][0][1], "Nino")
+
+    def test_assignment_outcomes(self):
+        responses = self.exchange(
+            self.post("/assignments", {"student_id": 1, "exam_id": 1}),
+            self.post("/assignments", {"student_id": 1, "exam_id": 1}),
+            self.post("/assignments", {"student_id": 1, "exam_id": 99}),
+        )
+        self.assertEqual([status for status, _ in responses], [201, 409, 404])
+
+    def test_assignment_database_error(self):
+        self.db.assign_student_to_exam = lambda student_id, exam_id: None
+        [(status, _)] = self.exchange(self.post("/assignments", {"student_id": 1, "exam_id": 1}))
+        self.assertEqual(status, 503)
+
+    def test_header_too_long(self):
+        [(status, _)] = self.exchange(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * 70000 + b"\r\n\r\n")
+        self.assertEqual(status, 431)
+
+    def test_assign_student_to_exam_outcomes(self):
+        self.assertEqual(self.db.assign_student_to_exam(1, 1), ASSIGNED)
+        self.assertEqual(self.db.assign_student_to_exam(1, 1), ALREADY_ASSIGNED)
+        self.assertEqual(self.db.assign_student_to_exam(2, 1), NOT_FOUND)
+        self.db.delete_students([1])
+        self.assertEqual(self.db.assign_student_to_exam(1, 1), NOT_FOUND)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from student_db import StudentDatabase, snapshots
+
+
+class SnapshotMergeTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.db = StudentDatabase(os.path.join(self.dir, "students.db"))
+        self.db.bulk_add_students([(f"N{i}", f"L{i}", i % 40 / 10, "CS", 2020 + i % 5, f"s{i}@uni.edu")
+                                   for i in range(200)])
+        for i in range(5):
+            self.db.add_exam(f"Exam {i}", f"2026-06-0{i + 1}", "")
+        for exam_id in range(1, 6):
+            self.db.assign_cohort_to_exam(exam_id, year=2020 + exam_id % 5)
+        self.path = os.path.join(self.dir, "merged.snapshot")
+        self.db.save_snapshot(self.path)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dir)
+
+    def change_a_few_rows(self):
+        self.db.add_student("New", "Student", 3.3, "Physics", 2024, "new@uni.edu")
+        self.db.record_grades([(5, "Algebra", 1.5)])
+        self.db.recalculate_gpas()
+        self.db.delete_students([7, 8])
+        self.db.delete_students([9], soft=False)
+        self.db.delete_exam(2)
+        self.db.add_exam("Exam 5", "2026-06-06", "")
+        self.db.assign_student_to_exam(201, 6)
+        self.db.assign_cohort_to_exam(1, ids=[1, 2, 3])
+
+    def contents(self, snapshot):
+        return (snapshot.roster[0:len(snapshot.roster)], snapshot.exams,
+                list(snapshot.assignment_students), list(snapshot.assignment_exams))
+
+    def test_merge_matches_full_rebuild(self):
+        self.change_a_few_rows()
+        with mock.patch.object(snapshots, "merge", wraps=snapshots.merge) as merge:
+            merged = self.db.open_snapshot(self.path)
+        self.assertEqual(merge.call_count, 1)
+        rebuilt = self.db.open_snapshot(os.path.join(self.dir, "rebuilt.snapshot"))
+        try:
+            self.assertEqual(merged.seq, rebuilt.seq)
+            self.assertEqual(self.contents(merged), self.contents(rebuilt))
+            # snapshot-is gverdebi bazis gverdebs emthxveva
+            for snapshot_page, db_page in ((merged.students_page, self.db.get_students_page),
+                                           (merged.exams_page, self.db.get_exams_page),
+                                           (merged.assignments_page, self.db.get_assignments_page)):
+                self.assertEqual(snapshot_page(None, 1000)[0], db_page(page_size=1000)[0])
+        finally:
+            merged.close()
+            rebuilt.close()
+
+    def test_rebuilt_when_log_does_not_reach_back(self):
+        # snapshot aghar aris registrirebuli,amitom prune mis chanawerebs shlis
+        with self.db._write() as conn:
+            conn.execute("DELETE FROM SNAPSHOT_CONSUMERS")
+        self.change_a_few_rows()
+        self.db.prune_change_log()
+        with mock.patch.object(snapshots, "merge", wraps=snapshots.merge) as merge:
+            snapshot = self.db.open_snapshot(self.path)
+        try:
+            self.assertEqual(merge.call_count, 0)
+            self.assertEqual(snapshot.students_page(None, 1000)[0], self.db.get_students_page(page_size=1000)[0])
+        finally:
+            snapshot.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from student_db import StudentDatabase
+
+
+class SoftDeleteTest(unittest.TestCase):
+    def setUp(self):
+        self.db = StudentDatabase(":memory:")
+        for i in range(3):
+            self.db.add_student(f"N{i}", f"L{i}", 3.0, "CS", 2024, f"s{i}@uni.edu")
+        self.db.add_exam("Algebra", "2026-06-01", "")
+        self.db.add_exam("Physics", "2026-06-02", "")
+        for student_id in (1, 2, 3):
+            self.db.assign_student_to_exam(student_id, 1)
+        self.db.assign_student_to_exam(1, 2)
+
+    def tearDown(self):
+        self.db.close()
+
+    def count(self, table):
+        with self.db._read() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_deleted_student_is_hidden_everywhere(self):
+        self.db.delete_students([1])
+        self.assertIsNone(self.db.get_student_by_id(1))
+        self.assertEqual(self.db.get_exams_for_student(1), [])
+        self.assertNotIn(1, [row[0] for row in self.db.get_all_students()])
+        self.assertNotIn(1, [row[0] for row in self.db.get_all_assignments()])
+        # cxrilshi rcheba,sanam purge ar gaeshveba
+        self.assertEqual(self.count("STUDENT_EXAMS"), 4)
+
+    def test_restore_brings_back_assignments(self):
+        self.db.delete_students([1])
+        self.db.restore_students([1])
+        self.assertEqual(self.db.get_student_by_id(1), ("N0", "L0"))
+        self.assertEqual(sorted(row[0] for row in self.db.get_exams_for_student(1)), [1, 2])
+
+    def test_deleted_exam_is_hidden(self):
+        self.db.delete_exam(2)
+        self.assertEqual([row[0] for row in self.db.get_exams_for_student(1)], [1])
+        self.db.restore_exams([2])
+        self.assertEqual(len(self.db.get_exams_for_student(1)), 2)
+
+    def test_purge_cascades(self):
+        self.db.delete_students([1])
+        self.db.delete_exam(2)
+        # jer vadebi ar gasula
+        self.assertEqual(self.db.purge_deleted(), (0, 0))
+        self.assertEqual(self.db.purge_deleted(older_than_days=0), (1, 1))
+        self.assertEqual(self.count("STUDENTS"), 2)
+        self.assertEqual(self.count("EXAMS"), 1)
+        self.assertEqual(self.count("STUDENT_EXAMS"), 2)
+        self.assertEqual(self.db.restore_students([1]), 0)
+
+    def test_hard_delete(self):
+        self.db.delete_students([2], soft=False)
+        self.assertEqual(self.count("STUDENTS"), 2)
+        self.assertEqual(self.count("STUDENT_EXAMS"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()